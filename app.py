@@ -1,4 +1,7 @@
 ﻿import os
+import hashlib
+import hmac
+import json
 import logging
 import time
 import smtplib
@@ -7,25 +10,24 @@ from itsdangerous import URLSafeTimedSerializer, BadSignature, SignatureExpired
 from flask import Flask, render_template, session, redirect, url_for, request, flash
 from flask import abort
 from werkzeug.utils import secure_filename
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import backend
+import cache
+import maintenance
+import querylog
+import template_cache
 
 app = Flask(__name__)
 app.secret_key = "replace-with-a-secure-secret"
+app.jinja_env.add_extension('template_cache.FragmentCacheExtension')
+template_cache.install_bytecode_cache(app.jinja_env)
 
-# Optional DB-backed mode. Set USE_DB=1 or USE_DB=true to enable.
-USE_DB = os.getenv('USE_DB', '').lower() in ('1', 'true', 'yes')
-if USE_DB:
-    try:
-        from db import get_auctions, get_auction, get_user_by_username, verify_password, create_member, get_member_by_id, get_all_members
-    except Exception:
-        # Keep demo mode if DB helpers are not available
-        get_auctions = None
-        get_auction = None
-        get_user_by_username = None
-        verify_password = None
-        create_member = None
-        get_member_by_id = None
-        get_all_members = None
+# Data backend, resolved once: DB_BACKEND=sqlite|sqlserver, or USE_DB=1 for
+# SQLite. `store` is None in demo mode; see backend.py.
+store = backend.load()
+USE_DB = store is not None
 
 # --- Auth hardening: login attempt tracking and logging ---
 AUTH_LOG = os.getenv('AUTH_LOG', 'auth.log')
@@ -64,9 +66,9 @@ def _user_dict_from_session():
     if not session.get('u_name'):
         return None
     uname = session.get('u_name')
-    if USE_DB and get_user_by_username:
+    if USE_DB:
         try:
-            return get_user_by_username(uname)
+            return store.get_user_by_username(uname)
         except Exception:
             return None
     # If DB mode is not enabled, provide a demo admin user for 'admin' only
@@ -184,6 +186,7 @@ def inject_globals():
     # Make helpers and commonly used variables available in all templates
     data = {
         "actual_date": actual_date,
+        "bidder_alias": _bidder_alias,
         "u_name": session.get("u_name")
     }
     # Provide categories globally so header includes can render consistently
@@ -191,8 +194,7 @@ def inject_globals():
         categories = [("1", "Antiques"), ("2", "Electronics"), ("3", "Books")]
         if USE_DB:
             try:
-                from db import get_categories
-                cats = get_categories()
+                cats = store.get_categories()
                 if cats:
                     categories = cats
             except Exception:
@@ -257,8 +259,7 @@ def index():
     recent_auctions = []
     if USE_DB:
         try:
-            from db import get_auctions
-            recent_auctions = get_auctions(limit=6) or []
+            recent_auctions = store.get_auctions(limit=6) or []
         except Exception as e:
             logger.warning(f"get_auctions failed in /: {e}")
             recent_auctions = []
@@ -272,16 +273,52 @@ def index():
 
 
 
+LISTING_PAGE_SIZE = 20
+_LISTING_TEMPLATES = {
+    'popular': 'view_more_popular.html',
+    'ending': 'view_more_ending.html',
+    'new': 'view_more_new.html',
+}
+
+
+def _ranked_listing(kind):
+    """Render one of the view-more listings from the precomputed ranking indexes."""
+    page = max(1, parse_int_field(request.args.get('page'), 'page') or 1)
+    items = []
+    if USE_DB:
+        try:
+            items = store.get_ranked_auctions(kind, limit=LISTING_PAGE_SIZE, offset=(page - 1) * LISTING_PAGE_SIZE)
+        except Exception as e:
+            logger.exception(f"get_ranked_auctions({kind}) failed: {e}")
+            items = []
+    return render_template(_LISTING_TEMPLATES[kind], items=items, page=page, page_size=LISTING_PAGE_SIZE)
+
+
+@app.route('/popular')
+def view_more_popular():
+    return _ranked_listing('popular')
+
+
+@app.route('/ending')
+def view_more_ending():
+    return _ranked_listing('ending')
+
+
+@app.route('/new')
+def view_more_new():
+    return _ranked_listing('new')
+
+
 @app.route('/search')
 def search():
     q = request.args.get('key_word', '')
     items = []
-    if USE_DB and get_auctions:
+    if USE_DB:
         try:
-            items = get_auctions(q) or []
+            items = store.get_auctions(q) or []
         except TypeError:
             try:
-                items = get_auctions() or []
+                items = store.get_auctions() or []
             except Exception as e:
                 logger.warning(f"get_auctions() failed in fallback: {e}")
                 items = []
@@ -315,9 +352,9 @@ def auctions():
             q = 50
 
     sample_items = []
-    if USE_DB and get_auctions:
+    if USE_DB:
         try:
-            sample_items = get_auctions(limit=q)
+            sample_items = store.get_auctions(limit=q)
         except Exception as e:
             logger.warning(f"get_auctions failed in /auctions: {e}")
             sample_items = []
@@ -330,6 +367,158 @@ def auctions():
         return "Internal server error", 500
 
 
+# --- JSON API -------------------------------------------------------------
+# Compact JSON for polling clients: raw numeric prices, field selection,
+# keyset (cursor) pagination and ETags so unchanged results cost a 304.
+
+API_FIELDS = ('id', 'item_id', 'title', 'description', 'image_url', 'current_bid', 'starting_price', 'seller_id',
+              'start_date', 'end_time', 'status', 'bid_count', 'high_bidder', 'last_bid_at', 'url')
+API_PAGE_SIZE = 50
+API_MAX_PAGE_SIZE = 200
+
+
+def _json_default(o):
+    if isinstance(o, (datetime, date)):
+        return o.isoformat()
+    if isinstance(o, Decimal):
+        return float(o)
+    return str(o)
+
+
+def _api_response(payload, status=200):
+    """Serialize `payload` compactly; successful responses carry an ETag and honour If-None-Match."""
+    body = json.dumps(payload, separators=(',', ':'), default=_json_default)
+    resp = app.response_class(body, status=status, mimetype='application/json')
+    if status == 200:
+        resp.add_etag()
+        resp.headers['Cache-Control'] = 'no-cache'
+        resp.make_conditional(request)
+    return resp
+
+
+def _api_fields():
+    """Fields requested with `fields=a,b,c` (all of API_FIELDS by default); ValueError names unknown ones."""
+    raw = request.args.get('fields')
+    if not raw:
+        return API_FIELDS
+    fields = tuple(dict.fromkeys(f.strip() for f in raw.split(',') if f.strip()))
+    unknown = [f for f in fields if f not in API_FIELDS]
+    if unknown:
+        raise ValueError(f"unknown field(s): {', '.join(unknown)}")
+    return fields
+
+
+def _api_limit():
+    """Page size from `limit`: API_PAGE_SIZE when absent, capped at API_MAX_PAGE_SIZE; None when not a positive integer."""
+    raw = request.args.get('limit')
+    if raw is None or raw.strip() == '':
+        return API_PAGE_SIZE
+    limit = parse_int_field(raw, 'limit')
+    if limit is None or limit < 1:
+        return None
+    return min(limit, API_MAX_PAGE_SIZE)
+
+
+def _api_auction(auction, fields):
+    """API view of a backend auction dict: `current_bid` is the raw number, not the display string,
+    and `high_bidder` the same per-auction alias the bid history shows, never the member id."""
+    out = {}
+    for f in fields:
+        if f == 'current_bid':
+            out[f] = auction.get('current_price')
+        elif f == 'high_bidder':
+            bidder_id = auction.get('high_bidder_id')
+            out[f] = _bidder_alias(auction.get('id'), bidder_id) if bidder_id is not None else None
+        else:
+            out[f] = auction.get(f)
+    return out
+
+
+@app.route('/api/auctions')
+def api_auctions():
+    """Newest auctions first, `limit` per page; pass `next_cursor` back as `cursor` for the next page."""
+    try:
+        fields = _api_fields()
+    except ValueError as e:
+        return _api_response({'error': str(e)}, 400)
+    limit = _api_limit()
+    if limit is None:
+        return _api_response({'error': 'limit must be a positive integer'}, 400)
+    cursor = request.args.get('cursor')
+    before_id = parse_int_field(cursor, 'cursor')
+    if cursor and before_id is None:
+        return _api_response({'error': 'invalid cursor'}, 400)
+    rows = []
+    if USE_DB:
+        try:
+            rows = store.get_auctions_page(before_id=before_id, limit=limit + 1)
+        except Exception as e:
+            logger.exception(f"get_auctions_page failed in /api/auctions: {e}")
+            return _api_response({'error': 'server error'}, 500)
+    next_cursor = str(rows[limit - 1]['id']) if len(rows) > limit else None
+    return _api_response({'auctions': [_api_auction(a, fields) for a in rows[:limit]], 'next_cursor': next_cursor})
+
+
+@app.route('/api/auctions/<int:auction_id>')
+def api_auction(auction_id):
+    try:
+        fields = _api_fields()
+    except ValueError as e:
+        return _api_response({'error': str(e)}, 400)
+    item = None
+    if USE_DB:
+        try:
+            item = store.get_auction(auction_id)
+        except Exception as e:
+            logger.exception(f"get_auction failed in /api/auctions/<id>: {e}")
+            return _api_response({'error': 'server error'}, 500)
+    if not item:
+        return _api_response({'error': 'auction not found'}, 404)
+    return _api_response(_api_auction(item, fields))
+
+
+BID_HISTORY_PAGE = 10
+
+
+def _bidder_alias(auction_id, bidder_id):
+    """Pseudonym for a bidder, stable within one auction but not linkable across auctions."""
+    digest = hmac.new(TS_SECRET.encode(), f'{auction_id}:{bidder_id}'.encode(), hashlib.sha256).hexdigest()
+    return f'Bidder {digest[:6]}'
+
+
+def _bid_history_page(auction_id, before_id, limit, viewer_id=None, archived=False):
+    """One keyset page of anonymized bids: ([{id, bidder, amount, bid_time, mine}], next cursor or None)."""
+    rows = store.get_bid_history(auction_id, before_id=before_id, limit=limit + 1, archived=archived)
+    bids = [{'id': b['id'], 'bidder': _bidder_alias(auction_id, b['bidder_id']), 'amount': b['amount'],
+             'bid_time': b['bid_time'], 'mine': viewer_id is not None and b['bidder_id'] == viewer_id}
+            for b in rows[:limit]]
+    return bids, (str(rows[limit - 1]['id']) if len(rows) > limit else None)
+
+
+@app.route('/api/auctions/<int:auction_id>/bids')
+def api_bid_history(auction_id):
+    """Bids newest first with bidders anonymized; pass `next_cursor` back as `cursor` for older bids."""
+    limit = _api_limit()
+    if limit is None:
+        return _api_response({'error': 'limit must be a positive integer'}, 400)
+    cursor = request.args.get('cursor')
+    before_id = parse_int_field(cursor, 'cursor')
+    if cursor and before_id is None:
+        return _api_response({'error': 'invalid cursor'}, 400)
+    bids, next_cursor = [], None
+    if USE_DB:
+        try:
+            auction = store.get_auction(auction_id)
+            bids, next_cursor = _bid_history_page(auction_id, before_id, limit,
+                                                  archived=bool(auction and auction.get('archived')))
+        except Exception as e:
+            logger.exception(f"get_bid_history failed in /api/auctions/<id>/bids: {e}")
+            return _api_response({'error': 'server error'}, 500)
+    for b in bids:
+        del b['mine']
+    return _api_response({'bids': bids, 'next_cursor': next_cursor})
+
+
 @app.route('/sell')
 def sell():
     # Redirect to the RESTful new-auction route for consistency
@@ -352,14 +541,14 @@ def register():
         if '@' not in request.form.get('email', '') and request.form.get('email'):
             return render_template('register.html', message='Invalid email address')
 
-        if USE_DB and create_member is not None:
+        if USE_DB:
             try:
                 first_name = request.form.get('first_name') or request.form.get('fname')
                 last_name = request.form.get('last_name') or request.form.get('lname')
                 email = request.form.get('email')
                 if first_name or last_name:
                     logger.info(f"New member extra fields captured: first={first_name}, last={last_name}")
-                new_id = create_member(username, password, email=email, role=request.form.get('role') or 'user')
+                new_id = store.create_member(username, password, email=email, role=request.form.get('role') or 'user')
                 if email:
                     token = generate_confirmation_token(new_id)
                     send_confirmation_email(email, token)
@@ -391,17 +580,17 @@ def user_login():
         username = request.form.get('username', '').strip()
         password = request.form.get('password', '')
 
-        if USE_DB and get_user_by_username is not None:
+        if USE_DB:
             if is_locked(username):
                 return render_template('user_login.html', message='Account locked. Try again later.')
             try:
-                user = get_user_by_username(username)
+                user = store.get_user_by_username(username)
             except Exception as e:
                 logger.warning(f"get_user_by_username failed: {e}")
                 user = None
             if user:
                 stored = user.get('password') or user.get('m_pass') or user.get('passwd') or user.get('pwd')
-                if verify_password and verify_password(stored, password):
+                if store.verify_password(stored, password):
                     session['u_name'] = username
                     if user.get('id'):
                         session['user_id'] = user.get('id')
@@ -476,25 +665,34 @@ def admin():
     if not user or not user_is_admin(user):
         # Not authorized
         abort(403)
-    # Optionally load member list for the main admin page too
+    # Optionally load one page of the member list for the main admin page too
     members = None
+    members_page = None
     auctions = None
     if USE_DB:
+        members_page = _members_page_from_request()
+        members = members_page['members'] if members_page else None
         try:
-            from db import get_all_members
-            members = get_all_members() or []
+            auctions = store.get_auctions(limit=50) or []
         except Exception:
-            members = None
+            auctions = None
+    slow_queries = querylog.top_queries()
+    db_health = conn_stats = None
+    if USE_DB:
         try:
-            from db import get_auctions
-            auctions = get_auctions(limit=50) or []
+            db_health = store.maintenance_stats()
+            conn_stats = store.connection_stats()
         except Exception:
-            auctions = None
+            logger.exception('maintenance_stats failed')
 
     try:
         # Prefer the `admin_panel_fixed.html` template if present
         try:
-            return render_template('admin_panel_fixed.html', user=user, members=members, auctions=auctions)
+            return render_template('admin_panel_fixed.html', user=user, members=members, auctions=auctions,
+                                   members_page=members_page, member_filters=_member_filters_from_request(),
+                                   slow_queries=slow_queries, slow_query_ms=querylog.SLOW_QUERY_MS,
+                                   cache_stats=cache.all_stats(), db_health=db_health,
+                                   conn_stats=conn_stats)
         except Exception:
             return render_template('admin_panel.html', user=user, members=members, auctions=auctions)
     except FileNotFoundError:
@@ -522,6 +720,31 @@ def admin():
         return 'Internal server error', 500
 
 
+def _member_filters_from_request():
+    """Member list filters/paging taken from the query string (status, role, q, sort, dir, page)."""
+    return {
+        'status': (request.args.get('status') or '').strip() or None,
+        'role': request.args.get('role') if request.args.get('role') in ('admin', 'user') else None,
+        'q': (request.args.get('q') or '').strip() or None,
+        'sort': request.args.get('sort') or 'id',
+        'dir': 'desc' if request.args.get('dir') == 'desc' else 'asc',
+        'page': parse_int_field(request.args.get('page'), 'page') or 1,
+    }
+
+
+def _members_page_from_request(per_page=50):
+    """Load one filtered page of members for the admin templates, or None if the DB is unavailable."""
+    f = _member_filters_from_request()
+    if not USE_DB:
+        return None
+    try:
+        return store.get_members_page(page=f['page'], per_page=per_page, status=f['status'], role=f['role'],
+                                login_prefix=f['q'], sort=f['sort'], descending=f['dir'] == 'desc')
+    except Exception:
+        logger.exception('Failed to load member page')
+        return None
+
+
 def _require_admin():
     """Ensure current session is an admin. Returns user dict or aborts/redirects."""
     if not session.get('u_name'):
@@ -533,7 +756,7 @@ def _require_admin():
 
 
 def _resolve_member_id(identifier):
-    """Resolve a username or id-like identifier to a numeric member id when possible.
+    """Resolve a member id, username or email to a numeric member id when possible.
 
     Returns an int member id or None.
     """
@@ -548,17 +771,10 @@ def _resolve_member_id(identifier):
 
     if USE_DB:
         try:
-            # try direct helper if available
-            if 'get_user_by_username' in globals() and callable(get_user_by_username):
-                m = get_user_by_username(identifier)
-                if m:
-                    return m.get('id') or m.get('m_id')
-            # fallback: scan members list if available
-            if 'get_all_members' in globals() and callable(get_all_members):
-                for mem in get_all_members() or []:
-                    uname = (mem.get('username') or mem.get('m_login_id') or '')
-                    if uname and uname.lower() == str(identifier).lower():
-                        return mem.get('id') or mem.get('m_id')
+            # single indexed lookup by login or email, case-insensitive
+            m = store.resolve_member(identifier)
+            if m:
+                return m.get('id') or m.get('m_id')
         except Exception:
             pass
     return None
@@ -576,14 +792,8 @@ def admin_resend():
         return redirect(url_for('admin'))
     if USE_DB:
         try:
-            # member_id may be numeric id or username/email
-            mid = _resolve_member_id(member_id)
-            member = None
-            if mid and 'get_member_by_id' in globals() and callable(get_member_by_id):
-                member = get_member_by_id(mid)
-            # if not found, try lookup by username
-            if not member and 'get_user_by_username' in globals() and callable(get_user_by_username):
-                member = get_user_by_username(member_id)
+            # member_id may be numeric id, username or email
+            member = store.resolve_member(member_id)
             if member:
                 email = member.get('email') or member.get('m_email')
         except Exception:
@@ -607,6 +817,36 @@ def admin_resend():
     return redirect(url_for('admin'))
 
 
+@app.route('/admin/slow-queries/reset', methods=['POST'])
+def admin_reset_slow_queries():
+    """Admin-only endpoint to clear this worker's slow-query table."""
+    user = _require_admin()
+    if isinstance(user, tuple):
+        return user
+    querylog.reset()
+    flash('Slow-query log cleared.', 'success')
+    return redirect(url_for('admin'))
+
+
+@app.route('/admin/maintenance', methods=['POST'])
+def admin_run_maintenance():
+    """Admin-only endpoint to run one bounded maintenance pass now."""
+    user = _require_admin()
+    if isinstance(user, tuple):
+        return user
+    if not USE_DB:
+        flash('DB not configured; nothing to maintain.', 'error')
+        return redirect(url_for('admin'))
+    try:
+        result = store.run_maintenance()
+        flash(f"Maintenance done: {result['reclaimed_pages']} page(s) reclaimed, "
+              f"free ratio {result['after']['free_ratio']:.1%}.", 'success')
+    except Exception as e:
+        logger.exception('admin_run_maintenance failed: %s', e)
+        flash('Maintenance failed (server error).', 'error')
+    return redirect(url_for('admin'))
+
+
 @app.route('/admin/auction/<int:a_id>/delete', methods=['POST'])
 def admin_delete_auction(a_id):
     """Admin-only endpoint to permanently delete an auction and its bids."""
@@ -617,8 +857,7 @@ def admin_delete_auction(a_id):
         flash('DB not configured; cannot delete auctions.', 'error')
         return redirect(url_for('admin'))
     try:
-        from db import delete_auction_and_bids
-        deleted_auctions, deleted_bids = delete_auction_and_bids(a_id)
+        deleted_auctions, deleted_bids = store.delete_auction_and_bids(a_id)
         if deleted_auctions:
             flash(f'Deleted auction {a_id} and {deleted_bids} bids.', 'success')
         else:
@@ -643,9 +882,8 @@ def admin_unlock():
     if USE_DB:
         try:
             # Use confirm_member as a way to activate/unlock accounts in DB
-            from db import confirm_member
             if mid:
-                ok = confirm_member(mid)
+                ok = store.confirm_member(mid)
                 acted = bool(ok)
         except Exception:
             acted = False
@@ -676,8 +914,7 @@ def admin_grant():
         mid = _resolve_member_id(member)
         if USE_DB and mid:
             try:
-                from db import set_member_admin
-                ok = set_member_admin(mid, True)
+                ok = store.set_member_admin(mid, True)
                 if ok:
                     flash('Granted admin role.', 'success')
                 else:
@@ -706,8 +943,7 @@ def admin_revoke():
         mid = _resolve_member_id(member)
         if USE_DB and mid:
             try:
-                from db import set_member_admin
-                ok = set_member_admin(mid, False)
+                ok = store.set_member_admin(mid, False)
                 if ok:
                     flash('Revoked admin role.', 'success')
                 else:
@@ -729,14 +965,13 @@ def admin_members():
     if isinstance(user, tuple):
         return user
     members = None
+    members_page = None
     if USE_DB:
-        try:
-            from db import get_all_members
-            members = get_all_members() or []
-        except Exception:
-            members = None
+        members_page = _members_page_from_request()
+        members = members_page['members'] if members_page else None
     try:
-        return render_template('admin_panel_fixed.html', user=user, members=members)
+        return render_template('admin_panel_fixed.html', user=user, members=members, members_page=members_page,
+                               member_filters=_member_filters_from_request())
     except Exception:
         return render_template('admin_panel.html', user=user, members=members)
 
@@ -775,8 +1010,7 @@ def admin_auction_housekeep(a_id):
 
     if USE_DB:
         try:
-            from db import update_auction_housekeeping
-            ok = update_auction_housekeeping(a_id, action, params)
+            ok = store.update_auction_housekeeping(a_id, action, params)
             if ok:
                 flash(f'Auction {a_id} updated: {action}', 'success')
             else:
@@ -789,47 +1023,93 @@ def admin_auction_housekeep(a_id):
     return redirect(url_for('admin'))
 
 
+@app.route('/admin/auctions/housekeep', methods=['POST'])
+def admin_bulk_housekeep():
+    """Admin-only bulk housekeeping: one action applied to many auctions in one transaction.
+
+    Auctions are selected by checked/typed ids (`ids`, `id_list`) and/or by
+    filter (`filter_status`, `ending_before`). Action parameters use the same
+    field names as the single-auction form (`end_date`, `days`, `status`).
+    """
+    user = _require_admin()
+    if isinstance(user, tuple):
+        return user
+    action = request.form.get('action')
+    if not action:
+        flash('Action is required for housekeeping.', 'error')
+        return redirect(url_for('admin'))
+    raw_ids = request.form.getlist('ids') + (request.form.get('id_list') or '').replace(',', ' ').split()
+    ids = [i for i in (parse_int_field(v, 'ids') for v in raw_ids) if i is not None]
+    op = {
+        'action': action,
+        'ids': ids or None,
+        'status': request.form.get('filter_status') or None,
+        'ending_before': request.form.get('ending_before') or None,
+        'end_date': request.form.get('end_date') or None,
+        'days': parse_int_field(request.form.get('days'), 'days'),
+        'new_status': request.form.get('status') or None,
+    }
+    if not (op['ids'] or op['status'] or op['ending_before']):
+        flash('Select auctions by id or filter before applying a bulk action.', 'error')
+        return redirect(url_for('admin'))
+
+    if USE_DB:
+        try:
+            counts = store.bulk_auction_housekeeping([op])
+            updated = counts.get(action, 0)
+            flash(f'{action}: {updated} auction(s) updated.', 'success' if updated else 'warning')
+        except ValueError as e:
+            flash(f'Bulk housekeeping rejected: {e}', 'error')
+        except Exception as e:
+            logger.exception('admin_bulk_housekeep failed: %s', e)
+            flash('Failed to perform bulk housekeeping (server error).', 'error')
+    else:
+        flash('DB not configured; cannot perform housekeeping.', 'error')
+    return redirect(url_for('admin'))
+
+
 @app.route('/auction/<int:item_id>')
 @app.route('/auctions/<int:item_id>')
 def view_auction(item_id):
-    if not (USE_DB and get_auction):
+    if not USE_DB:
         abort(404)
     try:
-        from db import get_connection, get_item_images
-        item = get_auction(item_id)
+        item = store.get_auction(item_id)
         if not item:
             abort(404)
-        # Try to fetch highest bid for display
+        user = _user_dict_from_session()
+        viewer_id = (user.get('id') or user.get('m_id')) if user else None
+        # Highest bid for display; the bidder is shown by the same alias as in the bid history
         highest_bid = None
         try:
-            conn = get_connection()
-            cur = conn.cursor()
-            try:
-                cur.execute("SELECT TOP 1 b_amount AS a_s_price, b_m_id FROM dbo.bid WHERE b_a_id = ? ORDER BY b_amount DESC", (item_id,))
-                row = cur.fetchone()
-                if row:
-                    highest_bid = {'a_s_price': getattr(row, 'a_s_price', None) or (row[0] if len(row) > 0 else None),
-                                   'a_m_id': getattr(row, 'b_m_id', None) or (row[1] if len(row) > 1 else None)}
-            except Exception:
-                try:
-                    cur.execute("SELECT TOP 1 amount AS a_s_price, member_id FROM dbo.bid WHERE auction_id = ? ORDER BY amount DESC", (item_id,))
-                    row = cur.fetchone()
-                    if row:
-                        highest_bid = {'a_s_price': getattr(row, 'a_s_price', None) or (row[0] if len(row) > 0 else None),
-                                       'a_m_id': getattr(row, 'member_id', None) or (row[1] if len(row) > 1 else None)}
-                except Exception:
-                    highest_bid = None
-        finally:
-            try:
-                conn.close()
-            except Exception:
-                pass
+            top = store.get_highest_bid(item_id, archived=bool(item.get('archived')))
+            if top:
+                highest_bid = {'a_s_price': top['amount'], 'bidder': _bidder_alias(item_id, top['bidder_id']),
+                               'mine': viewer_id is not None and top['bidder_id'] == viewer_id}
+        except Exception:
+            logger.exception('get_highest_bid failed for auction %s', item_id)
         # Fetch image list for gallery if available
         try:
-            images = get_item_images(item_id) or []
+            images = store.get_item_images(item_id) or []
         except Exception:
             images = []
-        return render_template('item.html', item=item, highest_bid=highest_bid, images=images)
+        # The viewer's own proxy maximum, shown with the bid form
+        my_max = None
+        if viewer_id:
+            try:
+                my_max = store.get_proxy_bid(item_id, viewer_id)
+            except Exception:
+                logger.exception('get_proxy_bid failed for auction %s', item_id)
+        # One page of bid history; "Older bids" links carry the keyset cursor
+        bids, bids_cursor = [], None
+        bids_before = parse_int_field(request.args.get('bids_before'), 'bids_before')
+        try:
+            bids, bids_cursor = _bid_history_page(item_id, bids_before, BID_HISTORY_PAGE, viewer_id,
+                                                  archived=bool(item.get('archived')))
+        except Exception:
+            logger.exception('get_bid_history failed for auction %s', item_id)
+        return render_template('item.html', item=item, highest_bid=highest_bid, images=images, my_max=my_max,
+                               bids=bids, bids_cursor=bids_cursor)
     except Exception as e:
         logger.exception(f"Error in /auction/<item_id>: {e}")
         if app.debug:
@@ -854,9 +1134,9 @@ def place_bid_route(auction_id):
         return redirect(url_for('view_auction', item_id=auction_id))
 
     bidder_id = user.get('id') or user.get('m_id')
-    if not bidder_id and USE_DB and get_user_by_username:
+    if not bidder_id and USE_DB:
         try:
-            fresh = get_user_by_username(user.get('username') or user.get('m_login_id'))
+            fresh = store.get_user_by_username(user.get('username') or user.get('m_login_id'))
             bidder_id = fresh.get('id') or fresh.get('m_id')
         except Exception:
             bidder_id = None
@@ -866,10 +1146,9 @@ def place_bid_route(auction_id):
     if USE_DB:
         try:
             # Check auction existence and status first for clearer messages
-            from db import get_auction, get_connection, place_bid
             auc = None
             try:
-                auc = get_auction(auction_id)
+                auc = store.get_auction(auction_id)
             except Exception:
                 auc = None
             if not auc:
@@ -890,69 +1169,31 @@ def place_bid_route(auction_id):
                 # ignore and continue
                 pass
 
-            # Determine current highest bid numeric value
-            current = 0.0
-            try:
-                conn = get_connection()
-                cur = conn.cursor()
-                try:
-                    cur.execute("SELECT MAX(b_amount) AS maxb FROM dbo.bid WHERE b_a_id = ?", (auction_id,))
-                    row = cur.fetchone()
-                    if row:
-                        try:
-                            current = float(getattr(row, 'maxb') or 0)
-                        except Exception:
-                            current = float(row[0] or 0)
-                except Exception:
-                    try:
-                        cur.execute("SELECT MAX(amount) AS maxb FROM dbo.bid WHERE auction_id = ?", (auction_id,))
-                        row = cur.fetchone()
-                        if row:
-                            try:
-                                current = float(getattr(row, 'maxb') or 0)
-                            except Exception:
-                                current = float(row[0] or 0)
-                    except Exception:
-                        current = 0.0
-                finally:
-                    try:
-                        conn.close()
-                    except Exception:
-                        pass
-            except Exception:
-                current = 0.0
-
-            # Fallback to auction starting price when no bids
-            if current == 0.0:
-                try:
-                    # try common auction starting price column
-                    from db import get_connection as _gc
-                    cconn = _gc()
-                    ccur = cconn.cursor()
-                    try:
-                        ccur.execute("SELECT a_s_price FROM dbo.auction WHERE a_id = ?", (auction_id,))
-                        r = ccur.fetchone()
-                        if r:
-                            try:
-                                current = float(getattr(r, 'a_s_price') or 0)
-                            except Exception:
-                                current = float(r[0] or 0)
-                    finally:
-                        try:
-                            cconn.close()
-                        except Exception:
-                            pass
-                except Exception:
-                    current = 0.0
+            # Price to beat: the highest bid, or the starting price when there are none
+            top = store.get_highest_bid(auction_id, archived=bool(auc.get('archived')))
+            current = top['amount'] if top else float(auc.get('starting_price') or 0)
 
             # If bid is not higher than current, provide a clearer message
+            symbol = os.getenv('CURRENCY_SYMBOL', 'HK$')
             if bid_val <= current:
-                symbol = os.getenv('CURRENCY_SYMBOL', 'HK$')
                 flash(f'Your bid must be higher than the current highest bid ({symbol}{current:.2f}).', 'error')
                 return redirect(url_for('view_auction', item_id=auction_id))
 
+            # "Bid up to this amount": store a hidden maximum and let proxies settle the price
+            if request.form.get('auto'):
+                result = store.place_max_bid(auction_id, bidder_id, bid_val)
+                if result is None:
+                    flash('Your maximum was not accepted (it must raise any maximum you already set).', 'error')
+                elif result['leading']:
+                    flash(f"You are the highest bidder at {symbol}{result['current_price']:.2f}; "
+                          f"we will bid for you up to {symbol}{result['max_amount']:.2f}.", 'success')
+                else:
+                    flash(f"Another bidder's maximum is higher; the price is now "
+                          f"{symbol}{result['current_price']:.2f}.", 'warning')
+                return redirect(url_for('view_auction', item_id=auction_id))
+
             # Attempt to place the bid
-            ok = place_bid(auction_id, bidder_id, bid_val)
+            ok = store.place_bid(auction_id, bidder_id, bid_val)
             if ok:
                 flash('Your bid was placed successfully.', 'success')
             else:
@@ -997,7 +1238,7 @@ def forgotpasswd():
 
 @app.route('/how_to_bid')
 def how_to_bid():
-    if not (USE_DB and get_auctions):
+    if not USE_DB:
         abort(404)
     try:
         return render_template('how_to_bid.html')
@@ -1067,10 +1308,8 @@ def validate_uploaded_images(files):
 
 def create_auction_in_db(title, desc, seller_id, starting_price, end_date, category, sub_category):
     """Insert item and auction into the database."""
-    from db import create_item_and_auction
-
     try:
-        result = create_item_and_auction(
+        result = store.create_item_and_auction(
             title, desc, seller_id=seller_id, starting_price=starting_price,
             end_date=end_date, category=parse_int_field(category, 'category'),
             sub_category=parse_int_field(sub_category, 'sub_category')
@@ -1088,7 +1327,6 @@ def create_auction_in_db(title, desc, seller_id, starting_price, end_date, categ
 
 def save_uploaded_images(valid_images, item_id):
     """Save images to the filesystem and update the database."""
-    from db import add_item_image, set_item_image
     upload_dir = os.path.join(app.static_folder or 'static', 'uploads')
     os.makedirs(upload_dir, exist_ok=True)
 
@@ -1105,13 +1343,11 @@ def save_uploaded_images(valid_images, item_id):
             f.save(out_path)
 
             web_image = f"/static/uploads/{stored_name}"
-            if add_item_image:
-                add_item_image(item_id, web_image, None, sort_order=idx)
+            store.add_item_image(item_id, web_image, None, sort_order=idx)
 
             if idx == 1:
                 saved_image_path = web_image
-                if set_item_image:
-                    set_item_image(item_id, saved_image_path)
+                store.set_item_image(item_id, saved_image_path)
         except Exception as e:
             logger.exception('Failed saving uploaded image: %s', e)
 
@@ -1152,7 +1388,35 @@ def new_auction():
     return render_template('post_items_for_sale.html', categories=categories)
 
 
+# Compile every template now, while the worker boots, instead of on the first
+# request that happens to use each one.
+if template_cache.TEMPLATE_WARMUP:
+    template_cache.precompile_templates(app.jinja_env)
+
+
+WARMUP_PATHS = [p.strip() for p in os.getenv('WARMUP_PATHS', '/,/auctions,/popular,/ending,/new').split(',') if p.strip()]
+
+
+def warm_up(paths=None):
+    """Prime this process's caches by serving `paths` in-process; returns elapsed ms.
+
+    Called by gunicorn's `post_worker_init` hook so each worker fills its own
+    auction and fragment caches before taking traffic.
+    """
+    start = time.perf_counter()
+    client = app.test_client()
+    for path in WARMUP_PATHS if paths is None else paths:
+        try:
+            client.get(path)
+        except Exception:
+            logger.exception('Warm-up request %s failed', path)
+    return (time.perf_counter() - start) * 1000
+
+
 if __name__ == "__main__":
+    # debug=True runs the app in a reloader child; only that process (WERKZEUG_RUN_MAIN set) serves requests.
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        maintenance.start(store)
     host = os.getenv('HOST', '127.0.0.1')
     port = int(os.getenv('PORT', '5000'))
     app.run(host=host, port=port, debug=True)
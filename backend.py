@@ -0,0 +1,160 @@
+"""Data backend registry.
+
+The app talks to exactly one data module, chosen once when `app` is imported:
+
+    DB_BACKEND=sqlite      db.py (also the default when USE_DB is set)
+    DB_BACKEND=sqlserver   db_sqlserver.py
+    neither set            demo mode, `load()` returns None
+
+Both modules implement `DataBackend`. Routes call through the module object
+(`store.get_auction(...)` in app.py), so tests can keep patching `db.<function>`.
+"""
+
+from __future__ import annotations
+
+import importlib
+import logging
+import os
+from datetime import datetime
+from types import ModuleType
+from typing import Any, Iterable, List, Optional, Protocol, Sequence, Tuple
+
+BACKENDS = {
+    'sqlite': 'db',
+    'sqlserver': 'db_sqlserver',
+}
+
+logger = logging.getLogger('auth')
+
+
+class DataBackend(Protocol):
+    """Functions the web app relies on; `db` and `db_sqlserver` both provide them."""
+
+    def get_connection(self) -> Any: ...
+
+    def reset_after_fork(self) -> None: ...
+
+    def url_for_static_placeholder(self) -> str: ...
+
+    # auctions and items
+    def get_auctions(self, limit: Optional[int] = 50) -> List[dict]: ...
+
+    def get_auctions_page(self, before_id: Optional[int] = None, limit: int = 50) -> List[dict]: ...
+
+    def get_auction(self, auction_id: int) -> Optional[dict]: ...
+
+    def get_ranked_auctions(self, kind: str, limit: int = 20, offset: int = 0) -> List[dict]: ...
+
+    def get_categories(self) -> List[tuple]: ...
+
+    def create_item_and_auction(self, title: str, description: Optional[str], seller_id: Optional[int] = None,
+                                starting_price: float = 0.0, end_date: Optional[datetime] = None, *,
+                                category: Optional[int] = None, sub_category: Optional[int] = None) -> Tuple[int, int]: ...
+
+    def get_item_images(self, item_id: int) -> List[dict]: ...
+
+    def add_item_image(self, item_id: int, image_url: str, thumb_url: Optional[str] = None,
+                       sort_order: int = 0) -> Optional[int]: ...
+
+    def set_item_image(self, item_id: int, image_path: str) -> bool: ...
+
+    def delete_item_image(self, img_id: int) -> bool: ...
+
+    def reorder_item_images(self, item_id: int, ordered_img_ids: Iterable[int]) -> bool: ...
+
+    # bids
+    def get_highest_bid(self, auction_id: int, archived: bool = False) -> Optional[dict]: ...
+
+    def get_bid_history(self, auction_id: int, before_id: Optional[int] = None, limit: int = 50,
+                        archived: bool = False) -> List[dict]: ...
+
+    def place_bid(self, auction_id: int, bidder_m_id: int, amount) -> bool: ...
+
+    def place_max_bid(self, auction_id: int, bidder_m_id: int, max_amount) -> Optional[dict]: ...
+
+    def get_proxy_bid(self, auction_id: int, bidder_m_id: int) -> Optional[dict]: ...
+
+    def refresh_bid_stats(self, auction_ids: Optional[Iterable[int]] = None) -> int: ...
+
+    def check_bid_stats(self, limit: Optional[int] = None) -> List[dict]: ...
+
+    # members
+    def get_user_by_username(self, username: str) -> Optional[dict]: ...
+
+    def verify_password(self, stored_password, provided_password) -> bool: ...
+
+    def create_member(self, login_id: str, plain_password: str, email: Optional[str] = None,
+                      role: Optional[str] = None) -> int: ...
+
+    def confirm_member(self, m_id: int) -> bool: ...
+
+    def get_member_by_id(self, m_id: int) -> Optional[dict]: ...
+
+    def get_all_members(self) -> List[dict]: ...
+
+    def get_members_page(self, page: int = 1, per_page: int = 50, status: Optional[str] = None,
+                         role: Optional[str] = None, login_prefix: Optional[str] = None,
+                         sort: str = 'id', descending: bool = False) -> dict: ...
+
+    def resolve_member(self, identifier) -> Optional[dict]: ...
+
+    def set_member_admin(self, m_id: int, is_admin: bool = True) -> bool: ...
+
+    # admin housekeeping
+    def update_auction_housekeeping(self, a_id: int, action: str, params: Optional[dict] = None) -> bool: ...
+
+    def bulk_auction_housekeeping(self, operations: Sequence[dict]) -> dict: ...
+
+    def close_expired_auctions(self, batch_size: Optional[int] = None) -> int: ...
+
+    def delete_auction_and_bids(self, auction_id: int) -> Tuple[int, int]: ...
+
+    def archive_closed_auctions(self, older_than_days: Optional[int] = None, batch_size: Optional[int] = None,
+                                max_batches: Optional[int] = None) -> dict: ...
+
+    def maintenance_stats(self) -> dict: ...
+
+    def connection_stats(self, reset_peaks: bool = False) -> Optional[dict]: ...
+
+    def run_maintenance(self, vacuum_pages: Optional[int] = None, analyze: bool = False, convert: bool = False,
+                        min_interval_s: Optional[float] = None) -> Optional[dict]: ...
+
+
+INTERFACE = tuple(sorted(name for name in vars(DataBackend) if not name.startswith('_')))
+
+
+def configured_name() -> Optional[str]:
+    """Backend name from DB_BACKEND, falling back to sqlite when USE_DB is set; None means demo mode."""
+    name = os.getenv('DB_BACKEND', '').strip().lower()
+    if name:
+        return name
+    if os.getenv('USE_DB', '').lower() in ('1', 'true', 'yes'):
+        return 'sqlite'
+    return None
+
+
+def missing_functions(module: ModuleType) -> List[str]:
+    return [name for name in INTERFACE if not callable(getattr(module, name, None))]
+
+
+def load(name: Optional[str] = None) -> Optional[DataBackend]:
+    """Import and check the configured backend module.
+
+    Raises ValueError for an unknown backend name and RuntimeError when the
+    module lacks part of `DataBackend`. If the module itself cannot be
+    imported the app stays in demo mode, as it always has.
+    """
+    name = configured_name() if name is None else name
+    if not name:
+        return None
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown DB_BACKEND {name!r}; expected one of {', '.join(BACKENDS)}")
+    try:
+        module = importlib.import_module(BACKENDS[name])
+    except Exception:
+        logger.exception('Data backend %s could not be imported; running in demo mode', name)
+        return None
+    missing = missing_functions(module)
+    if missing:
+        raise RuntimeError(f"Backend {name} ({module.__name__}) is missing: {', '.join(missing)}")
+    return module
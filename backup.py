@@ -0,0 +1,224 @@
+"""Online backups of the SQLite database.
+
+`snapshot()` copies the live file with the sqlite3 backup API, BACKUP_STEP_PAGES
+pages at a time with a BACKUP_STEP_SLEEP_S pause between steps so writers keep
+getting the lock. It checks the copy, gzips it beside a sha256 sidecar
+(`sha256sum -c` format) and keeps only the newest BACKUP_KEEP snapshots.
+
+In WAL mode the copy reads one pinned snapshot, so it never restarts and never
+blocks writers. With a rollback journal every commit from another connection
+restarts the copy; after BACKUP_MAX_RESTARTS it finishes the remaining pages in
+a single step instead.
+
+`restore()` verifies a snapshot and writes it back through the same API,
+so it is safe while workers are running; their caches are invalidated through
+`change_log`.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import logging
+import os
+import shutil
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+BACKUP_DIR = Path(os.getenv('BACKUP_DIR', Path(__file__).resolve().parent / 'tools' / 'backups' / 'sqlite'))
+BACKUP_KEEP = int(os.getenv('BACKUP_KEEP', '14'))
+BACKUP_STEP_PAGES = int(os.getenv('BACKUP_STEP_PAGES', '256'))
+BACKUP_STEP_SLEEP_S = float(os.getenv('BACKUP_STEP_SLEEP_S', '0.01'))
+BACKUP_MAX_RESTARTS = int(os.getenv('BACKUP_MAX_RESTARTS', '3'))
+BACKUP_INTERVAL_S = float(os.getenv('BACKUP_INTERVAL_S', '0'))
+
+logger = logging.getLogger('auth')
+
+
+class _TooManyRestarts(Exception):
+    """Raised from the progress callback to abandon a stepped copy that keeps restarting."""
+
+
+def _default_db_path() -> Path:
+    import db
+    return Path(db.DB_PATH)
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _check(path: Path) -> None:
+    conn = sqlite3.connect(path)
+    try:
+        result = conn.execute("PRAGMA quick_check").fetchone()[0]
+    finally:
+        conn.close()
+    if result != 'ok':
+        raise RuntimeError(f"{path.name} failed quick_check: {result}")
+
+
+def _copy_live(src_path: Path, dst_path: Path, pages: int, sleep_s: float, max_restarts: int) -> dict:
+    src = sqlite3.connect(src_path, timeout=30)
+    dst = sqlite3.connect(dst_path)
+    state = {'remaining': None, 'restarts': 0, 'steps': 0, 'pages': 0}
+
+    def progress(status, remaining, total):
+        if state['remaining'] is not None and remaining > state['remaining']:
+            state['restarts'] += 1
+            if state['restarts'] > max_restarts:
+                raise _TooManyRestarts()
+        state['remaining'], state['pages'] = remaining, total
+        state['steps'] += 1
+
+    try:
+        wal = src.execute("PRAGMA journal_mode").fetchone()[0].lower() == 'wal'
+        if wal:
+            src.execute("BEGIN")
+            src.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchall()
+        try:
+            src.backup(dst, pages=pages, progress=progress, sleep=sleep_s)
+        except _TooManyRestarts:
+            # One step holds the read lock until the copy is done; bounded by the file size.
+            src.backup(dst)
+        if wal:
+            src.rollback()
+    finally:
+        dst.close()
+        src.close()
+    return {'wal': wal, 'steps': state['steps'], 'restarts': state['restarts'], 'pages': state['pages']}
+
+
+def list_snapshots(dest_dir: Optional[Path] = None) -> List[Path]:
+    """Snapshot files in `dest_dir`, newest first."""
+    return sorted(Path(dest_dir or BACKUP_DIR).glob('*.db.gz'), reverse=True)
+
+
+def rotate(dest_dir: Optional[Path] = None, keep: Optional[int] = None) -> List[str]:
+    """Delete all but the newest `keep` snapshots (and their sidecars); returns the removed names."""
+    keep = BACKUP_KEEP if keep is None else keep
+    removed = []
+    for path in list_snapshots(dest_dir)[max(keep, 1):]:
+        path.unlink()
+        Path(f"{path}.sha256").unlink(missing_ok=True)
+        removed.append(path.name)
+    return removed
+
+
+def snapshot(dest_dir: Optional[Path] = None, db_path: Optional[Path] = None, keep: Optional[int] = None,
+             pages: Optional[int] = None, sleep_s: Optional[float] = None) -> dict:
+    """Take a checked, compressed, checksummed snapshot of the live database and rotate old ones.
+
+    Returns {path, sha256, bytes, db_bytes, wal, steps, restarts, pages, seconds, removed}.
+    """
+    src_path = Path(db_path or _default_db_path())
+    dest = Path(dest_dir or BACKUP_DIR)
+    dest.mkdir(parents=True, exist_ok=True)
+    now = datetime.utcnow()
+    name = f"{src_path.stem}-{now:%Y%m%dT%H%M%S_%f}Z.db.gz"
+    raw_tmp = dest / f".{name}.db.tmp"
+    gz_tmp = dest / f".{name}.tmp"
+    t0 = time.perf_counter()
+    try:
+        copy = _copy_live(src_path, raw_tmp, BACKUP_STEP_PAGES if pages is None else pages,
+                          BACKUP_STEP_SLEEP_S if sleep_s is None else sleep_s, BACKUP_MAX_RESTARTS)
+        _check(raw_tmp)
+        with open(raw_tmp, 'rb') as f_in, gzip.open(gz_tmp, 'wb', compresslevel=6) as f_out:
+            shutil.copyfileobj(f_in, f_out, 1 << 20)
+        db_bytes = raw_tmp.stat().st_size
+        final = dest / name
+        os.replace(gz_tmp, final)
+    finally:
+        raw_tmp.unlink(missing_ok=True)
+        gz_tmp.unlink(missing_ok=True)
+    checksum = _sha256(final)
+    Path(f"{final}.sha256").write_text(f"{checksum}  {final.name}\n")
+    return {'path': str(final), 'sha256': checksum, 'bytes': final.stat().st_size, 'db_bytes': db_bytes,
+            **copy, 'seconds': round(time.perf_counter() - t0, 3), 'removed': rotate(dest, keep)}
+
+
+def verify(path: Path) -> bool:
+    """True when the snapshot matches its sha256 sidecar; ValueError if the sidecar is missing."""
+    path = Path(path)
+    sidecar = Path(f"{path}.sha256")
+    if not sidecar.exists():
+        raise ValueError(f"No checksum file for {path.name}")
+    return sidecar.read_text().split()[0] == _sha256(path)
+
+
+def restore(path: Path, db_path: Optional[Path] = None) -> dict:
+    """Replace the live database's contents with a verified snapshot.
+
+    Raises ValueError when the checksum does not match and RuntimeError when
+    the decompressed copy fails `quick_check`; the live file is untouched then.
+    """
+    import db
+
+    path = Path(path)
+    if not verify(path):
+        raise ValueError(f"Checksum mismatch for {path.name}")
+    target = Path(db_path or _default_db_path())
+    raw_tmp = target.with_name(f".{path.name}.restore.tmp")
+    t0 = time.perf_counter()
+    try:
+        with gzip.open(path, 'rb') as f_in, open(raw_tmp, 'wb') as f_out:
+            shutil.copyfileobj(f_in, f_out, 1 << 20)
+        _check(raw_tmp)
+        live = sqlite3.connect(target, timeout=30)
+        try:
+            seq_before = _change_log_seq(live)
+            src = sqlite3.connect(raw_tmp)
+            try:
+                src.backup(live)
+            finally:
+                src.close()
+            # Workers remember the last change_log seq they applied; continue past both
+            # histories so every one of them sees this "everything changed" entry.
+            seq = max(seq_before, _change_log_seq(live)) + 1
+            live.execute("INSERT INTO change_log(seq, entity, entity_id) VALUES (?, 'auction', NULL)", (seq,))
+            live.commit()
+        finally:
+            live.close()
+    finally:
+        raw_tmp.unlink(missing_ok=True)
+    if target == Path(db.DB_PATH):
+        db._invalidate_auctions(None)
+    return {'path': str(path), 'db_path': str(target), 'seconds': round(time.perf_counter() - t0, 3)}
+
+
+def _change_log_seq(conn: sqlite3.Connection) -> int:
+    try:
+        return conn.execute("SELECT COALESCE(MAX(seq), 0) FROM change_log").fetchone()[0]
+    except sqlite3.OperationalError:
+        return 0  # not an app database (yet)
+
+
+def scheduled_snapshot(interval_s: Optional[float] = None) -> Optional[dict]:
+    """Snapshot unless one is newer than ~`interval_s` or another worker is taking one; for the scheduler."""
+    interval = BACKUP_INTERVAL_S if interval_s is None else interval_s
+    dest = Path(BACKUP_DIR)
+    dest.mkdir(parents=True, exist_ok=True)
+    try:
+        import fcntl
+    except ImportError:
+        fcntl = None
+    with open(dest / '.lock', 'w') as lock:
+        if fcntl is not None:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                return None
+        newest = list_snapshots(dest)[:1]
+        if newest and time.time() - newest[0].stat().st_mtime < interval * 0.9:
+            return None
+        result = snapshot(dest)
+    logger.info('Backup %s: %d bytes in %.2fs, %d restart(s), removed %s',
+                result['path'], result['bytes'], result['seconds'], result['restarts'], result['removed'])
+    return result
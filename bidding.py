@@ -0,0 +1,80 @@
+"""Proxy (maximum) bidding.
+
+A bidder may leave a hidden maximum on an auction; the engine then bids for
+them only as far as needed to stay in front. `resolve` is pure: a backend
+calls it inside the transaction that holds the auction's write lock and
+inserts the bids it returns, so a contested auction settles in one write
+transaction instead of a series of manual re-bids.
+
+The increment ladder comes from BID_INCREMENTS, "from:step" pairs in
+ascending order. With the default, the next bid on a HK$150 auction must be
+at least HK$2.50 higher.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import List, Optional, Sequence, Tuple
+
+DEFAULT_INCREMENTS = "0:0.5,20:1,100:2.5,500:5,1000:10,5000:50"
+
+
+def parse_increments(spec: str) -> List[Tuple[float, float]]:
+    """Parse "from:step,..." into [(from, step)] sorted by `from`; raises ValueError on bad input."""
+    ladder = []
+    for part in spec.split(','):
+        if not part.strip():
+            continue
+        start, _, step = part.partition(':')
+        start_f, step_f = float(start), float(step)
+        if step_f <= 0 or start_f < 0:
+            raise ValueError(f"Bad bid increment {part.strip()!r}")
+        ladder.append((start_f, step_f))
+    if not ladder:
+        raise ValueError("BID_INCREMENTS is empty")
+    return sorted(ladder)
+
+
+INCREMENTS = parse_increments(os.getenv("BID_INCREMENTS", DEFAULT_INCREMENTS))
+
+
+def bid_increment(price: float, ladder: Optional[Sequence[Tuple[float, float]]] = None) -> float:
+    """Smallest raise over `price` a proxy bids by."""
+    step = None
+    for start, size in ladder or INCREMENTS:
+        if price < start:
+            break
+        step = size
+    return step if step is not None else (ladder or INCREMENTS)[0][1]
+
+
+def resolve(price: float, high_bidder_id: Optional[int],
+            proxies: Sequence[Tuple[int, float]]) -> List[Tuple[int, float]]:
+    """Bids the proxies place against the current `price` and `high_bidder_id`.
+
+    `proxies` holds the two strongest maximums on the auction as (member id,
+    maximum), highest first with ties in the order they were set, so an
+    earlier maximum wins a tie. Returns [(member id, amount)] to insert in
+    order; the last entry is the new high bid. Empty means nothing changes.
+    """
+    if not proxies:
+        return []
+    top_id, top_max = proxies[0]
+    runner = proxies[1] if len(proxies) > 1 else None
+    # A runner-up whose maximum is already beaten has nothing left to bid.
+    runner_max = runner[1] if runner and runner[1] > price else None
+    if top_id == high_bidder_id:
+        if runner_max is None:
+            return []
+        competitor = runner_max
+    else:
+        if top_max <= price:
+            return []
+        competitor = runner_max if runner_max is not None else price
+    amount = round(min(top_max, competitor + bid_increment(competitor)), 2)
+    bids = []
+    if runner_max is not None and runner_max < amount:
+        # Record the runner-up's last bid so the history shows what was beaten.
+        bids.append((runner[0], round(runner_max, 2)))
+    bids.append((top_id, amount))
+    return bids
@@ -0,0 +1,111 @@
+"""Small in-process caches with LRU eviction, TTL expiry and hit statistics.
+
+Every cache registers itself by name so the admin panel can show
+`all_stats()`. Caches are per process; writers publish invalidations to other
+workers through the `change_log` table (see `db.py`), which readers poll.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+_registry: Dict[str, "LRUCache"] = {}
+_MISSING = object()
+
+
+class LRUCache:
+    """Thread-safe mapping bounded by entry count, with an optional per-entry TTL."""
+
+    def __init__(self, name: str, maxsize: int = 1024, ttl: Optional[float] = None):
+        self.name = name
+        self.maxsize = max(1, int(maxsize))
+        self.ttl = ttl if ttl and ttl > 0 else None
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = self.invalidations = 0
+        # Bumped by every invalidation; `set(..., if_version=v)` drops values
+        # loaded before a concurrent write invalidated them.
+        self.version = 0
+        _registry[name] = self
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            expires, value = entry
+            if expires and expires <= time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, if_version: Optional[int] = None) -> bool:
+        expires = time.monotonic() + self.ttl if self.ttl else 0.0
+        with self._lock:
+            if if_version is not None and if_version != self.version:
+                return False
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+            return True
+
+    def invalidate(self, key: Hashable) -> bool:
+        with self._lock:
+            self.version += 1
+            if self._data.pop(key, _MISSING) is _MISSING:
+                return False
+            self.invalidations += 1
+            return True
+
+    def invalidate_many(self, keys: Iterable[Hashable]) -> int:
+        return sum(1 for k in keys if self.invalidate(k))
+
+    def clear(self) -> None:
+        with self._lock:
+            self.version += 1
+            self.invalidations += len(self._data)
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.hits = self.misses = self.evictions = self.expirations = self.invalidations = 0
+
+
+def get_cache(name: str) -> Optional[LRUCache]:
+    return _registry.get(name)
+
+
+def all_stats() -> List[dict]:
+    return [c.stats() for c in sorted(_registry.values(), key=lambda c: c.name)]
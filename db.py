@@ -1,14 +1,35 @@
+import json
 import os
 import sqlite3
+import threading
+import time
+import zlib
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Iterable, List, Optional, Sequence, Tuple
 
 from werkzeug.security import check_password_hash, generate_password_hash
 
+import bidding
+from cache import LRUCache
+from querylog import TracedConnection
+from records import Auction, Bid, ItemImage, Member, RankedAuction, to_epoch
+
 BASE_DIR = Path(__file__).resolve().parent
 DB_PATH = Path(os.getenv("SQLITE_PATH", BASE_DIR / "iom.db"))
 CURRENCY_SYMBOL = os.getenv("CURRENCY_SYMBOL", "HK$")
+MEMBER_COUNT_TTL = float(os.getenv("MEMBER_COUNT_TTL", "60"))
+AUCTION_CACHE_SIZE = int(os.getenv("AUCTION_CACHE_SIZE", "1024"))
+AUCTION_CACHE_TTL = float(os.getenv("AUCTION_CACHE_TTL", "30"))
+CHANGE_LOG_POLL_S = float(os.getenv("CHANGE_LOG_POLL_S", "1"))
+CHANGE_LOG_KEEP = int(os.getenv("CHANGE_LOG_KEEP", "10000"))
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "90"))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+CLOSE_EXPIRED_BATCH_SIZE = int(os.getenv("CLOSE_EXPIRED_BATCH_SIZE", "500"))
+MAINTENANCE_VACUUM_PAGES = int(os.getenv("MAINTENANCE_VACUUM_PAGES", "2000"))
+MAINTENANCE_KEEP_RUNS = 100
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "wal")
+SQLITE_WRITER_WAIT_S = float(os.getenv("SQLITE_WRITER_WAIT_S", "10"))
 
 
 _SCHEMA_SQL = """
@@ -48,6 +69,9 @@ CREATE TABLE IF NOT EXISTS auction (
     a_s_date TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
     a_e_date TIMESTAMP,
     a_status TEXT NOT NULL DEFAULT 'open',
+    bid_count INTEGER NOT NULL DEFAULT 0,
+    high_bidder_id INTEGER,
+    last_bid_at TIMESTAMP,
     created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY(a_item_id) REFERENCES item(i_id) ON DELETE CASCADE,
@@ -78,6 +102,71 @@ CREATE TABLE IF NOT EXISTS category (
     cat_id INTEGER PRIMARY KEY AUTOINCREMENT,
     name TEXT NOT NULL UNIQUE
 );
+
+-- Append-only feed of writes that other workers poll to invalidate their caches.
+-- entity_id NULL means "every row of this entity".
+CREATE TABLE IF NOT EXISTS change_log (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    entity TEXT NOT NULL,
+    entity_id INTEGER,
+    changed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Hidden maximums for proxy bidding (see bidding.py). Raising a maximum replaces
+-- the row, so pb_id orders maximums by when they were set and breaks ties.
+CREATE TABLE IF NOT EXISTS proxy_bid (
+    pb_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    pb_a_id INTEGER NOT NULL,
+    pb_m_id INTEGER NOT NULL,
+    pb_max REAL NOT NULL,
+    pb_time TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(pb_a_id, pb_m_id),
+    FOREIGN KEY(pb_a_id) REFERENCES auction(a_id) ON DELETE CASCADE,
+    FOREIGN KEY(pb_m_id) REFERENCES member(m_id)
+);
+
+-- Cold copies of auctions closed for ARCHIVE_AFTER_DAYS and their bids, moved
+-- by archive_closed_auctions so the hot tables and their indexes stay small.
+-- Read-only: get_auction / get_highest_bid / get_bid_history fall back to them.
+CREATE TABLE IF NOT EXISTS auction_archive (
+    a_id INTEGER PRIMARY KEY,
+    a_item_id INTEGER NOT NULL,
+    a_m_id INTEGER,
+    a_s_price REAL NOT NULL DEFAULT 0,
+    a_c_price REAL NOT NULL DEFAULT 0,
+    a_s_date TIMESTAMP,
+    a_e_date TIMESTAMP,
+    a_status TEXT,
+    bid_count INTEGER NOT NULL DEFAULT 0,
+    high_bidder_id INTEGER,
+    last_bid_at TIMESTAMP,
+    created_at TIMESTAMP,
+    updated_at TIMESTAMP,
+    archived_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS bid_archive (
+    b_id INTEGER PRIMARY KEY,
+    b_a_id INTEGER NOT NULL,
+    b_m_id INTEGER NOT NULL,
+    b_amount REAL NOT NULL,
+    b_time TIMESTAMP NOT NULL
+);
+
+-- One row per run_maintenance call; also how workers agree whose turn it is.
+CREATE TABLE IF NOT EXISTS maintenance_run (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    finished_at TIMESTAMP,
+    stats TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_member_status ON member(m_status, m_id);
+CREATE INDEX IF NOT EXISTS idx_member_admin ON member(m_is_admin, m_id);
+CREATE INDEX IF NOT EXISTS idx_member_email_nocase ON member(m_email COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_bid_auction_amount ON bid(b_a_id, b_amount);
+CREATE INDEX IF NOT EXISTS idx_proxy_bid_rank ON proxy_bid(pb_a_id, pb_max DESC, pb_id);
+CREATE INDEX IF NOT EXISTS idx_bid_archive_amount ON bid_archive(b_a_id, b_amount);
 """
 
 _DEFAULT_CATEGORIES = [
@@ -90,27 +179,254 @@ _DEFAULT_CATEGORIES = [
 ]
 
 
+def _ensure_login_index(conn: sqlite3.Connection) -> None:
+    """Make logins unique regardless of case, falling back to a plain index.
+
+    Older databases may already hold logins differing only in case; those keep
+    working with a non-unique NOCASE index until the duplicates are cleaned up.
+    """
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name IN "
+                    "('idx_member_login_nocase', 'idx_member_login_nocase_dup')").fetchone():
+        return
+    try:
+        conn.execute("CREATE UNIQUE INDEX idx_member_login_nocase ON member(m_login_id COLLATE NOCASE)")
+    except sqlite3.IntegrityError:
+        conn.execute("CREATE INDEX idx_member_login_nocase_dup ON member(m_login_id COLLATE NOCASE)")
+    conn.commit()
+
+
+# Listing pages read these in index order, so each page is a bounded range scan
+# and place_bid / housekeeping keep them current as a side effect of their UPDATE.
+_RANKING_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_auction_popular ON auction(a_status, bid_count DESC, a_id)",
+    "CREATE INDEX IF NOT EXISTS idx_auction_ending ON auction(a_status, a_e_date)",
+    "CREATE INDEX IF NOT EXISTS idx_auction_new ON auction(a_status, a_s_date DESC, a_id DESC)",
+)
+
+# Integer epoch-second twins of the TIMESTAMP columns, computed by SQLite from the
+# text it already stores. Writes keep using the text columns; reads, ordering and
+# range filters use these, so no timestamp is parsed per row in Python. VIRTUAL:
+# nothing extra is stored in the table, only in the indexes below. strftime('%s')
+# truncates to whole seconds, so "still open" checks compare against the current
+# whole second (`a_e_epoch >= int(now)`) and never close an auction early.
+_EPOCH_COLUMNS = {
+    "auction": (("a_s_epoch", "a_s_date"), ("a_e_epoch", "a_e_date"), ("last_bid_epoch", "last_bid_at")),
+    "auction_archive": (("a_s_epoch", "a_s_date"), ("a_e_epoch", "a_e_date"), ("last_bid_epoch", "last_bid_at")),
+    "bid": (("b_epoch", "b_time"),),
+    "bid_archive": (("b_epoch", "b_time"),),
+}
+# Same names as the TIMESTAMP-keyed indexes they replace, so plans and tools still recognise them.
+_EPOCH_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_auction_ending ON auction(a_status, a_e_epoch)",
+    "CREATE INDEX IF NOT EXISTS idx_auction_new ON auction(a_status, a_s_epoch DESC, a_id DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_bid_auction_time ON bid(b_a_id, b_epoch DESC, b_id DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_bid_archive_time ON bid_archive(b_a_id, b_epoch DESC, b_id DESC)",
+)
+
+# Bump when adding a step to `_migrate`; stored in PRAGMA user_version.
+SCHEMA_VERSION = 3
+
+
+def _ensure_column(conn: sqlite3.Connection, table: str, column: str, ddl: str) -> bool:
+    """Add `column` to `table` unless it already exists; returns True if it was added."""
+    # table_xinfo: table_info leaves out generated columns.
+    if column in {r[1] for r in conn.execute(f"PRAGMA table_xinfo({table})")}:
+        return False
+    conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}")
+    return True
+
+
+def _migrate(conn: sqlite3.Connection) -> None:
+    """Bring databases created by older versions up to SCHEMA_VERSION."""
+    if conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+        return
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < 1:
+            added = [
+                _ensure_column(conn, "auction", "bid_count", "INTEGER NOT NULL DEFAULT 0"),
+                _ensure_column(conn, "auction", "high_bidder_id", "INTEGER"),
+                _ensure_column(conn, "auction", "last_bid_at", "TIMESTAMP"),
+            ]
+            if any(added):
+                refresh_bid_stats(conn=conn)
+        if version < 2:
+            # Not in _SCHEMA_SQL: these reference columns that older databases only get in step 1.
+            for stmt in _RANKING_INDEXES:
+                conn.execute(stmt)
+        if version < 3:
+            for table, columns in _EPOCH_COLUMNS.items():
+                for column, source in columns:
+                    _ensure_column(conn, table, column,
+                                   f"INTEGER GENERATED ALWAYS AS (CAST(strftime('%s', {source}) AS INTEGER)) VIRTUAL")
+            for stmt in _EPOCH_INDEXES:
+                conn.execute(f"DROP INDEX IF EXISTS {stmt.split()[5]}")
+                conn.execute(stmt)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
 def _ensure_schema(conn: sqlite3.Connection) -> None:
+    if conn.execute("PRAGMA page_count").fetchone()[0] == 0:
+        # Only settable before the first table exists; older files switch via run_maintenance(convert=True).
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    # Persistent in the file. In WAL mode readers never wait for the writer, nor it for them.
+    conn.execute(f"PRAGMA journal_mode = {SQLITE_JOURNAL_MODE}")
     conn.executescript(_SCHEMA_SQL)
+    _ensure_login_index(conn)
+    _migrate(conn)
     count = conn.execute("SELECT COUNT(*) FROM category").fetchone()[0]
     if count == 0:
         conn.executemany("INSERT INTO category(name) VALUES (?)", [(c,) for c in _DEFAULT_CATEGORIES])
         conn.commit()
 
 
+# Writers in this process take turns on one re-entrant gate, so threads queue here
+# instead of spinning in SQLite's busy handler; other workers still meet SQLite's
+# own lock. Re-entrant because a helper holding the writer may call another.
+_writer_gate = threading.RLock()
+_schema_ready: set = set()  # DB paths whose schema this process has checked
+_conn_stats_lock = threading.Lock()
+_conn_stats = {
+    "readers_active": 0, "readers_peak": 0, "readers_opened": 0,
+    "writer_queue": 0, "writer_queue_peak": 0, "writers_opened": 0,
+    "writer_wait_ms_total": 0.0, "writer_wait_ms_max": 0.0, "writer_wait_timeouts": 0,
+}
+
+
+def _bump(name: str, delta: int, peak: Optional[str] = None) -> None:
+    with _conn_stats_lock:
+        _conn_stats[name] += delta
+        if peak and _conn_stats[name] > _conn_stats[peak]:
+            _conn_stats[peak] = _conn_stats[name]
+
+
+class _WriterConnection(TracedConnection):
+    """Read-write connection; closing it hands the writer gate to the next queued thread.
+
+    As a context manager it commits (or rolls back on error) like any sqlite3
+    connection, then closes, so the gate cannot outlive the block.
+    """
+
+    holds_gate = False
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            return super().__exit__(exc_type, exc, tb)
+        finally:
+            self.close()
+
+    def close(self):
+        if self.holds_gate:
+            self.holds_gate = False
+            _writer_gate.release()
+        super().close()
+
+
+class _ReaderConnection(TracedConnection):
+    """Read-only connection, counted in `readers_active` until closed."""
+
+    counted = False
+
+    def close(self):
+        if self.counted:
+            self.counted = False
+            _bump("readers_active", -1)
+        super().close()
+
+
+def _acquire_writer() -> bool:
+    if _writer_gate.acquire(blocking=False):
+        return True
+    _bump("writer_queue", 1, "writer_queue_peak")
+    t0 = time.perf_counter()
+    acquired = _writer_gate.acquire(timeout=SQLITE_WRITER_WAIT_S)
+    waited = (time.perf_counter() - t0) * 1000
+    with _conn_stats_lock:
+        _conn_stats["writer_queue"] -= 1
+        _conn_stats["writer_wait_ms_total"] += waited
+        _conn_stats["writer_wait_ms_max"] = max(_conn_stats["writer_wait_ms_max"], waited)
+        # A connection leaked without close() keeps the gate; carry on under SQLite's lock alone.
+        _conn_stats["writer_wait_timeouts"] += not acquired
+    return acquired
+
+
 def get_connection() -> sqlite3.Connection:
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(DB_PATH, detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES)
+    """Read-write connection for writes and housekeeping; callers must close() it,
+    in a `finally` or by using it as `with get_connection() as conn:`.
+
+    At most one thread per process holds one at a time (others queue for up to
+    SQLITE_WRITER_WAIT_S). The schema is checked on the first connection to
+    each file, and again if the file was replaced by an unmigrated one.
+    """
+    gated = _acquire_writer()
+    conn = None
+    try:
+        DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(DB_PATH, detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES,
+                               factory=_WriterConnection)
+        conn.holds_gate = gated
+        _bump("writers_opened", 1)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys = ON")
+        if str(DB_PATH) not in _schema_ready or conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            _ensure_schema(conn)
+            _schema_ready.add(str(DB_PATH))
+    except BaseException:
+        if conn is not None:
+            conn.close()
+        elif gated:
+            _writer_gate.release()
+        raise
+    return conn
+
+
+def read_connection() -> sqlite3.Connection:
+    """Read-only connection (`mode=ro` plus `query_only`) for pure lookups; never waits for the writer gate."""
+    if str(DB_PATH) not in _schema_ready:
+        get_connection().close()
+    conn = sqlite3.connect(f"{DB_PATH.resolve().as_uri()}?mode=ro", uri=True,
+                           detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES, factory=_ReaderConnection)
+    conn.counted = True
+    _bump("readers_opened", 1)
+    _bump("readers_active", 1, "readers_peak")
     conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON")
-    _ensure_schema(conn)
+    conn.execute("PRAGMA query_only = ON")
     return conn
 
 
+def connection_stats(reset_peaks: bool = False) -> dict:
+    """This process's reader/writer connection counters.
+
+    `readers_active` / `readers_peak` are concurrent read-only connections,
+    `writer_queue` / `writer_queue_peak` threads waiting for the writer gate.
+    """
+    with _conn_stats_lock:
+        stats = dict(_conn_stats)
+        if reset_peaks:
+            _conn_stats["readers_peak"] = _conn_stats["readers_active"]
+            _conn_stats["writer_queue_peak"] = _conn_stats["writer_queue"]
+            _conn_stats["writer_wait_ms_max"] = 0.0
+    stats["writer_wait_ms_total"] = round(stats["writer_wait_ms_total"], 1)
+    stats["writer_wait_ms_max"] = round(stats["writer_wait_ms_max"], 1)
+    return stats
+
+
 def _row_to_dict(row: sqlite3.Row) -> dict:
     return dict(row) if row else {}
 
 
+def _tuples(conn: sqlite3.Connection, sql: str, params=()) -> List[tuple]:
+    """Fetch plain tuples for the record builders, skipping the per-row `sqlite3.Row`."""
+    cur = conn.cursor()
+    cur.row_factory = None
+    return cur.execute(sql, params).fetchall()
+
+
 def _format_money(val) -> Optional[str]:
     if val is None:
         return None
@@ -125,9 +441,16 @@ def url_for_static_placeholder() -> str:
     return "/static/placeholder.png"
 
 
+def _card_version(*fields) -> str:
+    """Cheap content fingerprint used as the fragment-cache version of an auction card."""
+    return format(zlib.crc32(repr(fields).encode()), "08x")
+
+
 def _compute_duration(start, end) -> Optional[int]:
     if not start or not end:
         return None
+    if isinstance(start, int) and isinstance(end, int):
+        return max(0, (end - start) // 86400)
     try:
         if isinstance(start, str):
             start = datetime.fromisoformat(start)
@@ -139,97 +462,213 @@ def _compute_duration(start, end) -> Optional[int]:
         return None
 
 
-def get_auctions(limit: int = 50) -> List[dict]:
-    conn = get_connection()
-    sql = """
-        SELECT a.a_id,
-               a.a_item_id,
-               a.a_c_price,
-               a.a_s_price,
-               a.a_status,
-               a.a_s_date,
-               a.a_e_date,
-               i.i_title,
-               i.i_desc,
-               i.i_image,
-               i.i_m_id
+_CARD_COLUMNS = """
+    a.a_id, a.a_item_id, a.a_c_price, a.a_s_price, a.a_status, a.a_s_epoch, a.a_e_epoch,
+    a.bid_count, a.high_bidder_id, a.last_bid_epoch, i.i_title, i.i_desc, i.i_image, i.i_m_id
+"""
+
+
+def _auction_card(row: tuple, cls=Auction, **extra) -> Auction:
+    """Listing shape shared by the listing helpers, from a tuple starting with `_CARD_COLUMNS`."""
+    (a_id, item_id, c_price, s_price, status, s_ts, e_ts, bid_count, high_bidder_id, last_bid_ts,
+     title, desc, image, seller_id) = row[:14]
+    price = c_price or s_price
+    return cls(a_id, item_id, title, desc, image or url_for_static_placeholder(), _format_money(price), price,
+               s_price, seller_id, s_ts, e_ts, _compute_duration(s_ts, e_ts), status, bid_count or 0,
+               high_bidder_id, last_bid_ts, _card_version(row), **extra)
+
+
+def get_auctions(limit: int = 50) -> List[Auction]:
+    conn = read_connection()
+    sql = f"""
+        SELECT {_CARD_COLUMNS}
         FROM auction a
         JOIN item i ON i.i_id = a.a_item_id
-        ORDER BY a.a_s_date DESC
+        ORDER BY a.a_s_epoch DESC
         LIMIT ?
     """
-    rows = conn.execute(sql, (limit,)).fetchall()
+    rows = _tuples(conn, sql, (limit,))
     conn.close()
-    results = []
-    for row in rows:
-        data = _row_to_dict(row)
-        price = data.get("a_c_price") or data.get("a_s_price")
-        image = data.get("i_image") or url_for_static_placeholder()
-        results.append({
-            "id": data.get("a_id"),
-            "item_id": data.get("a_item_id"),
-            "title": data.get("i_title"),
-            "description": data.get("i_desc"),
-            "image_url": image,
-            "current_bid": _format_money(price),
-            "seller_id": data.get("i_m_id"),
-            "start_date": data.get("a_s_date"),
-            "end_time": data.get("a_e_date"),
-            "duration": _compute_duration(data.get("a_s_date"), data.get("a_e_date")),
-            "url": f"/auction/{data.get('a_id')}",
-            "status": data.get("a_status", "open"),
-        })
-    return results
+    return [_auction_card(row) for row in rows]
 
 
-def get_auction(auction_id: int) -> Optional[dict]:
-    conn = get_connection()
-    sql = """
-        SELECT a.*, i.i_title, i.i_desc, i.i_image, i.i_m_id
-        FROM auction a
-        JOIN item i ON i.i_id = a.a_item_id
-        WHERE a.a_id = ?
+def get_auctions_page(before_id: Optional[int] = None, limit: int = 50) -> List[Auction]:
+    """Return auctions newest id first, only ids below `before_id` when given.
+
+    Keyset pagination over the auction primary key: every page costs the same
+    however deep a client pages. Rows have the `get_auctions` shape.
     """
-    row = conn.execute(sql, (auction_id,)).fetchone()
-    conn.close()
-    if not row:
+    where = "WHERE a.a_id < ?" if before_id is not None else ""
+    params = ([int(before_id)] if before_id is not None else []) + [int(limit)]
+    conn = read_connection()
+    try:
+        rows = _tuples(conn, f"SELECT {_CARD_COLUMNS} FROM auction a JOIN item i ON i.i_id = a.a_item_id "
+                             f"{where} ORDER BY a.a_id DESC LIMIT ?", params)
+    finally:
+        conn.close()
+    return [_auction_card(row) for row in rows]
+
+
+RANKINGS = {
+    # kind -> (extra WHERE, ORDER BY); all restricted to open, unexpired auctions
+    "popular": ("", "a.bid_count DESC, a.a_id"),
+    "ending": (" AND a.a_e_epoch IS NOT NULL", "a.a_e_epoch, a.a_id"),
+    "new": ("", "a.a_s_epoch DESC, a.a_id DESC"),
+}
+
+
+def get_ranked_auctions(kind: str, limit: int = 20, offset: int = 0) -> List[RankedAuction]:
+    """Return open auctions ranked as `kind` (popular, ending or new).
+
+    Each ranking is read straight off an index on `auction`, so the cost is
+    bounded by `limit + offset` rather than the number of auctions or bids.
+    Rows carry the usual auction keys plus the listing-page aliases
+    `max_price`, `end_date` and `auc_cnt`. The leading bidder is only exposed
+    as `high_bidder_id`; pages render it through the app's anonymous alias.
+    """
+    if kind not in RANKINGS:
+        raise ValueError(f"unknown ranking: {kind!r}")
+    where, order = RANKINGS[kind]
+    conn = read_connection()
+    try:
+        rows = _tuples(
+            conn,
+            f"""
+            SELECT {_CARD_COLUMNS}
+            FROM auction a
+            JOIN item i ON i.i_id = a.a_item_id
+            WHERE a.a_status = 'open' AND (a.a_e_epoch IS NULL OR a.a_e_epoch >= ?){where}
+            ORDER BY {order}
+            LIMIT ? OFFSET ?
+            """,
+            (int(time.time()), limit, offset),
+        )
+    finally:
+        conn.close()
+    return [_auction_card(row, RankedAuction) for row in rows]
+
+
+auction_cache = LRUCache("auction", maxsize=AUCTION_CACHE_SIZE, ttl=AUCTION_CACHE_TTL)
+_change_log_lock = threading.Lock()
+_change_log_state: dict = {}  # DB path -> {"seq": last seq applied, "polled_at": monotonic time}
+
+
+def _auction_key(auction_id: int) -> tuple:
+    # Tools and tests repoint DB_PATH at runtime, so entries are scoped to the file.
+    return str(DB_PATH), int(auction_id)
+
+
+def _log_auction_changes(conn: sqlite3.Connection, auction_ids: Optional[Iterable[int]]) -> None:
+    """Record changed auctions in change_log inside the caller's transaction."""
+    if auction_ids is None:
+        conn.execute("INSERT INTO change_log(entity, entity_id) VALUES ('auction', NULL)")
+    else:
+        conn.executemany("INSERT INTO change_log(entity, entity_id) VALUES ('auction', ?)",
+                         [(int(a),) for a in auction_ids])
+    conn.execute("DELETE FROM change_log WHERE seq <= (SELECT MAX(seq) FROM change_log) - ?", (CHANGE_LOG_KEEP,))
+
+
+def _invalidate_auctions(auction_ids: Optional[Iterable[int]]) -> None:
+    """Drop auctions from this process's cache; call after the write has committed."""
+    if auction_ids is None:
+        auction_cache.clear()
+    else:
+        auction_cache.invalidate_many(_auction_key(a) for a in auction_ids)
+
+
+def reset_after_fork() -> None:
+    """Drop per-process state inherited from a forking parent (gunicorn `post_fork`).
+
+    Connections are opened per call, so nothing is shared on the wire; what
+    must not be inherited is cache content and change-log progress that the
+    new worker can no longer keep in step, locks another thread may have
+    held at fork time (including the writer gate), and the parent's
+    connection counters.
+    """
+    global _change_log_lock, _writer_gate, _conn_stats_lock
+    _change_log_lock = threading.Lock()
+    _writer_gate = threading.RLock()
+    _conn_stats_lock = threading.Lock()
+    _conn_stats.update(dict.fromkeys(_conn_stats, 0))
+    _change_log_state.clear()
+    auction_cache.clear()
+    _member_counts.clear()
+
+
+def poll_change_log(force: bool = False) -> int:
+    """Apply invalidations written by other workers; returns the number of entries read.
+
+    Runs at most once per CHANGE_LOG_POLL_S seconds unless `force` is set. The
+    query is a primary-key range scan past the last sequence number seen. If
+    the feed was pruned past that point the whole cache is dropped.
+    """
+    state = _change_log_state.setdefault(str(DB_PATH), {"seq": None, "polled_at": 0.0})
+    if not force and time.monotonic() - state["polled_at"] < CHANGE_LOG_POLL_S:
+        return 0
+    with _change_log_lock:
+        state["polled_at"] = time.monotonic()
+        conn = read_connection()
+        try:
+            if state["seq"] is None:
+                state["seq"] = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM change_log").fetchone()[0]
+                return 0
+            rows = conn.execute("SELECT seq, entity, entity_id FROM change_log WHERE seq > ? ORDER BY seq",
+                                (state["seq"],)).fetchall()
+        finally:
+            conn.close()
+        if not rows:
+            return 0
+        if rows[0]["seq"] != state["seq"] + 1 or any(r["entity_id"] is None for r in rows):
+            auction_cache.clear()
+        else:
+            auction_cache.invalidate_many(_auction_key(r["entity_id"]) for r in rows if r["entity"] == "auction")
+        state["seq"] = rows[-1]["seq"]
+        return len(rows)
+
+
+def get_auction(auction_id: int) -> Optional[Auction]:
+    """Read-through cached auction lookup; returns a copy safe for callers to modify."""
+    poll_change_log()
+    key = _auction_key(auction_id)
+    cached = auction_cache.get(key)
+    if cached is not None:
+        return cached.copy()
+    version = auction_cache.version
+    item = _load_auction(auction_id)
+    if item is None:
         return None
-    data = _row_to_dict(row)
-    price = data.get("a_c_price") or data.get("a_s_price")
-    image = data.get("i_image") or url_for_static_placeholder()
-    return {
-        "id": data.get("a_id"),
-        "item_id": data.get("a_item_id"),
-        "title": data.get("i_title"),
-        "description": data.get("i_desc"),
-        "image_url": image,
-        "current_bid": _format_money(price),
-        "seller_id": data.get("i_m_id"),
-        "start_date": data.get("a_s_date"),
-        "end_time": data.get("a_e_date"),
-        "duration": _compute_duration(data.get("a_s_date"), data.get("a_e_date")),
-        "url": f"/auction/{data.get('a_id')}",
-        "status": data.get("a_status", "open"),
-    }
+    auction_cache.set(key, item, if_version=version)
+    return item.copy()
 
 
-def get_user_by_username(username: str) -> Optional[dict]:
-    conn = get_connection()
-    row = conn.execute("SELECT * FROM member WHERE m_login_id = ?", (username,)).fetchone()
+def _load_auction(auction_id: int) -> Optional[Auction]:
+    conn = read_connection()
+    sql = f"SELECT {_CARD_COLUMNS} FROM {{table}} a JOIN item i ON i.i_id = a.a_item_id WHERE a.a_id = ?"
+    try:
+        rows = _tuples(conn, sql.format(table="auction"), (auction_id,))
+        archived = not rows
+        if archived:
+            rows = _tuples(conn, sql.format(table="auction_archive"), (auction_id,))
+    finally:
+        conn.close()
+    return _auction_card(rows[0], archived=archived) if rows else None
+
+
+_MEMBER_COLUMNS = "m_id, m_login_id, m_email, m_status, m_is_admin, m_role"
+_MEMBER_DETAIL_COLUMNS = _MEMBER_COLUMNS + ", m_pass, created_at"
+
+
+def _member(row: tuple) -> Member:
+    """Member from a `_MEMBER_COLUMNS` (or `_MEMBER_DETAIL_COLUMNS`) tuple."""
+    m_id, login, email, status, is_admin, role = row[:6]
+    return Member(m_id, login, email, status, bool(is_admin), role or ("admin" if is_admin else "user"), *row[6:])
+
+
+def get_user_by_username(username: str) -> Optional[Member]:
+    conn = read_connection()
+    rows = _tuples(conn, f"SELECT {_MEMBER_DETAIL_COLUMNS} FROM member WHERE m_login_id = ?", (username,))
     conn.close()
-    if not row:
-        return None
-    data = _row_to_dict(row)
-    return {
-        "id": data.get("m_id"),
-        "username": data.get("m_login_id"),
-        "m_login_id": data.get("m_login_id"),
-        "password": data.get("m_pass"),
-        "email": data.get("m_email"),
-        "is_admin": bool(data.get("m_is_admin")),
-        "m_is_admin": bool(data.get("m_is_admin")),
-        "m_role": data.get("m_role") or ("admin" if data.get("m_is_admin") else "user"),
-    }
+    return _member(rows[0]) if rows else None
 
 
 def verify_password(stored_password, provided_password) -> bool:
@@ -246,63 +685,155 @@ def verify_password(stored_password, provided_password) -> bool:
 def create_member(login_id: str, plain_password: str,
                   email: Optional[str] = None,
                   role: Optional[str] = None) -> int:
-    conn = get_connection()
-    exists = conn.execute("SELECT 1 FROM member WHERE m_login_id = ?", (login_id,)).fetchone()
-    if exists:
-        conn.close()
-        raise ValueError("login_id already exists")
     hashed = generate_password_hash(plain_password, method='pbkdf2:sha256', salt_length=16)
-    cur = conn.execute(
-        "INSERT INTO member(m_login_id, m_pass, m_email, m_role) VALUES (?, ?, ?, ?)",
-        (login_id, hashed, email, role)
-    )
-    conn.commit()
-    member_id = cur.lastrowid
-    conn.close()
-    return member_id
+    with get_connection() as conn:
+        exists = conn.execute("SELECT 1 FROM member WHERE m_login_id = ? COLLATE NOCASE", (login_id,)).fetchone()
+        if exists:
+            raise ValueError("login_id already exists")
+        cur = conn.execute(
+            "INSERT INTO member(m_login_id, m_pass, m_email, m_role) VALUES (?, ?, ?, ?)",
+            (login_id, hashed, email, role)
+        )
+    return cur.lastrowid
 
 
 def confirm_member(m_id: int) -> bool:
-    conn = get_connection()
-    cur = conn.execute("UPDATE member SET m_status = 'A' WHERE m_id = ?", (m_id,))
-    conn.commit()
-    conn.close()
+    with get_connection() as conn:
+        cur = conn.execute("UPDATE member SET m_status = 'A' WHERE m_id = ?", (m_id,))
     return cur.rowcount > 0
 
 
-def get_member_by_id(m_id: int) -> Optional[dict]:
-    conn = get_connection()
-    row = conn.execute("SELECT * FROM member WHERE m_id = ?", (m_id,)).fetchone()
+def get_member_by_id(m_id: int) -> Optional[Member]:
+    conn = read_connection()
+    rows = _tuples(conn, f"SELECT {_MEMBER_DETAIL_COLUMNS} FROM member WHERE m_id = ?", (m_id,))
     conn.close()
-    return _row_to_dict(row) if row else None
+    return _member(rows[0]) if rows else None
 
 
-def get_all_members() -> List[dict]:
-    conn = get_connection()
-    rows = conn.execute("SELECT m_id, m_login_id, m_email, m_status, m_is_admin, m_role FROM member ORDER BY m_id").fetchall()
+def resolve_member(identifier) -> Optional[Member]:
+    """Find a member by id, login or email (case-insensitive) in one indexed query.
+
+    An exact id match wins over a login match, which wins over an email match.
+    """
+    text = str(identifier or "").strip()
+    if not text:
+        return None
+    m_id = int(text) if text.isdigit() else None
+    conn = read_connection()
+    try:
+        rows = _tuples(
+            conn,
+            f"SELECT {_MEMBER_DETAIL_COLUMNS} FROM member "
+            "WHERE m_id = :id OR m_login_id = :s COLLATE NOCASE OR m_email = :s COLLATE NOCASE "
+            "ORDER BY CASE WHEN m_id = :id THEN 0 WHEN m_login_id = :s COLLATE NOCASE THEN 1 ELSE 2 END, m_id "
+            "LIMIT 1",
+            {"id": m_id, "s": text},
+        )
+    finally:
+        conn.close()
+    return _member(rows[0]) if rows else None
+
+
+def get_all_members() -> List[Member]:
+    conn = read_connection()
+    rows = _tuples(conn, f"SELECT {_MEMBER_COLUMNS} FROM member ORDER BY m_id")
     conn.close()
-    return [
-        {
-            "id": row["m_id"],
-            "username": row["m_login_id"],
-            "email": row["m_email"],
-            "status": row["m_status"],
-            "m_is_admin": bool(row["m_is_admin"]),
-            "is_admin": bool(row["m_is_admin"]),
-            "m_role": row["m_role"] or ("admin" if row["m_is_admin"] else "user"),
-        }
-        for row in rows
-    ]
+    return [_member(row) for row in rows]
+
+
+MEMBER_SORTS = {"id": "m_id", "username": "m_login_id", "status": "m_status", "created": "created_at"}
+_member_counts: dict = {}  # (status, role, prefix) -> (expires_at, count, is_estimate)
+
+
+def _member_filters(status: Optional[str], role: Optional[str], login_prefix: Optional[str]) -> Tuple[str, list]:
+    clauses, params = [], []
+    if status:
+        clauses.append("m_status = ?")
+        params.append(status)
+    if role in ("admin", "user"):
+        clauses.append("m_is_admin = ?")
+        params.append(1 if role == "admin" else 0)
+    if login_prefix:
+        # A range instead of LIKE so the UNIQUE index on m_login_id is used.
+        clauses.append("m_login_id >= ? AND m_login_id < ?")
+        params += [login_prefix, login_prefix + "\uffff"]
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+def _count_members(conn, where: str, params: list) -> Tuple[int, bool]:
+    if not where:
+        # After ANALYZE the first sqlite_stat1 figure is the table row count.
+        try:
+            row = conn.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = 'member' LIMIT 1").fetchone()
+            if row:
+                return int(str(row[0]).split()[0]), True
+        except sqlite3.OperationalError:
+            pass
+    return conn.execute("SELECT COUNT(*) FROM member" + where, params).fetchone()[0], False
+
+
+def count_members(status: Optional[str] = None, role: Optional[str] = None,
+                  login_prefix: Optional[str] = None, conn=None) -> Tuple[int, bool]:
+    """Return (total, is_estimate) for a member filter, cached for MEMBER_COUNT_TTL seconds."""
+    key = (status or None, role or None, login_prefix or None)
+    cached = _member_counts.get(key)
+    if cached and cached[0] > time.monotonic():
+        return cached[1], cached[2]
+    where, params = _member_filters(status, role, login_prefix)
+    own = conn is None
+    conn = conn or read_connection()
+    try:
+        total, estimate = _count_members(conn, where, params)
+    finally:
+        if own:
+            conn.close()
+    _member_counts[key] = (time.monotonic() + MEMBER_COUNT_TTL, total, estimate)
+    return total, estimate
+
+
+def get_members_page(page: int = 1, per_page: int = 50, status: Optional[str] = None, role: Optional[str] = None,
+                     login_prefix: Optional[str] = None, sort: str = "id", descending: bool = False) -> dict:
+    """Return one page of members plus paging info for the admin list.
+
+    `role` is "admin" or "user"; `login_prefix` matches the start of the login
+    (case-sensitive); `sort` is a key of MEMBER_SORTS. `total` may be a cached
+    estimate, so `has_next` is derived from the page itself.
+    """
+    page = max(1, int(page or 1))
+    per_page = max(1, min(int(per_page or 50), 500))
+    order = MEMBER_SORTS.get(sort, "m_id")
+    direction = "DESC" if descending else "ASC"
+    where, params = _member_filters(status, role, login_prefix)
+    conn = read_connection()
+    try:
+        rows = _tuples(
+            conn,
+            f"SELECT {_MEMBER_COLUMNS} FROM member" + where +
+            f" ORDER BY {order} {direction}, m_id {direction} LIMIT ? OFFSET ?",
+            params + [per_page + 1, (page - 1) * per_page],
+        )
+        total, estimate = count_members(status, role, login_prefix, conn=conn)
+    finally:
+        conn.close()
+    has_next = len(rows) > per_page
+    return {
+        "members": [_member(row) for row in rows[:per_page]],
+        "page": page,
+        "per_page": per_page,
+        "total": total,
+        "total_is_estimate": estimate,
+        "pages": max(page + (1 if has_next else 0), -(-total // per_page)),
+        "has_prev": page > 1,
+        "has_next": has_next,
+    }
 
 
 def set_member_admin(m_id: int, is_admin: bool = True) -> bool:
-    conn = get_connection()
-    cur = conn.execute(
-        "UPDATE member SET m_is_admin = ?, m_role = COALESCE(m_role, ?) WHERE m_id = ?",
-        (1 if is_admin else 0, 'admin' if is_admin else 'user', m_id)
-    )
-    conn.commit()
-    conn.close()
+    with get_connection() as conn:
+        cur = conn.execute(
+            "UPDATE member SET m_is_admin = ?, m_role = COALESCE(m_role, ?) WHERE m_id = ?",
+            (1 if is_admin else 0, 'admin' if is_admin else 'user', m_id)
+        )
     return cur.rowcount > 0
 
 
@@ -314,85 +845,278 @@ def delete_auction_and_bids(auction_id: int) -> tuple[int, int]:
         deleted_bids = cur.rowcount or 0
         cur.execute("DELETE FROM auction WHERE a_id = ?", (auction_id,))
         deleted_auctions = cur.rowcount or 0
+        if not deleted_auctions:
+            cur.execute("DELETE FROM bid_archive WHERE b_a_id = ?", (auction_id,))
+            deleted_bids += cur.rowcount or 0
+            cur.execute("DELETE FROM auction_archive WHERE a_id = ?", (auction_id,))
+            deleted_auctions = cur.rowcount or 0
+        _log_auction_changes(conn, [auction_id])
         conn.commit()
+        _invalidate_auctions([auction_id])
         return deleted_auctions, deleted_bids
     finally:
         conn.close()
 
 
+def _bid(row: tuple) -> Bid:
+    b_id, bidder_id, amount, bid_ts = row
+    return Bid(b_id, bidder_id, float(amount), bid_ts)
+
+
+def get_highest_bid(auction_id: int, archived: bool = False) -> Optional[Bid]:
+    """Return the top bid on an auction (id, bidder_id, amount, bid_time), or None.
+
+    Reads a single entry off `idx_bid_auction_amount`, or its archive twin when
+    `archived` (the flag `get_auction` sets on auctions read from the archive).
+    """
+    table = "bid_archive" if archived else "bid"
+    conn = read_connection()
+    try:
+        rows = _tuples(conn, f"SELECT b_id, b_m_id, b_amount, b_epoch FROM {table} "
+                             "WHERE b_a_id = ? ORDER BY b_amount DESC LIMIT 1", (auction_id,))
+    finally:
+        conn.close()
+    return _bid(rows[0]) if rows else None
+
+
+def get_bid_history(auction_id: int, before_id: Optional[int] = None, limit: int = 50,
+                    archived: bool = False) -> List[Bid]:
+    """Bids on an auction newest first, as {id, bidder_id, amount, bid_time}.
+
+    Keyset pagination on `idx_bid_auction_time`: pass the last `id` of a page
+    as `before_id` for the next one. Each page is a bounded index range
+    however many bids the auction has. An auction's bids are archived
+    together, so one table is read: `bid_archive` when `archived`, else `bid`.
+    """
+    sql = "SELECT b_id, b_m_id, b_amount, b_epoch FROM {table} WHERE b_a_id = ?"
+    params: list = [auction_id]
+    if before_id is not None:
+        sql += " AND (b_epoch, b_id) < (SELECT b_epoch, b_id FROM {table} WHERE b_id = ?)"
+        params.append(int(before_id))
+    sql += " ORDER BY b_epoch DESC, b_id DESC LIMIT ?"
+    params.append(int(limit))
+    conn = read_connection()
+    try:
+        rows = _tuples(conn, sql.format(table="bid_archive" if archived else "bid"), params)
+    finally:
+        conn.close()
+    return [_bid(r) for r in rows]
+
+
+def _lock_biddable_auction(conn: sqlite3.Connection, auction_id: int) -> Optional[sqlite3.Row]:
+    """Take the write lock and return the auction if it still accepts bids, else roll back and return None.
+
+    The lock is taken before the price is read so concurrent bids are checked
+    and applied one at a time.
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    row = conn.execute(
+        "SELECT a_status, a_e_epoch, high_bidder_id, COALESCE(a_c_price, a_s_price) AS current_price "
+        "FROM auction WHERE a_id = ?",
+        (auction_id,)
+    ).fetchone()
+    if not row or (row["a_status"] and row["a_status"].lower() in ("closed", "cancelled")):
+        conn.rollback()
+        return None
+    # a_e_epoch is the end time truncated to the second; bids are taken until that second has passed.
+    if row["a_e_epoch"] is not None and row["a_e_epoch"] < int(time.time()):
+        conn.rollback()
+        return None
+    return row
+
+
+def _proxy_bids(conn: sqlite3.Connection, auction_id: int) -> List[Tuple[int, float]]:
+    """The two strongest maximums on an auction, as `bidding.resolve` expects them."""
+    rows = conn.execute(
+        "SELECT pb_m_id, pb_max FROM proxy_bid WHERE pb_a_id = ? ORDER BY pb_max DESC, pb_id LIMIT 2",
+        (auction_id,)
+    ).fetchall()
+    return [(r["pb_m_id"], float(r["pb_max"])) for r in rows]
+
+
+def _apply_bids(conn: sqlite3.Connection, auction_id: int, bids: Sequence[Tuple[int, float]]) -> None:
+    """Insert `bids` in order and move the auction's price and bid statistics to the last one."""
+    last_id = None
+    for m_id, amount in bids:
+        last_id = conn.execute("INSERT INTO bid(b_a_id, b_m_id, b_amount) VALUES (?, ?, ?)",
+                               (auction_id, m_id, amount)).lastrowid
+    m_id, amount = bids[-1]
+    conn.execute(
+        "UPDATE auction SET a_c_price = ?, bid_count = bid_count + ?, high_bidder_id = ?, "
+        "last_bid_at = (SELECT b_time FROM bid WHERE b_id = ?), updated_at = CURRENT_TIMESTAMP WHERE a_id = ?",
+        (amount, len(bids), m_id, last_id, auction_id)
+    )
+    _log_auction_changes(conn, [auction_id])
+
+
 def place_bid(auction_id: int, bidder_m_id: int, amount) -> bool:
+    """Place a manual bid; proxy maximums above it answer in the same transaction.
+
+    Returns True when the bid was accepted, even if a proxy outbid it at once.
+    """
     try:
         bid_amount = float(amount)
     except Exception:
         return False
     conn = get_connection()
     try:
-        row = conn.execute(
-            "SELECT a_status, a_e_date, COALESCE(a_c_price, a_s_price) AS current_price FROM auction WHERE a_id = ?",
-            (auction_id,)
-        ).fetchone()
-        if not row:
-            return False
-        if row["a_status"] and row["a_status"].lower() in ("closed", "cancelled"):
+        row = _lock_biddable_auction(conn, auction_id)
+        if row is None:
             return False
-        end_date = row["a_e_date"]
-        if end_date:
-            try:
-                end_dt = datetime.fromisoformat(end_date) if isinstance(end_date, str) else end_date
-                if end_dt <= datetime.utcnow():
-                    return False
-            except Exception:
-                pass
         current_price = float(row["current_price"] or 0)
         if bid_amount <= current_price:
+            conn.rollback()
             return False
-        conn.execute("INSERT INTO bid(b_a_id, b_m_id, b_amount) VALUES (?, ?, ?)", (auction_id, bidder_m_id, bid_amount))
-        conn.execute(
-            "UPDATE auction SET a_c_price = ?, updated_at = CURRENT_TIMESTAMP WHERE a_id = ?",
-            (bid_amount, auction_id)
-        )
+        bids = [(bidder_m_id, bid_amount)]
+        bids += bidding.resolve(bid_amount, bidder_m_id, _proxy_bids(conn, auction_id))
+        _apply_bids(conn, auction_id, bids)
         conn.commit()
+        _invalidate_auctions([auction_id])
         return True
     finally:
         conn.close()
 
 
+def place_max_bid(auction_id: int, bidder_m_id: int, max_amount) -> Optional[dict]:
+    """Set (or raise) a bidder's hidden maximum and resolve competing proxies.
+
+    Returns {max_amount, current_price, high_bidder_id, leading, bids_placed},
+    or None when the auction no longer accepts bids, the maximum does not beat
+    the current price, or it does not raise the bidder's existing maximum.
+    """
+    try:
+        max_bid = round(float(max_amount), 2)
+    except Exception:
+        return None
+    conn = get_connection()
+    try:
+        row = _lock_biddable_auction(conn, auction_id)
+        if row is None:
+            return None
+        price, leader = float(row["current_price"] or 0), row["high_bidder_id"]
+        own = conn.execute("SELECT pb_max FROM proxy_bid WHERE pb_a_id = ? AND pb_m_id = ?",
+                           (auction_id, bidder_m_id)).fetchone()
+        if max_bid <= price or (own and max_bid <= own["pb_max"]):
+            conn.rollback()
+            return None
+        conn.execute("INSERT OR REPLACE INTO proxy_bid(pb_a_id, pb_m_id, pb_max) VALUES (?, ?, ?)",
+                     (auction_id, bidder_m_id, max_bid))
+        bids = bidding.resolve(price, leader, _proxy_bids(conn, auction_id))
+        if bids:
+            _apply_bids(conn, auction_id, bids)
+            price, leader = bids[-1][1], bids[-1][0]
+        conn.commit()
+        if bids:
+            _invalidate_auctions([auction_id])
+        return {"max_amount": max_bid, "current_price": price, "high_bidder_id": leader,
+                "leading": leader == bidder_m_id, "bids_placed": len(bids)}
+    finally:
+        conn.close()
+
+
+def get_proxy_bid(auction_id: int, bidder_m_id: int) -> Optional[dict]:
+    """A bidder's own maximum on an auction as {max_amount, set_at}, or None."""
+    conn = read_connection()
+    try:
+        row = conn.execute("SELECT pb_max, pb_time FROM proxy_bid WHERE pb_a_id = ? AND pb_m_id = ?",
+                           (auction_id, bidder_m_id)).fetchone()
+    finally:
+        conn.close()
+    if not row:
+        return None
+    return {"max_amount": float(row["pb_max"]), "set_at": row["pb_time"]}
+
+
+_BID_STATS_SQL = """
+    UPDATE auction SET
+        bid_count = (SELECT COUNT(*) FROM bid WHERE b_a_id = auction.a_id),
+        high_bidder_id = (SELECT b_m_id FROM bid WHERE b_a_id = auction.a_id ORDER BY b_amount DESC, b_id LIMIT 1),
+        last_bid_at = (SELECT MAX(b_time) FROM bid WHERE b_a_id = auction.a_id)
+"""
+
+_BID_STATS_MISMATCH_SQL = """
+    SELECT * FROM (
+        SELECT a.a_id, a.bid_count, a.high_bidder_id, a.last_bid_at,
+               (SELECT COUNT(*) FROM bid WHERE b_a_id = a.a_id) AS expected_bid_count,
+               (SELECT b_m_id FROM bid WHERE b_a_id = a.a_id ORDER BY b_amount DESC, b_id LIMIT 1)
+                   AS expected_high_bidder_id,
+               (SELECT MAX(b_time) FROM bid WHERE b_a_id = a.a_id) AS expected_last_bid_at
+        FROM auction a
+    )
+    WHERE bid_count <> expected_bid_count
+       OR high_bidder_id IS NOT expected_high_bidder_id
+       OR last_bid_at IS NOT expected_last_bid_at
+    ORDER BY a_id
+"""
+
+
+def refresh_bid_stats(auction_ids: Optional[Iterable[int]] = None, conn=None) -> int:
+    """Recompute bid_count / high_bidder_id / last_bid_at from `bid`; returns rows updated.
+
+    With `auction_ids` only those auctions are refreshed, otherwise every auction.
+    """
+    own = conn is None
+    conn = conn or get_connection()
+    try:
+        if auction_ids is not None:
+            auction_ids = [int(a) for a in auction_ids]
+            cur = conn.execute(_BID_STATS_SQL + " WHERE a_id IN (SELECT value FROM json_each(?))",
+                               (json.dumps(auction_ids),))
+        else:
+            cur = conn.execute(_BID_STATS_SQL)
+        _log_auction_changes(conn, auction_ids)
+        if own:
+            conn.commit()
+        _invalidate_auctions(auction_ids)
+        return max(cur.rowcount, 0)
+    finally:
+        if own:
+            conn.close()
+
+
+def check_bid_stats(limit: Optional[int] = None) -> List[dict]:
+    """Return auctions whose stored bid statistics disagree with the `bid` table."""
+    conn = read_connection()
+    try:
+        sql = _BID_STATS_MISMATCH_SQL + (" LIMIT ?" if limit else "")
+        rows = conn.execute(sql, (limit,) if limit else ()).fetchall()
+    finally:
+        conn.close()
+    return [_row_to_dict(r) for r in rows]
+
+
 def create_item(title: str, description: Optional[str] = None, owner_id: Optional[int] = None,
                 starting_price: float = 0.0, duration: int = 7, status: str = 'A',
                 image_path: Optional[str] = None) -> int:
-    conn = get_connection()
-    cur = conn.execute(
-        "INSERT INTO item(i_m_id, i_title, i_desc, i_b_price, i_duration, i_status, i_image) VALUES (?, ?, ?, ?, ?, ?, ?)",
-        (owner_id, title, description, starting_price, duration, status, image_path)
-    )
-    conn.commit()
-    item_id = cur.lastrowid
-    conn.close()
-    return item_id
+    with get_connection() as conn:
+        cur = conn.execute(
+            "INSERT INTO item(i_m_id, i_title, i_desc, i_b_price, i_duration, i_status, i_image) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (owner_id, title, description, starting_price, duration, status, image_path)
+        )
+    return cur.lastrowid
 
 
 def create_auction(item_id: int, seller_id: Optional[int] = None, starting_price: float = 0.0,
                    start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> int:
-    conn = get_connection()
-    cur = conn.execute(
-        "INSERT INTO auction(a_item_id, a_m_id, a_s_price, a_c_price, a_s_date, a_e_date) VALUES (?, ?, ?, ?, ?, ?)",
-        (item_id, seller_id, starting_price, starting_price, start_date or datetime.utcnow(), end_date)
-    )
-    conn.commit()
-    auction_id = cur.lastrowid
-    conn.close()
-    return auction_id
+    with get_connection() as conn:
+        cur = conn.execute(
+            "INSERT INTO auction(a_item_id, a_m_id, a_s_price, a_c_price, a_s_date, a_e_date) VALUES (?, ?, ?, ?, ?, ?)",
+            (item_id, seller_id, starting_price, starting_price, start_date or datetime.utcnow(), end_date)
+        )
+    return cur.lastrowid
 
 
 def create_item_and_auction(title: str, description: Optional[str], seller_id: Optional[int] = None,
                              starting_price: float = 0.0, end_date: Optional[datetime] = None,
-                             duration: int = 7, status: str = 'P') -> Tuple[int, int]:
+                             duration: int = 7, status: str = 'P', *,
+                             category: Optional[int] = None, sub_category: Optional[int] = None) -> Tuple[int, int]:
     conn = get_connection()
     try:
         cur = conn.cursor()
         cur.execute(
-            "INSERT INTO item(i_m_id, i_title, i_desc, i_b_price, i_duration, i_status) VALUES (?, ?, ?, ?, ?, ?)",
-            (seller_id, title, description, starting_price, duration, status)
+            "INSERT INTO item(i_m_id, i_title, i_desc, i_b_price, i_duration, i_status, i_cat, i_s_cat) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (seller_id, title, description, starting_price, duration, status, category, sub_category)
         )
         item_id = cur.lastrowid
         cur.execute(
@@ -407,7 +1131,7 @@ def create_item_and_auction(title: str, description: Optional[str], seller_id: O
 
 
 def get_categories() -> List[tuple]:
-    conn = get_connection()
+    conn = read_connection()
     rows = conn.execute("SELECT cat_id, name FROM category ORDER BY name").fetchall()
     conn.close()
     return [(str(row["cat_id"]), row["name"]) for row in rows]
@@ -415,37 +1139,35 @@ def get_categories() -> List[tuple]:
 
 def set_item_image(item_id: int, image_path: str) -> bool:
     conn = get_connection()
-    cur = conn.execute("UPDATE item SET i_image = ? WHERE i_id = ?", (image_path, item_id))
-    conn.commit()
-    conn.close()
+    try:
+        cur = conn.execute("UPDATE item SET i_image = ? WHERE i_id = ?", (image_path, item_id))
+        auction_ids = [r[0] for r in conn.execute("SELECT a_id FROM auction WHERE a_item_id = ?", (item_id,))]
+        _log_auction_changes(conn, auction_ids)
+        conn.commit()
+    finally:
+        conn.close()
+    _invalidate_auctions(auction_ids)
     return cur.rowcount > 0
 
 
 def add_item_image(item_id: int, image_url: str, thumb_url: Optional[str] = None, sort_order: int = 0) -> Optional[int]:
-    conn = get_connection()
-    cur = conn.execute(
-        "INSERT INTO item_image(item_id, image_url, thumb_url, sort_order) VALUES (?, ?, ?, ?)",
-        (item_id, image_url, thumb_url, sort_order)
-    )
-    conn.commit()
-    img_id = cur.lastrowid
-    conn.close()
-    return img_id
+    with get_connection() as conn:
+        cur = conn.execute(
+            "INSERT INTO item_image(item_id, image_url, thumb_url, sort_order) VALUES (?, ?, ?, ?)",
+            (item_id, image_url, thumb_url, sort_order)
+        )
+    return cur.lastrowid
 
 
-def get_item_images(item_id: int) -> List[dict]:
-    conn = get_connection()
-    rows = conn.execute(
-        "SELECT img_id, image_url, thumb_url, sort_order FROM item_image WHERE item_id = ? ORDER BY sort_order, img_id",
-        (item_id,)
-    ).fetchall()
+def get_item_images(item_id: int) -> List[ItemImage]:
+    conn = read_connection()
+    rows = _tuples(conn, "SELECT img_id, image_url, thumb_url, sort_order FROM item_image "
+                         "WHERE item_id = ? ORDER BY sort_order, img_id", (item_id,))
     conn.close()
     uploads_dir = BASE_DIR / "static" / "uploads"
     results = []
-    for row in rows:
+    for img_id, image_url, thumb_url, sort_order in rows:
         variants = {}
-        image_url = row["image_url"]
-        thumb_url = row["thumb_url"]
         try:
             if image_url and image_url.startswith("/static/uploads/"):
                 fname = os.path.basename(image_url)
@@ -459,26 +1181,17 @@ def get_item_images(item_id: int) -> List[dict]:
                         variants[f"thumb_{size}"] = f"/static/uploads/{stem}_thumb_{size}{ext}"
         except Exception:
             variants = {}
-        results.append({
-            "img_id": row["img_id"],
-            "image_url": image_url,
-            "thumb_url": thumb_url,
-            "sort_order": row["sort_order"],
-            "variants": variants,
-        })
+        results.append(ItemImage(img_id, image_url, thumb_url, sort_order, variants))
     return results
 
 
 def delete_item_image(img_id: int) -> bool:
-    conn = get_connection()
-    row = conn.execute("SELECT image_url, thumb_url FROM item_image WHERE img_id = ?", (img_id,)).fetchone()
-    if not row:
-        conn.close()
-        return False
-    _delete_image_files([row["image_url"], row["thumb_url"]])
-    cur = conn.execute("DELETE FROM item_image WHERE img_id = ?", (img_id,))
-    conn.commit()
-    conn.close()
+    with get_connection() as conn:
+        row = conn.execute("SELECT image_url, thumb_url FROM item_image WHERE img_id = ?", (img_id,)).fetchone()
+        if not row:
+            return False
+        _delete_image_files([row["image_url"], row["thumb_url"]])
+        cur = conn.execute("DELETE FROM item_image WHERE img_id = ?", (img_id,))
     return cur.rowcount > 0
 
 
@@ -529,6 +1242,7 @@ def update_auction_housekeeping(a_id: int, action: str, params: Optional[dict] =
                         (end_date, a_id))
         elif action == "extend_days":
             days = int(params.get("days", 0))
+            # The stored TIMESTAMP, not a_e_epoch: the new end keeps its fractional seconds.
             row = cur.execute("SELECT a_e_date FROM auction WHERE a_id = ?", (a_id,)).fetchone()
             if not row:
                 return False
@@ -546,8 +1260,291 @@ def update_auction_housekeeping(a_id: int, action: str, params: Optional[dict] =
             status = params.get("status") or "open"
             cur.execute("UPDATE auction SET a_status = ?, updated_at = CURRENT_TIMESTAMP WHERE a_id = ?",
                         (status, a_id))
+        changed = cur.rowcount and cur.rowcount > 0
+        if changed:
+            _log_auction_changes(conn, [a_id])
+        conn.commit()
+        if changed:
+            _invalidate_auctions([a_id])
+        return changed
+    finally:
+        conn.close()
+
+
+HOUSEKEEPING_ACTIONS = ("close", "reopen", "set_end_date", "extend_days", "cancel", "set_status")
+
+
+def _parse_when(value) -> Optional[datetime]:
+    if value in (None, ""):
+        return None
+    return value if isinstance(value, datetime) else datetime.fromisoformat(str(value))
+
+
+def _housekeeping_selector(op: dict) -> Tuple[str, list]:
+    """Build the WHERE clause for one bulk operation from `ids`, `status` and `ending_before`."""
+    clauses, params = [], []
+    ids = op.get("ids")
+    if ids is not None:
+        # One JSON parameter instead of N placeholders keeps large id lists under SQLite's variable limit.
+        clauses.append("a_id IN (SELECT value FROM json_each(?))")
+        params.append(json.dumps([int(i) for i in ids]))
+    if op.get("status"):
+        clauses.append("a_status = ?")
+        params.append(op["status"])
+    ending_before = _parse_when(op.get("ending_before"))
+    if ending_before is not None:
+        clauses.append("a_e_epoch < ?")
+        params.append(to_epoch(ending_before))
+    if not clauses:
+        raise ValueError("bulk housekeeping needs ids or a filter (status, ending_before)")
+    return " AND ".join(clauses), params
+
+
+def bulk_auction_housekeeping(operations: Sequence[dict]) -> dict:
+    """Apply housekeeping actions to many auctions in one transaction.
+
+    Each operation is a dict with `action` (see HOUSEKEEPING_ACTIONS), a
+    selector (`ids` and/or `status` / `ending_before`) and the action's own
+    parameter (`end_date`, `days` or `new_status`). Every operation is a single
+    set-based UPDATE. Returns the number of rows updated per action; nothing is
+    applied if any operation fails.
+    """
+    now = datetime.utcnow()
+    counts: dict = {}
+    touched: set = set()
+    conn = get_connection()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        for op in operations:
+            action = op.get("action")
+            where, params = _housekeeping_selector(op)
+            touched.update(r[0] for r in conn.execute(f"SELECT a_id FROM auction WHERE {where}", params))
+            if action == "close":
+                sql, values = "a_status = 'closed', a_e_date = COALESCE(a_e_date, ?)", [now]
+            elif action == "reopen":
+                sql, values = "a_status = 'open', a_e_date = NULL", []
+            elif action == "set_end_date":
+                end_date = _parse_when(op.get("end_date"))
+                if end_date is None:
+                    raise ValueError("set_end_date needs end_date")
+                sql, values = "a_e_date = ?", [end_date]
+            elif action == "extend_days":
+                days = int(op.get("days") or 0)
+                if days <= 0:
+                    raise ValueError("extend_days needs a positive number of days")
+                sql, values = "a_e_date = datetime(COALESCE(a_e_date, ?), ?)", [now, f"+{days} days"]
+            elif action == "cancel":
+                sql, values = "a_status = 'cancelled', a_e_date = COALESCE(a_e_date, ?)", [now]
+            elif action == "set_status":
+                sql, values = "a_status = ?", [op.get("new_status") or "open"]
+            else:
+                raise ValueError(f"unknown housekeeping action: {action!r}")
+            cur = conn.execute(f"UPDATE auction SET {sql}, updated_at = CURRENT_TIMESTAMP WHERE {where}",
+                               values + params)
+            counts[action] = counts.get(action, 0) + max(cur.rowcount, 0)
+        if touched:
+            _log_auction_changes(conn, sorted(touched))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    _invalidate_auctions(touched)
+    return counts
+
+
+def close_expired_auctions(batch_size: Optional[int] = None) -> int:
+    """Mark open auctions whose end time has passed as 'closed'; returns the number closed.
+
+    The rankings filter expired rows at query time, but they still sit in the
+    `a_status = 'open'` range of the ranking indexes until something closes
+    them; run periodically (see maintenance.py) this keeps those scans bounded
+    by the live auctions. Each batch of `batch_size` is found on
+    `idx_auction_ending` and closed in its own transaction.
+    """
+    batch_size = max(1, batch_size or CLOSE_EXPIRED_BATCH_SIZE)
+    closed = 0
+    conn = get_connection()
+    try:
+        while True:
+            conn.execute("BEGIN IMMEDIATE")
+            # Same cut as _lock_biddable_auction: ended once its whole end second has passed.
+            ids = [r[0] for r in conn.execute(
+                "SELECT a_id FROM auction WHERE a_status = 'open' AND a_e_epoch < ? LIMIT ?",
+                (int(time.time()), batch_size))]
+            if not ids:
+                conn.rollback()
+                break
+            conn.execute("UPDATE auction SET a_status = 'closed', updated_at = CURRENT_TIMESTAMP "
+                         "WHERE a_id IN (SELECT value FROM json_each(?))", (json.dumps(ids),))
+            _log_auction_changes(conn, ids)
+            conn.commit()
+            _invalidate_auctions(ids)
+            closed += len(ids)
+    finally:
+        conn.close()
+    return closed
+
+
+ARCHIVE_TABLES = {"auction": "auction_archive", "bid": "bid_archive"}
+
+
+def last_allocated_id(conn: sqlite3.Connection, table: str, id_col: str) -> int:
+    """Highest id `table` has ever handed out, for callers that insert explicit ids.
+
+    Covers the AUTOINCREMENT counter and, for auctions and bids, the archive
+    table, so an id that now resolves to an archived row is never reused.
+    """
+    last = conn.execute(f"SELECT MAX({id_col}) FROM {table}").fetchone()[0] or 0
+    seq = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,)).fetchone()
+    last = max(last, seq[0] if seq else 0)
+    if table in ARCHIVE_TABLES:
+        last = max(last, conn.execute(f"SELECT MAX({id_col}) FROM {ARCHIVE_TABLES[table]}").fetchone()[0] or 0)
+    return last
+
+
+def _shared_columns(conn: sqlite3.Connection, table: str, archive: str) -> str:
+    archived = {r[1] for r in conn.execute(f"PRAGMA table_info({archive})")}
+    return ", ".join(r[1] for r in conn.execute(f"PRAGMA table_info({table})") if r[1] in archived)
+
+
+def archive_closed_auctions(older_than_days: Optional[int] = None, batch_size: Optional[int] = None,
+                            max_batches: Optional[int] = None) -> dict:
+    """Move auctions that ended or were closed over `older_than_days` ago, with their bids, to the archive.
+
+    Works oldest id first in transactions of `batch_size` auctions, so
+    bidders are only ever blocked for one batch; stops after `max_batches`
+    when given. Proxy maximums on archived auctions are dropped. Returns
+    {"auctions": n, "bids": n, "batches": n}.
+    """
+    days = ARCHIVE_AFTER_DAYS if older_than_days is None else older_than_days
+    batch_size = max(1, batch_size or ARCHIVE_BATCH_SIZE)
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    totals = {"auctions": 0, "bids": 0, "batches": 0}
+    conn = get_connection()
+    try:
+        auction_cols = _shared_columns(conn, "auction", "auction_archive")
+        bid_cols = _shared_columns(conn, "bid", "bid_archive")
+        while max_batches is None or totals["batches"] < max_batches:
+            conn.execute("BEGIN IMMEDIATE")
+            ids = [r[0] for r in conn.execute(
+                "SELECT a_id FROM auction WHERE a_e_epoch < ? "
+                "OR (a_status IN ('closed', 'cancelled') AND updated_at < ?) ORDER BY a_id LIMIT ?",
+                (to_epoch(cutoff), cutoff, batch_size))]
+            if not ids:
+                conn.rollback()
+                break
+            id_json = json.dumps(ids)
+            in_ids = "IN (SELECT value FROM json_each(?))"
+            conn.execute(f"INSERT INTO auction_archive({auction_cols}) SELECT {auction_cols} FROM auction "
+                         f"WHERE a_id {in_ids}", (id_json,))
+            moved = conn.execute(f"INSERT INTO bid_archive({bid_cols}) SELECT {bid_cols} FROM bid "
+                                 f"WHERE b_a_id {in_ids}", (id_json,)).rowcount
+            conn.execute(f"DELETE FROM bid WHERE b_a_id {in_ids}", (id_json,))
+            conn.execute(f"DELETE FROM proxy_bid WHERE pb_a_id {in_ids}", (id_json,))
+            conn.execute(f"DELETE FROM auction WHERE a_id {in_ids}", (id_json,))
+            _log_auction_changes(conn, ids)
+            conn.commit()
+            _invalidate_auctions(ids)
+            totals["auctions"] += len(ids)
+            totals["bids"] += max(moved, 0)
+            totals["batches"] += 1
+    finally:
+        conn.close()
+    return totals
+
+
+AUTO_VACUUM_MODES = {0: "none", 1: "full", 2: "incremental"}
+
+
+def maintenance_stats(conn: Optional[sqlite3.Connection] = None) -> dict:
+    """Page-level health of the database file plus the last recorded maintenance run.
+
+    `free_ratio` is the share of pages on the freelist: space deletions left
+    behind that only a vacuum returns to the filesystem.
+    """
+    own = conn is None
+    conn = conn or read_connection()
+    try:
+        page_size, page_count, freelist = (conn.execute(f"PRAGMA {p}").fetchone()[0]
+                                           for p in ("page_size", "page_count", "freelist_count"))
+        mode = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+        journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        last = conn.execute("SELECT started_at, finished_at, stats FROM maintenance_run "
+                            "WHERE finished_at IS NOT NULL ORDER BY run_id DESC LIMIT 1").fetchone()
+    finally:
+        if own:
+            conn.close()
+    return {
+        "page_size": page_size,
+        "page_count": page_count,
+        "freelist_count": freelist,
+        "free_ratio": round(freelist / page_count, 4) if page_count else 0.0,
+        "file_bytes": page_size * page_count,
+        "auto_vacuum": AUTO_VACUUM_MODES.get(mode, str(mode)),
+        "journal_mode": journal_mode,
+        "last_run": {"started_at": last["started_at"], "finished_at": last["finished_at"],
+                     **json.loads(last["stats"] or "{}")} if last else None,
+    }
+
+
+def _claim_maintenance(conn: sqlite3.Connection, min_interval_s: Optional[float]) -> Optional[int]:
+    """Record a run start; with `min_interval_s`, return None if another run started within that window."""
+    conn.execute("BEGIN IMMEDIATE")
+    if min_interval_s and conn.execute("SELECT 1 FROM maintenance_run WHERE started_at > datetime('now', ?)",
+                                       (f"-{float(min_interval_s)} seconds",)).fetchone():
+        conn.rollback()
+        return None
+    run_id = conn.execute("INSERT INTO maintenance_run DEFAULT VALUES").lastrowid
+    conn.execute("DELETE FROM maintenance_run WHERE run_id <= ?", (run_id - MAINTENANCE_KEEP_RUNS,))
+    conn.commit()
+    return run_id
+
+
+def run_maintenance(vacuum_pages: Optional[int] = None, analyze: bool = False, convert: bool = False,
+                    min_interval_s: Optional[float] = None) -> Optional[dict]:
+    """Refresh planner statistics and return free pages to the filesystem, in bounded steps.
+
+    Runs `PRAGMA optimize` (a full `ANALYZE` with `analyze=True`) and, once the
+    file uses incremental auto-vacuum, `incremental_vacuum` of at most
+    `vacuum_pages` pages. `convert=True` switches an older file to incremental
+    auto-vacuum; that needs one full VACUUM, which holds the write lock for
+    its duration, so only the maintenance tool asks for it.
+
+    With `min_interval_s` the call is skipped (returns None) when any worker
+    started a run within that window. Otherwise returns
+    {"before", "after", "steps_ms", "reclaimed_pages"}.
+    """
+    pages = MAINTENANCE_VACUUM_PAGES if vacuum_pages is None else vacuum_pages
+    conn = get_connection()
+    try:
+        run_id = _claim_maintenance(conn, min_interval_s)
+        if run_id is None:
+            return None
+        before = maintenance_stats(conn)
+        steps = {}
+
+        def step(name, sql):
+            t0 = time.perf_counter()
+            # executescript steps to completion; execute() stops incremental_vacuum after one page.
+            conn.executescript(sql)
+            steps[name] = round((time.perf_counter() - t0) * 1000, 1)
+
+        if convert and before["auto_vacuum"] != "incremental":
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            step("vacuum", "VACUUM")
+        step("analyze" if analyze else "optimize", "ANALYZE" if analyze else "PRAGMA optimize")
+        if pages > 0 and conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+            step("incremental_vacuum", f"PRAGMA incremental_vacuum({int(pages)})")
+        after = maintenance_stats(conn)
+        result = {"before": before, "after": after, "steps_ms": steps,
+                  "reclaimed_pages": before["page_count"] - after["page_count"]}
+        summary = {"steps_ms": steps, "reclaimed_pages": result["reclaimed_pages"]}
+        conn.execute("UPDATE maintenance_run SET finished_at = CURRENT_TIMESTAMP, stats = ? WHERE run_id = ?",
+                     (json.dumps(summary), run_id))
         conn.commit()
-        return cur.rowcount and cur.rowcount > 0
+        return result
     finally:
         conn.close()
 
@@ -1,5 +1,8 @@
+import json
 import os
 import logging
+import time
+import zlib
 from decimal import Decimal
 from datetime import datetime, timedelta
 import math
@@ -10,8 +13,43 @@ except Exception:
     pyodbc = None
 from werkzeug.security import check_password_hash, generate_password_hash
 
+import bidding
+from querylog import TracedDBAPIConnection
+
+
+def _showplan(conn, sql, params):
+    """Return the estimated plan for a statement using SET SHOWPLAN_TEXT."""
+    if not sql.lstrip().upper().startswith(('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'WITH')):
+        return None
+    cur = conn.cursor()
+    try:
+        cur.execute('SET SHOWPLAN_TEXT ON')
+        try:
+            cur.execute(sql, params) if params else cur.execute(sql)
+            lines = []
+            while True:
+                try:
+                    lines.extend(str(r[0]) for r in cur.fetchall())
+                except Exception:
+                    pass
+                if not cur.nextset():
+                    break
+            return '\n'.join(lines)
+        finally:
+            cur.execute('SET SHOWPLAN_TEXT OFF')
+    finally:
+        try:
+            cur.close()
+        except Exception:
+            pass
+
 
 def get_connection():
+    """Open a SQL Server connection whose cursors are timed by the slow-query log."""
+    return TracedDBAPIConnection(_connect(), explain=_showplan)
+
+
+def _connect():
     if pyodbc is None:
         raise RuntimeError('pyodbc is not installed; install with `pip install pyodbc`')
     dsn = os.getenv('ODBC_DSN')
@@ -257,13 +295,95 @@ def get_auctions(limit=50):
                 # Friendly URL for the item view route; avoid importing Flask here.
                 'url': f"/auction/{int(data.get('a_id')) if data.get('a_id') is not None else (data.get('a_item_id') or '')}",
             'status': status,
+            'bid_count': data.get('bid_count') or 0,
+            'high_bidder_id': data.get('high_bidder_id'),
+            'last_bid_at': data.get('last_bid_at'),
         })
+        # Fragment-cache version for the auction card: changes whenever a rendered field does.
+        out[-1]['version'] = format(zlib.crc32(repr(sorted(out[-1].items())).encode()), '08x')
 
     conn.close()
     return out
 
 
+# Served by IX_bid_auction_amount (see ensure_bid_stats_columns).
+_HIGHEST_BID_SQL = "SELECT TOP 1 b_amount, b_m_id, b_time FROM {table} WHERE b_a_id = ? ORDER BY b_amount DESC"
+
+
+def _highest_bid(cur, auction_id, table='dbo.bid'):
+    cur.execute(_HIGHEST_BID_SQL.format(table=table), (auction_id,))
+    r = cur.fetchone()
+    if not r:
+        return None
+    return {'amount': float(r[0]), 'bidder_id': r[1], 'bid_time': r[2]}
+
+
+def get_highest_bid(auction_id, archived=False):
+    """Return the top bid on an auction as {amount, bidder_id, bid_time}, or None.
+
+    `archived` (as set by `get_auction`) reads dbo.bid_archive instead of dbo.bid.
+    """
+    if pyodbc is None:
+        raise RuntimeError('pyodbc is not installed')
+    conn = get_connection()
+    try:
+        cur = conn.cursor()
+        if not archived:
+            return _highest_bid(cur, auction_id)
+        try:
+            return _highest_bid(cur, auction_id, table='dbo.bid_archive')
+        except Exception:
+            return None  # archive tables not created yet
+    finally:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+def get_bid_history(auction_id, before_id=None, limit=50, archived=False):
+    """Bids on an auction newest first; same contract as `db.get_bid_history`.
+
+    Seeks IX_bid_auction_time (see ensure_bid_stats_columns) from the cursor
+    bid, so deep pages cost the same as the first.
+    """
+    if pyodbc is None:
+        raise RuntimeError('pyodbc is not installed')
+    sql = "SELECT TOP (?) b.b_id, b.b_m_id, b.b_amount, b.b_time FROM {table} b "
+    params = [int(limit)]
+    if before_id is not None:
+        sql += ("CROSS APPLY (SELECT b_time, b_id FROM {table} WHERE b_id = ?) c "
+                "WHERE b.b_a_id = ? AND (b.b_time < c.b_time OR (b.b_time = c.b_time AND b.b_id < c.b_id)) ")
+        params += [int(before_id), auction_id]
+    else:
+        sql += "WHERE b.b_a_id = ? "
+        params.append(auction_id)
+    sql += "ORDER BY b.b_time DESC, b.b_id DESC"
+    conn = get_connection()
+    cur = conn.cursor()
+    try:
+        try:
+            cur.execute(sql.format(table='dbo.bid_archive' if archived else 'dbo.bid'), params)
+            rows = cur.fetchall()
+        except Exception:
+            if not archived:
+                raise
+            rows = []  # archive tables not created yet
+    finally:
+        try:
+            conn.close()
+        except Exception:
+            pass
+    return [{'id': r[0], 'bidder_id': r[1], 'amount': float(r[2]), 'bid_time': r[3]} for r in rows]
+
+
 def get_auction(auction_id):
+    """Load one auction per call, uncached.
+
+    The LRU/TTL cache and change_log invalidation in front of `db.get_auction`
+    are SQLite-only; this backend has no cross-worker invalidation channel, so
+    every view and bid POST reads dbo.auction directly.
+    """
     conn = get_connection()
     cur = conn.cursor()
 
@@ -288,8 +408,21 @@ def get_auction(auction_id):
         except Exception:
             continue
 
-    conn.close()
+    # Archived auctions stay readable at their old URLs (see archive_closed_auctions).
+    archived = False
+    if not data:
+        try:
+            cur.execute("SELECT a.*, i.* FROM dbo.auction_archive a LEFT JOIN dbo.item i ON i.i_id = a.a_item_id "
+                        "WHERE a.a_id = ?", (auction_id,))
+            row = cur.fetchone()
+            if row:
+                data = _row_to_dict(cur, row)
+                archived = True
+        except Exception:
+            pass
+
     if not data:
+        conn.close()
         return None
 
     title = _pick_first(['title', 'name', 'item_title'], data) or f"Item {data.get('a_item_id') or data.get('item_id') or data.get('a_id')}"
@@ -307,29 +440,20 @@ def get_auction(auction_id):
     except Exception:
         pass
     # Default current bid value from the auction row (starting/current price)
-    current_bid = _pick_first(['a_s_price', 'current_bid', 'price', 'starting_price'], data)
+    starting_price = _pick_first(['a_s_price', 'current_bid', 'price', 'starting_price'], data)
+    current_price = starting_price
     # Try to pick up the current highest bid from the bid table
     try:
-        aid = data.get('a_id')
-        highest_bid_val = None
-        if aid is not None:
-            cur.execute("SELECT MAX(b_amount) AS maxb FROM dbo.bid WHERE b_a_id = ?", (aid,))
-            r = cur.fetchone()
-            if r:
-                try:
-                    highest_bid_val = float(getattr(r, 'maxb') or 0)
-                except Exception:
-                    try:
-                        highest_bid_val = float(r[0] or 0)
-                    except Exception:
-                        highest_bid_val = None
-        if highest_bid_val is not None and highest_bid_val > 0:
-            current_bid = _format_money(highest_bid_val)
-        else:
-            current_bid = _format_money(current_bid)
+        bid_table = 'dbo.bid_archive' if archived else 'dbo.bid'
+        top = _highest_bid(cur, data['a_id'], table=bid_table) if data.get('a_id') is not None else None
+        if top:
+            current_price = top['amount']
     except Exception:
-        # fallback to formatting whatever we found in the row
-        current_bid = _format_money(current_bid)
+        # fallback to whatever we found in the row
+        pass
+    finally:
+        conn.close()
+    current_bid = _format_money(current_price)
     seller = data.get('a_m_id') or data.get('seller_id') or None
 
     start_date = data.get('a_s_date') or data.get('start_date')
@@ -385,15 +509,142 @@ def get_auction(auction_id):
         'description': description,
         'image_url': image,
         'current_bid': current_bid,
+        'current_price': current_price,
+        'starting_price': starting_price,
         'seller_id': int(seller) if seller is not None else None,
         'start_date': start_date,
         'end_time': end_time,
         'duration': duration,
         'url': f"/auction/{int(data.get('a_id')) if data.get('a_id') is not None else (data.get('a_item_id') or '')}",
         'status': status,
+        'bid_count': data.get('bid_count') or 0,
+        'high_bidder_id': data.get('high_bidder_id'),
+        'last_bid_at': data.get('last_bid_at'),
+        'archived': archived,
     }
 
 
+def get_auctions_page(before_id=None, limit=50):
+    """Return auctions newest id first, only ids below `before_id`; same contract as `db.get_auctions_page`."""
+    if pyodbc is None:
+        raise RuntimeError('pyodbc is not installed')
+    conn = get_connection()
+    cur = conn.cursor()
+    try:
+        cur.execute("SELECT COLUMN_NAME FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_SCHEMA='dbo' AND TABLE_NAME='auction'")
+        cols = {r[0].lower() for r in cur.fetchall()}
+        stats = ', a.bid_count, a.high_bidder_id, a.last_bid_at' if 'bid_count' in cols else ''
+        status = ', a.a_status' if 'a_status' in cols else ''
+        where = 'WHERE a.a_id < ? ' if before_id is not None else ''
+        params = ([int(before_id)] if before_id is not None else []) + [int(limit)]
+        cur.execute(
+            f"SELECT a.a_id, a.a_item_id, a.a_s_price, a.a_s_date, a.a_e_date{status}{stats}, "
+            f"i.i_title, i.i_desc, i.i_m_id, "
+            f"(SELECT MAX(b.b_amount) FROM dbo.bid b WHERE b.b_a_id = a.a_id) AS max_amount "
+            f"FROM dbo.auction a LEFT JOIN dbo.item i ON i.i_id = a.a_item_id {where}"
+            f"ORDER BY a.a_id DESC OFFSET 0 ROWS FETCH NEXT ? ROWS ONLY",
+            params,
+        )
+        rows = [_row_to_dict(cur, r) for r in cur.fetchall()]
+    finally:
+        try:
+            conn.close()
+        except Exception:
+            pass
+    out = []
+    for d in rows:
+        price = d.get('max_amount') or d.get('a_s_price')
+        out.append({
+            'id': d.get('a_id'),
+            'item_id': d.get('a_item_id'),
+            'title': d.get('i_title') or f"Item {d.get('a_item_id')}",
+            'description': d.get('i_desc') or '',
+            'image_url': url_for_static_placeholder(),
+            'current_bid': _format_money(price),
+            'current_price': price,
+            'starting_price': d.get('a_s_price'),
+            'seller_id': d.get('i_m_id'),
+            'start_date': d.get('a_s_date'),
+            'end_time': d.get('a_e_date'),
+            'url': f"/auction/{d.get('a_id')}",
+            'status': d.get('a_status') or 'open',
+            'bid_count': d.get('bid_count') or 0,
+            'high_bidder_id': d.get('high_bidder_id'),
+            'last_bid_at': d.get('last_bid_at'),
+        })
+    return out
+
+
+RANKINGS = {
+    'popular': ('', 'bid_count DESC, a.a_id'),
+    'ending': (' AND a.a_e_date IS NOT NULL', 'a.a_e_date, a.a_id'),
+    'new': ('', 'a.a_s_date DESC, a.a_id DESC'),
+}
+
+
+def get_ranked_auctions(kind, limit=20, offset=0):
+    """Return open auctions ranked as `kind`; same contract as `db.get_ranked_auctions`.
+
+    Reads the denormalized bid statistics (see `ensure_bid_stats_columns`);
+    without them popularity falls back to counting bids per auction. Suggested
+    indexes: auction(a_status, bid_count DESC), auction(a_status, a_e_date)
+    and auction(a_status, a_s_date DESC).
+    """
+    if pyodbc is None:
+        raise RuntimeError('pyodbc is not installed')
+    if kind not in RANKINGS:
+        raise ValueError(f'unknown ranking: {kind!r}')
+    where, order = RANKINGS[kind]
+    conn = get_connection()
+    cur = conn.cursor()
+    try:
+        cur.execute("SELECT COLUMN_NAME FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_SCHEMA='dbo' AND TABLE_NAME='auction'")
+        cols = {r[0].lower() for r in cur.fetchall()}
+        if 'bid_count' in cols:
+            stats = 'a.bid_count, a.high_bidder_id'
+        else:
+            stats = ('(SELECT COUNT(*) FROM dbo.bid b WHERE b.b_a_id = a.a_id) AS bid_count, '
+                     '(SELECT TOP 1 b.b_m_id FROM dbo.bid b WHERE b.b_a_id = a.a_id ORDER BY b.b_amount DESC) AS high_bidder_id')
+        status = "a.a_status = 'open' AND " if 'a_status' in cols else ''
+        cur.execute(
+            f"SELECT a.a_id, a.a_item_id, a.a_s_price, a.a_s_date, a.a_e_date, {stats}, "
+            f"i.i_title, i.i_desc, i.i_m_id, "
+            f"(SELECT MAX(b.b_amount) FROM dbo.bid b WHERE b.b_a_id = a.a_id) AS max_amount "
+            f"FROM dbo.auction a LEFT JOIN dbo.item i ON i.i_id = a.a_item_id "
+            f"WHERE {status}(a.a_e_date IS NULL OR a.a_e_date > GETUTCDATE()){where} "
+            f"ORDER BY {order} OFFSET ? ROWS FETCH NEXT ? ROWS ONLY",
+            (int(offset), int(limit)),
+        )
+        rows = [_row_to_dict(cur, r) for r in cur.fetchall()]
+    finally:
+        try:
+            conn.close()
+        except Exception:
+            pass
+    out = []
+    for d in rows:
+        price = _format_money(d.get('max_amount') or d.get('a_s_price'))
+        out.append({
+            'id': d.get('a_id'),
+            'item_id': d.get('a_item_id'),
+            'title': d.get('i_title') or f"Item {d.get('a_item_id')}",
+            'description': d.get('i_desc') or '',
+            'image_url': url_for_static_placeholder(),
+            'current_bid': price,
+            'seller_id': d.get('i_m_id'),
+            'start_date': d.get('a_s_date'),
+            'end_time': d.get('a_e_date'),
+            'url': f"/auction/{d.get('a_id')}",
+            'status': 'open',
+            'bid_count': d.get('bid_count') or 0,
+            'high_bidder_id': d.get('high_bidder_id'),
+            'max_price': price,
+            'end_date': d.get('a_e_date'),
+            'auc_cnt': d.get('bid_count') or 0,
+        })
+    return out
+
+
 def delete_auction_and_bids(auction_id: int):
     """Delete bids for an auction and the auction row itself.
 
@@ -419,6 +670,17 @@ def delete_auction_and_bids(auction_id: int):
                 break
             except Exception:
                 deleted_bids = 0
+        try:
+            cur.execute('DELETE FROM dbo.proxy_bid WHERE pb_a_id = ?', (auction_id,))
+        except Exception:
+            pass  # proxy_bid not created yet
+        try:
+            cur.execute('DELETE FROM dbo.bid_archive WHERE b_a_id = ?', (auction_id,))
+            deleted_bids = (deleted_bids or 0) + (cur.rowcount or 0)
+            cur.execute('DELETE FROM dbo.auction_archive WHERE a_id = ?', (auction_id,))
+            deleted_auctions_archived = cur.rowcount or 0
+        except Exception:
+            deleted_auctions_archived = 0  # archive tables not created yet
 
         # Delete auction row: try several common id column names and sum results
         deleted_auctions = 0
@@ -432,6 +694,7 @@ def delete_auction_and_bids(auction_id: int):
             except Exception:
                 # ignore and try next
                 continue
+        deleted_auctions += deleted_auctions_archived
 
         if deleted_auctions == 0:
             try:
@@ -562,9 +825,11 @@ def verify_password(stored_password, provided_password):
     return False
 
 
-def create_member(login_id, plain_password, first_name=None, last_name=None, email=None):
+def create_member(login_id, plain_password, first_name=None, last_name=None, email=None, role=None):
     """Create a member in dbo.member. Returns new m_id on success.
 
+    `role` is stored in m_role when that column exists.
+
     Raises RuntimeError on connection issues or ValueError if username exists.
     """
     if pyodbc is None:
@@ -630,6 +895,14 @@ def create_member(login_id, plain_password, first_name=None, last_name=None, ema
             # ignore and return whatever we have (possibly None)
             new_id = new_id
 
+    if new_id and role:
+        try:
+            cur.execute("UPDATE dbo.member SET m_role = ? WHERE m_id = ?", (role, new_id))
+            conn.commit()
+        except Exception:
+            # older schemas have no m_role column
+            pass
+
     conn.close()
     return new_id
 
@@ -679,6 +952,89 @@ def get_member_by_id(m_id):
             pass
 
 
+def _to_bool(val):
+    """Interpret the many shapes an admin flag column can take (bit, int, bytes, 'Y')."""
+    if val is None:
+        return False
+    if isinstance(val, bool):
+        return val
+    if isinstance(val, (int, float)):
+        try:
+            return int(val) != 0
+        except Exception:
+            return False
+    if isinstance(val, bytes):
+        try:
+            return int.from_bytes(val, 'little') != 0
+        except Exception:
+            return bool(val)
+    s = str(val).strip().lower()
+    return s in ('1', 'true', 't', 'yes', 'y')
+
+
+def _member_columns(cur):
+    """Discover which optional member columns exist so we build a safe SELECT."""
+    cur.execute("SELECT COLUMN_NAME FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_SCHEMA='dbo' AND TABLE_NAME='member'")
+    existing = {r[0].lower() for r in cur.fetchall()}
+    cols = ['m_id', 'm_login_id', 'm_email', 'm_status']
+    if 'm_role' in existing:
+        cols.append('m_role')
+    if 'm_is_admin' in existing:
+        cols.append('m_is_admin')
+    if 'is_admin' in existing and 'is_admin' not in cols:
+        cols.append('is_admin')
+    return cols
+
+
+def _member_summary(d):
+    return {
+        'id': d.get('m_id'),
+        'username': d.get('m_login_id'),
+        'email': d.get('m_email'),
+        'status': d.get('m_status'),
+        # normalized boolean for convenience
+        'm_is_admin': _to_bool(d.get('m_is_admin')),
+        'is_admin': _to_bool(d.get('is_admin')),
+        # keep raw role value if present
+        'm_role': d.get('m_role')
+    }
+
+
+def resolve_member(identifier):
+    """Find a member by id, login or email in one indexed query; same contract as `db.resolve_member`.
+
+    Case-insensitivity comes from the column collation (SQL Server defaults to
+    *_CI_AS), so plain equality stays sargable. The lookup expects indexes on
+    dbo.member(m_login_id) and dbo.member(m_email).
+    """
+    if pyodbc is None:
+        raise RuntimeError('pyodbc is not installed')
+    text = str(identifier or '').strip()
+    if not text:
+        return None
+    m_id = int(text) if text.isdigit() else None
+    conn = get_connection()
+    cur = conn.cursor()
+    try:
+        cur.execute(
+            "SELECT TOP 1 * FROM dbo.member WHERE m_id = ? OR m_login_id = ? OR m_email = ? "
+            "ORDER BY CASE WHEN m_id = ? THEN 0 WHEN m_login_id = ? THEN 1 ELSE 2 END, m_id",
+            (m_id, text, text, m_id, text),
+        )
+        row = cur.fetchone()
+        if not row:
+            return None
+        data = _row_to_dict(cur, row)
+        norm = {'id': data.get('m_id'), 'username': data.get('m_login_id'), 'email': data.get('m_email')}
+        norm.update(data)
+        return norm
+    finally:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
 def get_all_members():
     """Return a list of simple member dicts (id, username, email, status).
 
@@ -690,55 +1046,10 @@ def get_all_members():
     cur = conn.cursor()
     out = []
     try:
-        # Discover which optional columns exist so we build a safe SELECT
-        cur.execute("SELECT COLUMN_NAME FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_SCHEMA='dbo' AND TABLE_NAME='member'")
-        existing = {r[0].lower() for r in cur.fetchall()}
-        cols = ['m_id', 'm_login_id', 'm_email', 'm_status']
-        if 'm_role' in existing:
-            cols.append('m_role')
-        if 'm_is_admin' in existing:
-            cols.append('m_is_admin')
-        if 'is_admin' in existing and 'is_admin' not in cols:
-            cols.append('is_admin')
-
-        sql = "SELECT " + ", ".join(cols) + " FROM dbo.member"
+        sql = "SELECT " + ", ".join(_member_columns(cur)) + " FROM dbo.member"
         cur.execute(sql)
-        rows = cur.fetchall()
-
-        def _to_bool_raw(val):
-            if val is None:
-                return False
-            if isinstance(val, bool):
-                return val
-            if isinstance(val, (int, float)):
-                try:
-                    return int(val) != 0
-                except Exception:
-                    return False
-            if isinstance(val, bytes):
-                try:
-                    return int.from_bytes(val, 'little') != 0
-                except Exception:
-                    return bool(val)
-            s = str(val).strip().lower()
-            return s in ('1', 'true', 't', 'yes', 'y')
-
-        for row in rows:
-            d = _row_to_dict(cur, row)
-            m_is_admin_raw = d.get('m_is_admin') if 'm_is_admin' in d else None
-            is_admin_raw = d.get('is_admin') if 'is_admin' in d else None
-            role_raw = d.get('m_role') if 'm_role' in d else None
-            out.append({
-                'id': d.get('m_id'),
-                'username': d.get('m_login_id'),
-                'email': d.get('m_email'),
-                'status': d.get('m_status'),
-                # normalized boolean for convenience
-                'm_is_admin': _to_bool_raw(m_is_admin_raw),
-                'is_admin': _to_bool_raw(is_admin_raw),
-                # keep raw role value if present
-                'm_role': role_raw
-            })
+        for row in cur.fetchall():
+            out.append(_member_summary(_row_to_dict(cur, row)))
     finally:
         try:
             conn.close()
@@ -747,6 +1058,103 @@ def get_all_members():
     return out
 
 
+def reset_after_fork():
+    """Drop per-process state inherited from a forking parent (gunicorn `post_fork`).
+
+    Connections are opened per call and the master never connects, so only
+    the member-count cache needs clearing.
+    """
+    _member_counts.clear()
+
+
+MEMBER_SORTS = {'id': 'm_id', 'username': 'm_login_id', 'status': 'm_status', 'created': 'created_at'}
+MEMBER_COUNT_TTL = float(os.getenv('MEMBER_COUNT_TTL', '60'))
+_member_counts = {}  # (status, role, prefix) -> (expires_at, count, is_estimate)
+
+
+def _member_filters(cols, status=None, role=None, login_prefix=None):
+    clauses, params = [], []
+    if status:
+        clauses.append('m_status = ?')
+        params.append(status)
+    if role in ('admin', 'user'):
+        flag = 'm_is_admin' if 'm_is_admin' in cols else ('is_admin' if 'is_admin' in cols else None)
+        if flag:
+            clauses.append(f"ISNULL({flag}, 0) {'=' if role == 'admin' else '<>'} 1")
+        elif 'm_role' in cols:
+            clauses.append("m_role = 'admin'" if role == 'admin' else "ISNULL(m_role, '') <> 'admin'")
+    if login_prefix:
+        # Escape LIKE wildcards so the prefix stays sargable on the m_login_id index.
+        escaped = login_prefix.replace('[', '[[]').replace('%', '[%]').replace('_', '[_]')
+        clauses.append('m_login_id LIKE ?')
+        params.append(escaped + '%')
+    return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+
+def _count_members(cur, cols, status=None, role=None, login_prefix=None):
+    """Return (total, is_estimate); unfiltered totals come from partition metadata, not a scan."""
+    key = (status or None, role or None, login_prefix or None)
+    cached = _member_counts.get(key)
+    if cached and cached[0] > time.monotonic():
+        return cached[1], cached[2]
+    where, params = _member_filters(cols, status, role, login_prefix)
+    total, estimate = None, False
+    if not where:
+        try:
+            cur.execute("SELECT SUM(row_count) FROM sys.dm_db_partition_stats "
+                        "WHERE object_id = OBJECT_ID('dbo.member') AND index_id IN (0, 1)")
+            row = cur.fetchone()
+            if row and row[0] is not None:
+                total, estimate = int(row[0]), True
+        except Exception:
+            total = None  # VIEW DATABASE STATE not granted; count instead
+    if total is None:
+        cur.execute('SELECT COUNT_BIG(*) FROM dbo.member' + where, params)
+        total = int(cur.fetchone()[0])
+    _member_counts[key] = (time.monotonic() + MEMBER_COUNT_TTL, total, estimate)
+    return total, estimate
+
+
+def get_members_page(page=1, per_page=50, status=None, role=None, login_prefix=None, sort='id', descending=False):
+    """Return one page of members plus paging info; same shape as `db.get_members_page`."""
+    if pyodbc is None:
+        raise RuntimeError('pyodbc is not installed')
+    page = max(1, int(page or 1))
+    per_page = max(1, min(int(per_page or 50), 500))
+    direction = 'DESC' if descending else 'ASC'
+    conn = get_connection()
+    cur = conn.cursor()
+    try:
+        cols = _member_columns(cur)
+        order = MEMBER_SORTS.get(sort, 'm_id')
+        if order == 'created_at':
+            order = 'm_id'  # not every member table has created_at; ids are assigned in creation order
+        where, params = _member_filters(cols, status, role, login_prefix)
+        cur.execute(
+            'SELECT ' + ', '.join(cols) + ' FROM dbo.member' + where +
+            f' ORDER BY {order} {direction}, m_id {direction} OFFSET ? ROWS FETCH NEXT ? ROWS ONLY',
+            params + [(page - 1) * per_page, per_page + 1],
+        )
+        rows = [_member_summary(_row_to_dict(cur, r)) for r in cur.fetchall()]
+        total, estimate = _count_members(cur, cols, status, role, login_prefix)
+    finally:
+        try:
+            conn.close()
+        except Exception:
+            pass
+    has_next = len(rows) > per_page
+    return {
+        'members': rows[:per_page],
+        'page': page,
+        'per_page': per_page,
+        'total': total,
+        'total_is_estimate': estimate,
+        'pages': max(page + (1 if has_next else 0), -(-total // per_page)),
+        'has_prev': page > 1,
+        'has_next': has_next,
+    }
+
+
 def set_member_admin(m_id, is_admin=True):
     """Attempt to grant or revoke admin privileges for a member.
 
@@ -825,8 +1233,10 @@ def place_bid(auction_id, bidder_m_id, amount):
     cur = conn.cursor()
     try:
         # Check auction status / end date first to prevent bids on closed auctions.
+        # UPDLOCK holds the auction row until commit so concurrent bids queue up.
+        adata = {}
         try:
-            cur.execute("SELECT * FROM dbo.auction WHERE a_id = ?", (auction_id,))
+            cur.execute("SELECT * FROM dbo.auction WITH (UPDLOCK, ROWLOCK) WHERE a_id = ?", (auction_id,))
             arow = cur.fetchone()
             if arow:
                 adata = _row_to_dict(cur, arow)
@@ -922,6 +1332,16 @@ def place_bid(auction_id, bidder_m_id, amount):
         if not inserted:
             conn.rollback()
             return False
+        if {'bid_count', 'high_bidder_id', 'last_bid_at'} <= {k.lower() for k in adata}:
+            cur.execute(
+                "UPDATE dbo.auction SET bid_count = ISNULL(bid_count, 0) + 1, high_bidder_id = ?, "
+                "last_bid_at = (SELECT MAX(b_time) FROM dbo.bid WHERE b_a_id = ?) WHERE a_id = ?",
+                (bidder_m_id, auction_id, auction_id)
+            )
+        # Proxy maximums above this bid answer it before the lock is released.
+        answers = bidding.resolve(bid_val, bidder_m_id, _proxy_bids(cur, auction_id))
+        if answers:
+            _insert_bids(cur, auction_id, answers, adata)
         conn.commit()
         return True
     finally:
@@ -931,6 +1351,457 @@ def place_bid(auction_id, bidder_m_id, amount):
             pass
 
 
+def _accepts_bids(adata):
+    """False when an auction row (as a dict) is closed, cancelled or past its end date."""
+    end_time = _pick_first(['a_e_date', 'end_date', 'a_end', 'a_e'], adata)
+    status = _pick_first(['a_status', 'status', 'state'], adata)
+    if isinstance(end_time, datetime) and end_time <= datetime.utcnow():
+        return False
+    return not (status is not None and str(status).lower() in ('closed', 'c', 'cancelled', 'cancel'))
+
+
+def _proxy_bids(cur, auction_id):
+    """The two strongest maximums on an auction, as `bidding.resolve` expects them.
+
+    Returns [] when dbo.proxy_bid has not been created yet (see ensure_bid_stats_columns).
+    """
+    try:
+        cur.execute(
+            "SELECT TOP 2 pb_m_id, pb_max FROM dbo.proxy_bid WHERE pb_a_id = ? ORDER BY pb_max DESC, pb_id",
+            (auction_id,)
+        )
+        return [(r[0], float(r[1])) for r in cur.fetchall()]
+    except Exception:
+        return []
+
+
+def _insert_bids(cur, auction_id, bids, adata):
+    """Insert proxy `bids` in order and point the bid statistics at the last one."""
+    for m_id, amount in bids:
+        cur.execute("INSERT INTO dbo.bid (b_a_id, b_m_id, b_amount, b_time) VALUES (?, ?, ?, GETUTCDATE())",
+                    (auction_id, m_id, amount))
+    if {'bid_count', 'high_bidder_id', 'last_bid_at'} <= {k.lower() for k in adata}:
+        cur.execute(
+            "UPDATE dbo.auction SET bid_count = ISNULL(bid_count, 0) + ?, high_bidder_id = ?, "
+            "last_bid_at = (SELECT MAX(b_time) FROM dbo.bid WHERE b_a_id = ?) WHERE a_id = ?",
+            (len(bids), bids[-1][0], auction_id, auction_id)
+        )
+
+
+def place_max_bid(auction_id, bidder_m_id, max_amount):
+    """Set (or raise) a bidder's hidden maximum and resolve competing proxies.
+
+    Returns {max_amount, current_price, high_bidder_id, leading, bids_placed},
+    or None when the auction no longer accepts bids, the maximum does not beat
+    the current price, or it does not raise the bidder's existing maximum.
+    """
+    if pyodbc is None:
+        raise RuntimeError('pyodbc is not installed')
+    try:
+        max_bid = round(float(max_amount), 2)
+    except Exception:
+        return None
+    conn = get_connection()
+    cur = conn.cursor()
+    try:
+        # UPDLOCK on the auction row serializes this with place_bid.
+        cur.execute("SELECT * FROM dbo.auction WITH (UPDLOCK, ROWLOCK) WHERE a_id = ?", (auction_id,))
+        arow = cur.fetchone()
+        if not arow:
+            return None
+        adata = _row_to_dict(cur, arow)
+        if not _accepts_bids(adata):
+            return None
+        top = _highest_bid(cur, auction_id)
+        price = top['amount'] if top else float(adata.get('a_s_price') or 0)
+        leader = top['bidder_id'] if top else None
+        cur.execute("SELECT pb_max FROM dbo.proxy_bid WHERE pb_a_id = ? AND pb_m_id = ?", (auction_id, bidder_m_id))
+        own = cur.fetchone()
+        if max_bid <= price or (own and max_bid <= float(own[0])):
+            conn.rollback()
+            return None
+        # Replace rather than update so pb_id keeps ordering maximums by when they were set.
+        cur.execute("DELETE FROM dbo.proxy_bid WHERE pb_a_id = ? AND pb_m_id = ?", (auction_id, bidder_m_id))
+        cur.execute("INSERT INTO dbo.proxy_bid (pb_a_id, pb_m_id, pb_max, pb_time) VALUES (?, ?, ?, GETUTCDATE())",
+                    (auction_id, bidder_m_id, max_bid))
+        bids = bidding.resolve(price, leader, _proxy_bids(cur, auction_id))
+        if bids:
+            _insert_bids(cur, auction_id, bids, adata)
+            leader, price = bids[-1]
+        conn.commit()
+        return {'max_amount': max_bid, 'current_price': price, 'high_bidder_id': leader,
+                'leading': leader == bidder_m_id, 'bids_placed': len(bids)}
+    finally:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+def get_proxy_bid(auction_id, bidder_m_id):
+    """A bidder's own maximum on an auction as {max_amount, set_at}, or None."""
+    if pyodbc is None:
+        raise RuntimeError('pyodbc is not installed')
+    conn = get_connection()
+    cur = conn.cursor()
+    try:
+        try:
+            cur.execute("SELECT pb_max, pb_time FROM dbo.proxy_bid WHERE pb_a_id = ? AND pb_m_id = ?",
+                        (auction_id, bidder_m_id))
+            row = cur.fetchone()
+        except Exception:
+            return None
+        if not row:
+            return None
+        return {'max_amount': float(row[0]), 'set_at': row[1]}
+    finally:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+ARCHIVE_AFTER_DAYS = int(os.getenv('ARCHIVE_AFTER_DAYS', '90'))
+ARCHIVE_BATCH_SIZE = int(os.getenv('ARCHIVE_BATCH_SIZE', '500'))
+
+
+def ensure_archive_tables():
+    """Create dbo.auction_archive / dbo.bid_archive as column copies of dbo.auction / dbo.bid.
+
+    SELECT INTO over a UNION ALL drops the IDENTITY property, so archived rows
+    keep their original ids. Returns True if a table was created.
+    """
+    if pyodbc is None:
+        raise RuntimeError('pyodbc is not installed')
+    conn = get_connection()
+    cur = conn.cursor()
+    created = False
+    try:
+        for hot, cold, key in (('auction', 'auction_archive', 'a_id'),
+                               ('bid', 'bid_archive', 'b_a_id, b_time DESC, b_id DESC')):
+            cur.execute("SELECT OBJECT_ID(?)", (f'dbo.{cold}',))
+            if cur.fetchone()[0] is None:
+                cur.execute(f"SELECT * INTO dbo.{cold} FROM "
+                            f"(SELECT TOP 0 * FROM dbo.{hot} UNION ALL SELECT TOP 0 * FROM dbo.{hot}) t")
+                cur.execute(f"CREATE CLUSTERED INDEX CIX_{cold} ON dbo.{cold} ({key})")
+                created = True
+        conn.commit()
+    finally:
+        try:
+            conn.close()
+        except Exception:
+            pass
+    return created
+
+
+def _shared_columns(cur, hot, cold):
+    cur.execute("SELECT TABLE_NAME, COLUMN_NAME FROM INFORMATION_SCHEMA.COLUMNS "
+                "WHERE TABLE_SCHEMA = 'dbo' AND TABLE_NAME IN (?, ?) ORDER BY ORDINAL_POSITION", (hot, cold))
+    rows = cur.fetchall()
+    archived = {r[1].lower() for r in rows if r[0].lower() == cold}
+    return ', '.join(f'[{r[1]}]' for r in rows if r[0].lower() == hot and r[1].lower() in archived)
+
+
+def archive_closed_auctions(older_than_days=None, batch_size=None, max_batches=None):
+    """Move auctions that ended over `older_than_days` ago, with their bids, to the archive tables.
+
+    Same contract as `db.archive_closed_auctions`; creates the archive tables
+    on first use. Auctions closed without an end date stay in dbo.auction,
+    as the legacy schema has no close time to age them by.
+    """
+    if pyodbc is None:
+        raise RuntimeError('pyodbc is not installed')
+    ensure_archive_tables()
+    days = ARCHIVE_AFTER_DAYS if older_than_days is None else older_than_days
+    batch_size = max(1, batch_size or ARCHIVE_BATCH_SIZE)
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    totals = {'auctions': 0, 'bids': 0, 'batches': 0}
+    conn = get_connection()
+    cur = conn.cursor()
+    try:
+        auction_cols = _shared_columns(cur, 'auction', 'auction_archive')
+        bid_cols = _shared_columns(cur, 'bid', 'bid_archive')
+        in_ids = "IN (SELECT CAST([value] AS INT) FROM OPENJSON(?))"
+        while max_batches is None or totals['batches'] < max_batches:
+            # READPAST skips auctions a bidder has locked; they are picked up next run.
+            cur.execute("SELECT TOP (?) a_id FROM dbo.auction WITH (UPDLOCK, READPAST) "
+                        "WHERE a_e_date < ? ORDER BY a_id", (batch_size, cutoff))
+            ids = [r[0] for r in cur.fetchall()]
+            if not ids:
+                conn.rollback()
+                break
+            id_json = json.dumps(ids)
+            cur.execute(f"INSERT INTO dbo.auction_archive ({auction_cols}) SELECT {auction_cols} FROM dbo.auction "
+                        f"WHERE a_id {in_ids}", (id_json,))
+            cur.execute(f"INSERT INTO dbo.bid_archive ({bid_cols}) SELECT {bid_cols} FROM dbo.bid "
+                        f"WHERE b_a_id {in_ids}", (id_json,))
+            moved = max(cur.rowcount or 0, 0)
+            cur.execute(f"DELETE FROM dbo.bid WHERE b_a_id {in_ids}", (id_json,))
+            try:
+                cur.execute(f"DELETE FROM dbo.proxy_bid WHERE pb_a_id {in_ids}", (id_json,))
+            except Exception:
+                pass  # proxy_bid not created yet
+            cur.execute(f"DELETE FROM dbo.auction WHERE a_id {in_ids}", (id_json,))
+            conn.commit()
+            totals['auctions'] += len(ids)
+            totals['bids'] += moved
+            totals['batches'] += 1
+    finally:
+        try:
+            conn.close()
+        except Exception:
+            pass
+    return totals
+
+
+MAINTENANCE_KEEP_RUNS = 100
+_MAINTENANCE_RUN_DDL = (
+    "IF OBJECT_ID('dbo.maintenance_run') IS NULL "
+    "CREATE TABLE dbo.maintenance_run ("
+    "run_id INT IDENTITY(1,1) PRIMARY KEY, started_at DATETIME2 NOT NULL DEFAULT SYSUTCDATETIME(), "
+    "finished_at DATETIME2 NULL, stats NVARCHAR(MAX) NULL)"
+)
+
+
+def _last_maintenance_run(cur):
+    """Newest finished dbo.maintenance_run as {started_at, finished_at, **stats}, or None."""
+    cur.execute("IF OBJECT_ID('dbo.maintenance_run') IS NOT NULL "
+                "SELECT TOP 1 started_at, finished_at, stats FROM dbo.maintenance_run "
+                "WHERE finished_at IS NOT NULL ORDER BY run_id DESC")
+    row = cur.fetchone() if cur.description else None
+    if not row:
+        return None
+    return {'started_at': row[0], 'finished_at': row[1], **json.loads(row[2] or '{}')}
+
+
+def _claim_maintenance(conn, min_interval_s):
+    """Record a run start in dbo.maintenance_run; with `min_interval_s`, return None if any
+    worker started one within that window. TABLOCKX makes concurrent claims take turns."""
+    cur = conn.cursor()
+    cur.execute(_MAINTENANCE_RUN_DDL)
+    conn.commit()
+    cur.execute("SELECT TOP 1 1 FROM dbo.maintenance_run WITH (TABLOCKX, HOLDLOCK) "
+                "WHERE started_at > DATEADD(second, ?, SYSUTCDATETIME())", (-int(min_interval_s or 0),))
+    if cur.fetchone() and min_interval_s:
+        conn.rollback()
+        return None
+    cur.execute("INSERT INTO dbo.maintenance_run OUTPUT INSERTED.run_id DEFAULT VALUES")
+    run_id = cur.fetchone()[0]
+    cur.execute("DELETE FROM dbo.maintenance_run WHERE run_id <= ?", (run_id - MAINTENANCE_KEEP_RUNS,))
+    conn.commit()
+    return run_id
+
+
+def maintenance_stats():
+    """Space and index health for the app's tables, in the shape of `db.maintenance_stats`.
+
+    Pages are 8 KB; `free_ratio` is reserved-but-unused space, and
+    `fragmentation` the worst logical fragmentation among the bid / auction indexes.
+    """
+    if pyodbc is None:
+        raise RuntimeError('pyodbc is not installed')
+    conn = get_connection()
+    cur = conn.cursor()
+    try:
+        cur.execute("SELECT SUM(reserved_page_count), SUM(used_page_count) FROM sys.dm_db_partition_stats")
+        reserved, used = (int(v or 0) for v in cur.fetchone())
+        cur.execute(
+            "SELECT MAX(avg_fragmentation_in_percent) FROM sys.dm_db_index_physical_stats"
+            "(DB_ID(), NULL, NULL, NULL, 'LIMITED') WHERE object_id IN (OBJECT_ID('dbo.bid'), OBJECT_ID('dbo.auction')) "
+            "AND page_count > 100"
+        )
+        worst = cur.fetchone()[0]
+        last_run = _last_maintenance_run(cur)
+    finally:
+        try:
+            conn.close()
+        except Exception:
+            pass
+    return {
+        'page_size': 8192,
+        'page_count': reserved,
+        'freelist_count': reserved - used,
+        'free_ratio': round((reserved - used) / reserved, 4) if reserved else 0.0,
+        'file_bytes': reserved * 8192,
+        'fragmentation': round(float(worst or 0) / 100, 4),
+        'auto_vacuum': 'n/a',
+        'journal_mode': 'n/a',
+        'last_run': last_run,
+    }
+
+
+def connection_stats(reset_peaks=False):
+    """Always None: SQL Server does its own reader/writer scheduling, so connections are not split here."""
+    return None
+
+
+def run_maintenance(vacuum_pages=None, analyze=False, convert=False, min_interval_s=None):
+    """Refresh statistics; same contract as `db.run_maintenance`.
+
+    Runs sp_updatestats, or UPDATE STATISTICS ... WITH FULLSCAN on the bid and
+    auction tables with `analyze=True`. SQL Server reuses free pages itself, so
+    `vacuum_pages` and `convert` do not apply; index rebuilds are left to the
+    DBA's maintenance plan. Runs are recorded in dbo.maintenance_run, so
+    `min_interval_s` holds across workers and hosts, as on SQLite.
+    """
+    if pyodbc is None:
+        raise RuntimeError('pyodbc is not installed')
+    conn = get_connection()
+    try:
+        run_id = _claim_maintenance(conn, min_interval_s)
+    except Exception:
+        conn.close()
+        raise
+    if run_id is None:
+        conn.close()
+        return None
+    before = maintenance_stats()
+    steps = {}
+    cur = conn.cursor()
+    try:
+        t0 = time.perf_counter()
+        if analyze:
+            for table in ('dbo.auction', 'dbo.bid'):
+                cur.execute(f"UPDATE STATISTICS {table} WITH FULLSCAN")
+        else:
+            cur.execute("EXEC sp_updatestats")
+        conn.commit()
+        steps['analyze' if analyze else 'optimize'] = round((time.perf_counter() - t0) * 1000, 1)
+        after = maintenance_stats()
+        result = {'before': before, 'after': after, 'steps_ms': steps,
+                  'reclaimed_pages': before['page_count'] - after['page_count']}
+        summary = {'steps_ms': steps, 'reclaimed_pages': result['reclaimed_pages']}
+        cur.execute("UPDATE dbo.maintenance_run SET finished_at = SYSUTCDATETIME(), stats = ? WHERE run_id = ?",
+                    (json.dumps(summary), run_id))
+        conn.commit()
+        return result
+    finally:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+_BID_STATS_SQL = """
+    UPDATE a SET
+        bid_count = ISNULL(s.cnt, 0),
+        high_bidder_id = s.top_bidder,
+        last_bid_at = s.last_bid
+    FROM dbo.auction a
+    OUTER APPLY (
+        SELECT COUNT(*) AS cnt, MAX(b.b_time) AS last_bid,
+               (SELECT TOP 1 b2.b_m_id FROM dbo.bid b2 WHERE b2.b_a_id = a.a_id
+                ORDER BY b2.b_amount DESC, b2.b_id) AS top_bidder
+        FROM dbo.bid b WHERE b.b_a_id = a.a_id
+    ) s
+"""
+
+
+def ensure_bid_stats_columns():
+    """Add bid_count / high_bidder_id / last_bid_at to dbo.auction when missing.
+
+    Also creates IX_bid_auction_amount, which serves the highest-bid lookups,
+    IX_bid_auction_time for the bid history, and the dbo.proxy_bid table
+    behind proxy bidding.
+    Returns True if any column was added (a refresh is then needed).
+    """
+    if pyodbc is None:
+        raise RuntimeError('pyodbc is not installed')
+    conn = get_connection()
+    cur = conn.cursor()
+    added = False
+    try:
+        cur.execute("SELECT COLUMN_NAME FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_SCHEMA='dbo' AND TABLE_NAME='auction'")
+        cols = {r[0].lower() for r in cur.fetchall()}
+        for name, ddl in (('bid_count', 'INT NOT NULL CONSTRAINT DF_auction_bid_count DEFAULT 0'),
+                          ('high_bidder_id', 'INT NULL'),
+                          ('last_bid_at', 'DATETIME2 NULL')):
+            if name not in cols:
+                cur.execute(f"ALTER TABLE dbo.auction ADD {name} {ddl}")
+                added = True
+        cur.execute(
+            "IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_bid_auction_amount' "
+            "AND object_id = OBJECT_ID('dbo.bid')) "
+            "CREATE INDEX IX_bid_auction_amount ON dbo.bid (b_a_id, b_amount DESC) INCLUDE (b_m_id, b_time)"
+        )
+        cur.execute(
+            "IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_bid_auction_time' "
+            "AND object_id = OBJECT_ID('dbo.bid')) "
+            "CREATE INDEX IX_bid_auction_time ON dbo.bid (b_a_id, b_time DESC, b_id DESC) INCLUDE (b_m_id, b_amount)"
+        )
+        cur.execute(
+            "IF OBJECT_ID('dbo.proxy_bid') IS NULL "
+            "CREATE TABLE dbo.proxy_bid ("
+            "pb_id INT IDENTITY(1,1) PRIMARY KEY, pb_a_id INT NOT NULL, pb_m_id INT NOT NULL, "
+            "pb_max DECIMAL(12, 2) NOT NULL, pb_time DATETIME2 NOT NULL DEFAULT SYSUTCDATETIME(), "
+            "CONSTRAINT UQ_proxy_bid_auction_member UNIQUE (pb_a_id, pb_m_id))"
+        )
+        cur.execute(
+            "IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_proxy_bid_rank' "
+            "AND object_id = OBJECT_ID('dbo.proxy_bid')) "
+            "CREATE INDEX IX_proxy_bid_rank ON dbo.proxy_bid (pb_a_id, pb_max DESC, pb_id)"
+        )
+        conn.commit()
+    finally:
+        try:
+            conn.close()
+        except Exception:
+            pass
+    return added
+
+
+def refresh_bid_stats(auction_ids=None):
+    """Recompute the denormalized bid statistics from dbo.bid; returns rows updated."""
+    if pyodbc is None:
+        raise RuntimeError('pyodbc is not installed')
+    conn = get_connection()
+    cur = conn.cursor()
+    try:
+        if auction_ids is None:
+            cur.execute(_BID_STATS_SQL)
+        else:
+            cur.execute(_BID_STATS_SQL + " WHERE a.a_id IN (SELECT CAST([value] AS INT) FROM OPENJSON(?))",
+                        (json.dumps([int(a) for a in auction_ids]),))
+        updated = max(cur.rowcount or 0, 0)
+        conn.commit()
+        return updated
+    finally:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+def check_bid_stats(limit=None):
+    """Return auctions whose stored bid statistics disagree with dbo.bid."""
+    if pyodbc is None:
+        raise RuntimeError('pyodbc is not installed')
+    conn = get_connection()
+    cur = conn.cursor()
+    try:
+        top = f"TOP {int(limit)} " if limit else ""
+        cur.execute(
+            f"SELECT {top}a.a_id, a.bid_count, a.high_bidder_id, a.last_bid_at, "
+            "ISNULL(s.cnt, 0) AS expected_bid_count, s.top_bidder AS expected_high_bidder_id, "
+            "s.last_bid AS expected_last_bid_at "
+            "FROM dbo.auction a OUTER APPLY ("
+            "  SELECT COUNT(*) AS cnt, MAX(b.b_time) AS last_bid,"
+            "         (SELECT TOP 1 b2.b_m_id FROM dbo.bid b2 WHERE b2.b_a_id = a.a_id"
+            "          ORDER BY b2.b_amount DESC, b2.b_id) AS top_bidder"
+            "  FROM dbo.bid b WHERE b.b_a_id = a.a_id) s "
+            "WHERE ISNULL(a.bid_count, 0) <> ISNULL(s.cnt, 0) "
+            "   OR ISNULL(a.high_bidder_id, -1) <> ISNULL(s.top_bidder, -1) "
+            "   OR ISNULL(a.last_bid_at, '19000101') <> ISNULL(s.last_bid, '19000101') "
+            "ORDER BY a.a_id"
+        )
+        return [_row_to_dict(cur, r) for r in cur.fetchall()]
+    finally:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
 def create_item(title, description=None, owner_id=None, category=None, sub_category=None, image_path=None):
     """Insert an item into dbo.item using common column names. Returns new item_id or None."""
     if pyodbc is None:
@@ -1754,11 +2625,12 @@ def update_auction_housekeeping(a_id, action, params=None):
 
         now = datetime.utcnow()
 
-        # Helper to run an update safely when column exists
-        def _update_col(col, value):
+        # Helper to run an update safely when column exists; keep_existing only fills a NULL column
+        def _update_col(col, value, keep_existing=False):
             nonlocal updated
+            assignment = f"COALESCE({col}, ?)" if keep_existing else "?"
             try:
-                cur.execute(f"UPDATE dbo.auction SET {col} = ? WHERE a_id = ?", (value, a_id))
+                cur.execute(f"UPDATE dbo.auction SET {col} = {assignment} WHERE a_id = ?", (value, a_id))
                 updated = (cur.rowcount or 0) or updated
                 conn.commit()
             except Exception:
@@ -1768,9 +2640,9 @@ def update_auction_housekeeping(a_id, action, params=None):
                     pass
 
         if action == 'close':
-            # set end date to now and optionally set status to closed
+            # end now unless an end date is already set (as db.py does), and set status to closed
             if end_col:
-                _update_col(end_col, now)
+                _update_col(end_col, now, keep_existing=True)
             if status_col:
                 _update_col(status_col, 'closed')
 
@@ -1826,11 +2698,11 @@ def update_auction_housekeeping(a_id, action, params=None):
                 _update_col(end_col, new_end)
 
         elif action == 'cancel':
-            # mark as cancelled and set end date to now
+            # mark as cancelled; end now unless an end date is already set
             if status_col:
                 _update_col(status_col, 'cancelled')
             if end_col:
-                _update_col(end_col, now)
+                _update_col(end_col, now, keep_existing=True)
 
         elif action == 'set_status':
             st = params.get('status')
@@ -1845,6 +2717,137 @@ def update_auction_housekeeping(a_id, action, params=None):
     return (updated is None) or (updated > 0)
 
 
+HOUSEKEEPING_ACTIONS = ('close', 'reopen', 'set_end_date', 'extend_days', 'cancel', 'set_status')
+
+
+def bulk_auction_housekeeping(operations):
+    """Apply housekeeping actions to many auctions in one transaction.
+
+    Same contract as `db.bulk_auction_housekeeping`: each operation is one
+    set-based UPDATE selected by `ids` and/or `status` / `ending_before`, and
+    the result maps each action to the number of rows updated. Id lists are
+    passed as a single JSON parameter and expanded with OPENJSON.
+    """
+    if pyodbc is None:
+        raise RuntimeError('pyodbc is not installed')
+    conn = get_connection()
+    cur = conn.cursor()
+    counts = {}
+    try:
+        cur.execute("SELECT COLUMN_NAME FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_SCHEMA='dbo' AND TABLE_NAME='auction'")
+        cols = {r[0].lower() for r in cur.fetchall()}
+        end_col = next((c for c in ('a_e_date', 'end_date', 'a_end', 'a_e') if c in cols), None)
+        status_col = next((c for c in ('a_status', 'status', 'state') if c in cols), None)
+        now = datetime.utcnow()
+        for op in operations:
+            action = op.get('action')
+            clauses, params = [], []
+            if op.get('ids') is not None:
+                clauses.append('a_id IN (SELECT CAST([value] AS INT) FROM OPENJSON(?))')
+                params.append(json.dumps([int(i) for i in op['ids']]))
+            if op.get('status') and status_col:
+                clauses.append(f'{status_col} = ?')
+                params.append(op['status'])
+            ending_before = op.get('ending_before')
+            if isinstance(ending_before, str) and ending_before:
+                ending_before = datetime.fromisoformat(ending_before)
+            if ending_before and end_col:
+                clauses.append(f'{end_col} < ?')
+                params.append(ending_before)
+            if not clauses:
+                raise ValueError('bulk housekeeping needs ids or a filter (status, ending_before)')
+
+            sets, values = [], []
+            if action in ('close', 'cancel'):
+                if status_col:
+                    sets.append(f'{status_col} = ?')
+                    values.append('closed' if action == 'close' else 'cancelled')
+                if end_col:
+                    sets.append(f'{end_col} = COALESCE({end_col}, ?)')
+                    values.append(now)
+            elif action == 'reopen':
+                if status_col:
+                    sets.append(f"{status_col} = 'open'")
+                if end_col:
+                    sets.append(f'{end_col} = NULL')
+            elif action == 'set_end_date':
+                ed = op.get('end_date')
+                if isinstance(ed, str) and ed:
+                    ed = datetime.fromisoformat(ed)
+                if not ed:
+                    raise ValueError('set_end_date needs end_date')
+                if end_col:
+                    sets.append(f'{end_col} = ?')
+                    values.append(ed)
+            elif action == 'extend_days':
+                days = int(op.get('days') or 0)
+                if days <= 0:
+                    raise ValueError('extend_days needs a positive number of days')
+                if end_col:
+                    sets.append(f'{end_col} = DATEADD(day, ?, COALESCE({end_col}, a_s_date))')
+                    values.append(days)
+            elif action == 'set_status':
+                if status_col:
+                    sets.append(f'{status_col} = ?')
+                    values.append(op.get('new_status') or 'open')
+            else:
+                raise ValueError(f'unknown housekeeping action: {action!r}')
+            if not sets:
+                counts.setdefault(action, 0)
+                continue
+            cur.execute('UPDATE dbo.auction SET ' + ', '.join(sets) + ' WHERE ' + ' AND '.join(clauses),
+                        values + params)
+            counts[action] = counts.get(action, 0) + max(cur.rowcount or 0, 0)
+        conn.commit()
+    except Exception:
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+        raise
+    finally:
+        try:
+            conn.close()
+        except Exception:
+            pass
+    return counts
+
+
+CLOSE_EXPIRED_BATCH_SIZE = int(os.getenv('CLOSE_EXPIRED_BATCH_SIZE', '500'))
+
+
+def close_expired_auctions(batch_size=None):
+    """Mark open auctions past their end date as 'closed'; same contract as `db.close_expired_auctions`.
+
+    Returns 0 when dbo.auction has no a_status column (the rankings then
+    filter on the end date alone). Each batch commits on its own.
+    """
+    if pyodbc is None:
+        raise RuntimeError('pyodbc is not installed')
+    batch_size = max(1, int(batch_size or CLOSE_EXPIRED_BATCH_SIZE))
+    closed = 0
+    conn = get_connection()
+    cur = conn.cursor()
+    try:
+        cur.execute("SELECT COLUMN_NAME FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_SCHEMA='dbo' AND TABLE_NAME='auction'")
+        if 'a_status' not in {r[0].lower() for r in cur.fetchall()}:
+            return 0
+        while True:
+            cur.execute("UPDATE TOP (?) dbo.auction SET a_status = 'closed' "
+                        "WHERE a_status = 'open' AND a_e_date <= GETUTCDATE()", (batch_size,))
+            n = max(cur.rowcount or 0, 0)
+            conn.commit()
+            closed += n
+            if n < batch_size:
+                break
+    finally:
+        try:
+            conn.close()
+        except Exception:
+            pass
+    return closed
+
+
 def add_item_image(item_id, image_url, thumb_url=None, sort_order=0):
     """Insert a row into dbo.item_image mapping an item to an image.
 
@@ -0,0 +1,51 @@
+"""gunicorn settings, picked up automatically from the working directory.
+
+Worker profile (GUNICORN_WORKER_CLASS):
+
+    gthread (default)  WEB_CONCURRENCY processes x GUNICORN_THREADS threads, so a
+                       slow SMTP send or SQL Server connect ties up one thread,
+                       not a whole worker; processes default to CPUs + 1
+    sync               one request per process; processes default to 2 x CPUs + 1
+
+`preload_app` imports `app` once in the master: the data backend is resolved
+and every template compiled before workers fork. The master never opens a
+database connection. `post_fork` drops data-layer state a worker must not
+inherit, `post_worker_init` primes its caches (`app.warm_up`) and starts its
+maintenance scheduler (`maintenance.py`), and workers are
+recycled after GUNICORN_MAX_REQUESTS (+ up to GUNICORN_MAX_REQUESTS_JITTER)
+requests so restarts are staggered.
+"""
+
+import multiprocessing
+import os
+
+_cpus = multiprocessing.cpu_count()
+
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+if worker_class == 'gthread':
+    threads = int(os.getenv('GUNICORN_THREADS', '4'))
+    workers = int(os.getenv('WEB_CONCURRENCY') or _cpus + 1)
+else:
+    workers = int(os.getenv('WEB_CONCURRENCY') or 2 * _cpus + 1)
+
+preload_app = True
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '1000'))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', '100'))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '30'))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', '5'))
+
+
+def post_fork(server, worker):
+    from app import store
+    if store is not None:
+        store.reset_after_fork()
+
+
+def post_worker_init(worker):
+    if os.getenv('WARMUP', '1').lower() in ('1', 'true', 'yes'):
+        from app import warm_up
+        worker.log.info('Worker %s warmed up in %.0fms', worker.pid, warm_up())
+    import maintenance
+    from app import store
+    maintenance.start(store)
@@ -0,0 +1,105 @@
+"""In-process scheduler for data-layer maintenance.
+
+Each worker starts one after it forks (gunicorn `post_worker_init`, or the
+reloader child of `python app.py`). Every MAINTENANCE_INTERVAL_S seconds it
+calls `store.run_maintenance(min_interval_s=...)`; both backends record runs
+in a `maintenance_run` table, so only one worker per interval actually does
+the work. Set
+MAINTENANCE_INTERVAL_S=0 to leave maintenance to `tools/db_maintenance.py`.
+
+A `close-expired` job calls `store.close_expired_auctions()` every
+CLOSE_EXPIRED_INTERVAL_S seconds (0 disables it), so auctions past their
+end date leave the 'open' range the ranking indexes scan. Closing is
+idempotent, so every worker may run it.
+
+With BACKUP_INTERVAL_S > 0 the SQLite backend also gets a backup job
+(`backup.scheduled_snapshot`); a lock file and the newest snapshot's age keep
+it to one snapshot per interval across workers.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import random
+import threading
+from typing import Any, Callable, Dict, Optional
+
+MAINTENANCE_INTERVAL_S = float(os.getenv('MAINTENANCE_INTERVAL_S', '3600'))
+CLOSE_EXPIRED_INTERVAL_S = float(os.getenv('CLOSE_EXPIRED_INTERVAL_S', '60'))
+
+logger = logging.getLogger('auth')
+
+
+class PeriodicJob:
+    """Daemon thread calling `fn()` every `interval_s` seconds; `runs` counts calls that returned a result."""
+
+    def __init__(self, name: str, fn: Callable[[], Any], interval_s: float):
+        self.name = name
+        self.fn = fn
+        self.interval_s = interval_s
+        self.runs = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> 'PeriodicJob':
+        self._thread = threading.Thread(target=self._loop, name=self.name, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _loop(self) -> None:
+        # Spread the first tick so freshly forked workers do not all race for the same run.
+        delay = self.interval_s * random.uniform(0.1, 1.0)
+        while not self._stop.wait(delay):
+            try:
+                if self.fn() is not None:
+                    self.runs += 1
+            except Exception:
+                logger.exception('%s failed', self.name)
+            delay = self.interval_s
+
+
+class MaintenanceScheduler(PeriodicJob):
+    """Calls `store.run_maintenance` every `interval_s` seconds."""
+
+    def __init__(self, store, interval_s: float = MAINTENANCE_INTERVAL_S):
+        super().__init__('db-maintenance', self.run_once, interval_s)
+        self.store = store
+
+    def run_once(self) -> Optional[dict]:
+        # A little under the interval, so timer drift between workers never skips a whole period.
+        result = self.store.run_maintenance(min_interval_s=self.interval_s * 0.9)
+        if result is not None:
+            logger.info('DB maintenance: %s, reclaimed %d page(s), free ratio %.3f',
+                        result['steps_ms'], result['reclaimed_pages'], result['after']['free_ratio'])
+        return result
+
+
+_jobs: Dict[str, PeriodicJob] = {}
+
+
+def start(store, interval_s: Optional[float] = None) -> Optional[MaintenanceScheduler]:
+    """Start this process's jobs (once); returns the maintenance scheduler, None when disabled or in demo mode."""
+    import backup
+
+    interval = MAINTENANCE_INTERVAL_S if interval_s is None else interval_s
+    if store is None:
+        return None
+    if interval > 0 and 'db-maintenance' not in _jobs:
+        _jobs['db-maintenance'] = MaintenanceScheduler(store, interval).start()
+    if CLOSE_EXPIRED_INTERVAL_S > 0 and 'close-expired' not in _jobs:
+        _jobs['close-expired'] = PeriodicJob('close-expired', store.close_expired_auctions,
+                                             CLOSE_EXPIRED_INTERVAL_S).start()
+    if backup.BACKUP_INTERVAL_S > 0 and getattr(store, 'DB_PATH', None) is not None and 'db-backup' not in _jobs:
+        _jobs['db-backup'] = PeriodicJob('db-backup', backup.scheduled_snapshot, backup.BACKUP_INTERVAL_S).start()
+    return _jobs.get('db-maintenance')
+
+
+def stop() -> None:
+    while _jobs:
+        _jobs.popitem()[1].stop()
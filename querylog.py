@@ -0,0 +1,236 @@
+"""Query tracing and slow-query log.
+
+Connections handed out by `db.get_connection()` (and the SQL Server helpers)
+time every statement. Statements slower than ``SLOW_QUERY_MS`` are logged with
+their bound-parameter shape, call site and query plan, and aggregated by
+fingerprint into a bounded in-memory table shown on the admin panel.
+
+The table is per process: with several gunicorn workers each keeps its own.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import traceback
+from typing import Any, Callable, List, Optional
+
+SLOW_QUERY_MS = float(os.getenv('SLOW_QUERY_MS', '100'))
+SLOW_QUERY_TOP_N = int(os.getenv('SLOW_QUERY_TOP_N', '20'))
+
+logger = logging.getLogger('slow_query')
+
+_lock = threading.Lock()
+_slowest: dict = {}  # fingerprint -> aggregated stats
+
+_THIS_FILE = os.path.basename(__file__)
+_DATA_LAYER_FILES = ('db.py', 'db_sqlserver.py', _THIS_FILE)
+_EXPLAINABLE = ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'WITH', 'REPLACE')
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def fingerprint(sql: str) -> str:
+    """Normalize a statement so queries differing only in literals group together."""
+    text = _STRING_RE.sub('?', sql or '')
+    text = _NUMBER_RE.sub('?', text)
+    text = _IN_LIST_RE.sub('(?+)', text)
+    return _SPACE_RE.sub(' ', text).strip()
+
+
+def param_shape(params: Any) -> str:
+    """Describe bound parameters by type only, so values never reach the log."""
+    if params is None:
+        return '()'
+    if isinstance(params, dict):
+        return '{' + ', '.join(f"{k}: {type(v).__name__}" for k, v in params.items()) + '}'
+    if isinstance(params, (list, tuple)):
+        return '(' + ', '.join(type(v).__name__ for v in params) + ')'
+    return type(params).__name__
+
+
+def call_site() -> str:
+    """Return the data-layer function and its caller, e.g. `db.py:160 get_auctions <- app.py:261 index`."""
+    frames = traceback.extract_stack()[:-1]
+    outer = None
+    inner = None
+    for frame in reversed(frames):
+        name = os.path.basename(frame.filename)
+        if name == _THIS_FILE:
+            continue
+        if inner is None:
+            inner = frame
+            if name not in _DATA_LAYER_FILES:
+                break
+            continue
+        if name not in _DATA_LAYER_FILES:
+            outer = frame
+            break
+    parts = [f"{os.path.basename(f.filename)}:{f.lineno} {f.name}" for f in (inner, outer) if f is not None]
+    return ' <- '.join(parts) or 'unknown'
+
+
+def sqlite_explain(conn: sqlite3.Connection, sql: str, params: Any) -> Optional[str]:
+    """Return the `EXPLAIN QUERY PLAN` output for a statement as indented text."""
+    if not sql.lstrip().upper().startswith(_EXPLAINABLE):
+        return None
+    rows = sqlite3.Connection.execute(conn, 'EXPLAIN QUERY PLAN ' + sql, params or ()).fetchall()
+    depth = {0: -1}
+    lines = []
+    for node_id, parent, _unused, detail in rows:
+        level = depth.get(parent, -1) + 1
+        depth[node_id] = level
+        lines.append('  ' * level + str(detail))
+    return '\n'.join(lines)
+
+
+def record(sql: str, params: Any, elapsed_ms: float,
+           explain: Optional[Callable[[], Optional[str]]] = None, error: Optional[str] = None) -> None:
+    """Record a finished statement; anything under the threshold is ignored."""
+    if elapsed_ms < SLOW_QUERY_MS:
+        return
+    plan = None
+    if explain is not None and error is None:
+        try:
+            plan = explain()
+        except Exception as e:
+            plan = f"(plan unavailable: {e})"
+    key = fingerprint(sql)
+    shape = param_shape(params)
+    site = call_site()
+    logger.warning('Slow query %.1fms at %s params=%s%s: %s%s', elapsed_ms, site, shape,
+                   f" error={error}" if error else '', key, f"\n{plan}" if plan else '')
+    with _lock:
+        entry = _slowest.get(key)
+        if entry is None:
+            if len(_slowest) >= SLOW_QUERY_TOP_N:
+                fastest = min(_slowest, key=lambda k: _slowest[k]['max_ms'])
+                if _slowest[fastest]['max_ms'] >= elapsed_ms:
+                    return
+                _slowest.pop(fastest)
+            entry = _slowest[key] = {'fingerprint': key, 'count': 0, 'total_ms': 0.0, 'max_ms': 0.0}
+        entry['count'] += 1
+        entry['total_ms'] += elapsed_ms
+        entry['last_ms'] = elapsed_ms
+        entry['params'] = shape
+        entry['call_site'] = site
+        entry['last_seen'] = time.time()
+        if plan:
+            entry['plan'] = plan
+        if elapsed_ms >= entry['max_ms']:
+            entry['max_ms'] = elapsed_ms
+            entry['max_call_site'] = site
+
+
+def top_queries(limit: Optional[int] = None) -> List[dict]:
+    """Return the slowest query fingerprints seen by this process, slowest first."""
+    with _lock:
+        entries = [dict(e, avg_ms=e['total_ms'] / e['count']) for e in _slowest.values()]
+    entries.sort(key=lambda e: e['max_ms'], reverse=True)
+    return entries[:limit] if limit else entries
+
+
+def reset() -> None:
+    with _lock:
+        _slowest.clear()
+
+
+class TracedCursor(sqlite3.Cursor):
+    def execute(self, sql, parameters=()):
+        start = time.perf_counter()
+        error = None
+        try:
+            return super().execute(sql, parameters)
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            conn = self.connection
+            record(sql, parameters, elapsed, lambda: sqlite_explain(conn, sql, parameters), error)
+
+    def executemany(self, sql, seq_of_parameters):
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            record(sql, 'executemany', (time.perf_counter() - start) * 1000)
+
+
+class TracedConnection(sqlite3.Connection):
+    """sqlite3 connection whose cursors (and shortcut `execute`) are timed."""
+
+    def cursor(self, factory=TracedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+class TracedDBAPICursor:
+    """Timing proxy for DB-API cursors that cannot be subclassed (pyodbc)."""
+
+    def __init__(self, cursor, explain: Optional[Callable[[str, Any], Optional[str]]] = None):
+        self._cursor = cursor
+        self._explain = explain
+
+    def execute(self, sql, *params):
+        bound = params[0] if len(params) == 1 and isinstance(params[0], (list, tuple)) else params
+        start = time.perf_counter()
+        error = None
+        try:
+            result = self._cursor.execute(sql, *params)
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            explain = (lambda: self._explain(sql, bound)) if self._explain else None
+            record(sql, bound, (time.perf_counter() - start) * 1000, explain, error)
+        return self if result is self._cursor else result
+
+    def executemany(self, sql, seq_of_parameters):
+        start = time.perf_counter()
+        try:
+            return self._cursor.executemany(sql, seq_of_parameters)
+        finally:
+            record(sql, 'executemany', (time.perf_counter() - start) * 1000)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name, value):
+        # Driver switches such as `fast_executemany` must reach the real cursor.
+        if name.startswith('_'):
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._cursor, name, value)
+
+
+class TracedDBAPIConnection:
+    """Timing proxy for DB-API connections; `cursor()` returns traced cursors."""
+
+    def __init__(self, conn, explain: Optional[Callable[[Any, str, Any], Optional[str]]] = None):
+        self._conn = conn
+        self._explain = explain
+
+    def cursor(self, *args, **kwargs):
+        explain = None
+        if self._explain is not None:
+            explain = lambda sql, params: self._explain(self._conn, sql, params)  # noqa: E731
+        return TracedDBAPICursor(self._conn.cursor(*args, **kwargs), explain)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
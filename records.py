@@ -0,0 +1,162 @@
+"""Slotted row records returned by the SQLite data layer.
+
+One small object per row instead of a `sqlite3.Row` plus one or two dicts.
+Code reads attributes (`auction.title`); templates, the JSON API and older
+callers keep using the mapping interface (`auction['title']`,
+`auction.get('title')`, `dict(auction)`), and records compare equal to dicts
+with the same items. Old spellings such as `m_login_id` or `auc_cnt` are
+aliases resolved on lookup, so each value is stored once.
+
+Timestamps are held as integer epoch seconds (UTC), as read from the
+`*_epoch` columns; the datetime-valued keys (`end_time`, `bid_time`, ...)
+convert on access, so only values a page or API response actually shows
+are converted. They are truncated to whole seconds: fractional seconds
+stored in the TIMESTAMP columns do not reach pages or the JSON API.
+"""
+
+from __future__ import annotations
+
+import calendar
+import copy
+from collections.abc import Mapping
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timedelta
+from typing import Any, ClassVar, Dict, FrozenSet, Optional, Tuple
+
+_KEYS: Dict[type, Tuple[Tuple[str, ...], FrozenSet[str]]] = {}
+_EPOCH = datetime(1970, 1, 1)
+
+
+def to_epoch(value: datetime) -> int:
+    """Datetime (naive means UTC) -> epoch seconds, as stored in the `*_epoch` columns."""
+    return calendar.timegm(value.utctimetuple())
+
+
+def from_epoch(value: Optional[int]) -> Optional[datetime]:
+    """Epoch seconds -> naive UTC datetime (None stays None)."""
+    return None if value is None else _EPOCH + timedelta(seconds=value)
+
+
+class Record(Mapping):
+    """Read-mostly mapping view over a slotted dataclass; `rec[key] = v` sets an existing field."""
+
+    __slots__ = ()
+    _aliases: ClassVar[Dict[str, str]] = {}
+    _computed: ClassVar[Tuple[str, ...]] = ()
+
+    @classmethod
+    def _keys(cls) -> Tuple[Tuple[str, ...], FrozenSet[str]]:
+        keys = _KEYS.get(cls)
+        if keys is None:
+            names = tuple(f.name for f in fields(cls)) + cls._computed + tuple(cls._aliases)
+            keys = _KEYS[cls] = (names, frozenset(names))
+        return keys
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._keys()[1]:
+            raise KeyError(key)
+        return getattr(self, self._aliases.get(key, key))
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        name = self._aliases.get(key, key)
+        if key not in self._keys()[1] or name in self._computed:
+            raise KeyError(key)
+        setattr(self, name, value)
+
+    def __iter__(self):
+        return iter(self._keys()[0])
+
+    def __len__(self) -> int:
+        return len(self._keys()[0])
+
+    def copy(self):
+        return copy.copy(self)
+
+
+@dataclass(slots=True, eq=False)
+class Auction(Record):
+    id: int
+    item_id: Optional[int]
+    title: Optional[str]
+    description: Optional[str]
+    image_url: str
+    current_bid: Optional[str]
+    current_price: Optional[float]
+    starting_price: Optional[float]
+    seller_id: Optional[int]
+    start_ts: Optional[int]
+    end_ts: Optional[int]
+    duration: Optional[int]
+    status: Optional[str]
+    bid_count: int = 0
+    high_bidder_id: Optional[int] = None
+    last_bid_ts: Optional[int] = None
+    version: Optional[str] = None
+    archived: bool = False
+
+    _computed: ClassVar[Tuple[str, ...]] = ('url', 'start_date', 'end_time', 'last_bid_at')
+
+    @property
+    def url(self) -> str:
+        return f"/auction/{self.id}"
+
+    @property
+    def start_date(self) -> Optional[datetime]:
+        return from_epoch(self.start_ts)
+
+    @property
+    def end_time(self) -> Optional[datetime]:
+        return from_epoch(self.end_ts)
+
+    @property
+    def last_bid_at(self) -> Optional[datetime]:
+        return from_epoch(self.last_bid_ts)
+
+
+@dataclass(slots=True, eq=False)
+class RankedAuction(Auction):
+    """Listing-page row: an auction under the names the view_more templates use."""
+
+    _aliases: ClassVar[Dict[str, str]] = {'max_price': 'current_bid', 'end_date': 'end_time', 'auc_cnt': 'bid_count'}
+
+
+@dataclass(slots=True, eq=False)
+class Member(Record):
+    """A member; `password` (the stored hash) and `created_at` are only loaded by single-member lookups."""
+
+    id: int
+    username: str
+    email: Optional[str] = None
+    status: Optional[str] = None
+    is_admin: bool = False
+    role: str = "user"
+    password: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+    _aliases: ClassVar[Dict[str, str]] = {
+        'm_id': 'id', 'm_login_id': 'username', 'm_email': 'email', 'm_status': 'status',
+        'm_is_admin': 'is_admin', 'm_role': 'role', 'm_pass': 'password',
+    }
+
+
+@dataclass(slots=True, eq=False)
+class ItemImage(Record):
+    img_id: int
+    image_url: Optional[str]
+    thumb_url: Optional[str]
+    sort_order: int
+    variants: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass(slots=True, eq=False)
+class Bid(Record):
+    id: int
+    bidder_id: int
+    amount: float
+    bid_ts: Optional[int]
+
+    _computed: ClassVar[Tuple[str, ...]] = ('bid_time',)
+
+    @property
+    def bid_time(self) -> Optional[datetime]:
+        return from_epoch(self.bid_ts)
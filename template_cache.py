@@ -0,0 +1,99 @@
+"""Template-side caching: compiled-template reuse and a `{% cache %}` fragment tag.
+
+Compiled templates are kept in a filesystem bytecode cache shared by every
+worker on the host, and `precompile_templates()` loads all of them at boot so
+the first request a fresh worker serves does not pay for parsing. Fragments:
+
+    {% cache 'browse-card', item.id, item.version %}
+      ... expensive markup ...
+    {% endcache %}
+
+The rendered fragment is stored in a bounded LRU (see `cache.LRUCache`) under
+the tuple of key parts, so it is reused across requests and pages until the
+version changes. If any key part is undefined or None the body is rendered
+uncached, which keeps demo-mode items (no id/version) working unchanged.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import tempfile
+import time
+from typing import Optional
+
+from jinja2 import FileSystemBytecodeCache, TemplateError, nodes
+from jinja2.ext import Extension
+from jinja2.runtime import Undefined
+
+from cache import LRUCache
+
+# Empty string disables the bytecode cache.
+JINJA_BYTECODE_DIR = os.getenv('JINJA_BYTECODE_DIR', os.path.join(tempfile.gettempdir(), 'iom-jinja-bytecode'))
+TEMPLATE_WARMUP = os.getenv('TEMPLATE_WARMUP', '1').lower() in ('1', 'true', 'yes')
+FRAGMENT_CACHE_SIZE = int(os.getenv('FRAGMENT_CACHE_SIZE', '4096'))
+FRAGMENT_CACHE_TTL = float(os.getenv('FRAGMENT_CACHE_TTL', '600'))
+
+fragment_cache = LRUCache('fragment', maxsize=FRAGMENT_CACHE_SIZE, ttl=FRAGMENT_CACHE_TTL)
+
+logger = logging.getLogger('templates')
+
+# Result of the last `precompile_templates()` run in this process.
+warmup_stats: dict = {}
+
+
+def install_bytecode_cache(env, directory: Optional[str] = None) -> Optional[str]:
+    """Point `env` at a shared on-disk bytecode cache; returns the directory used, or None."""
+    directory = JINJA_BYTECODE_DIR if directory is None else directory
+    if not directory:
+        return None
+    try:
+        os.makedirs(directory, exist_ok=True)
+    except OSError as e:
+        logger.warning('Jinja bytecode cache disabled, cannot create %s: %s', directory, e)
+        return None
+    env.bytecode_cache = FileSystemBytecodeCache(directory, pattern='iom-%s.cache')
+    return directory
+
+
+def precompile_templates(env) -> dict:
+    """Load every template the environment can see so later renders skip compilation.
+
+    Templates that fail to compile are logged and skipped; they still raise on
+    first use, exactly as they would without the warm-up.
+    """
+    start = time.perf_counter()
+    loaded, failed = 0, []
+    for name in env.list_templates():
+        try:
+            env.get_template(name)
+            loaded += 1
+        except TemplateError as e:
+            failed.append(name)
+            logger.warning('Template %s failed to precompile: %s', name, e)
+    warmup_stats.update(loaded=loaded, failed=failed, ms=round((time.perf_counter() - start) * 1000, 1))
+    logger.info('Precompiled %d template(s) in %.1fms', loaded, warmup_stats['ms'])
+    return dict(warmup_stats)
+
+
+class FragmentCacheExtension(Extension):
+    tags = {'cache'}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        parts = [parser.parse_expression()]
+        while parser.stream.skip_if('comma'):
+            parts.append(parser.parse_expression())
+        body = parser.parse_statements(('name:endcache',), drop_needle=True)
+        call = self.call_method('_render_cached', [nodes.List(parts)])
+        return nodes.CallBlock(call, [], [], body).set_lineno(lineno)
+
+    def _render_cached(self, parts, caller):
+        if any(p is None or isinstance(p, Undefined) for p in parts):
+            return caller()
+        key = tuple(str(p) for p in parts)
+        html = fragment_cache.get(key)
+        if html is None:
+            html = caller()
+            fragment_cache.set(key, html)
+        return html
@@ -0,0 +1,27 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import db
+
+
+class TempDBTestCase(unittest.TestCase):
+    """TestCase whose `db` module points at a fresh SQLite file, never the repo's iom.db.
+
+    `self.path` is the database file and `self.tmp_dir` its directory. Caches
+    and counters in `db` are reset on both sides of every test, so nothing
+    read from one test's database leaks into the next.
+    """
+
+    def setUp(self):
+        super().setUp()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp_dir = Path(tmp.name)
+        self.path = self.tmp_dir / 'test.db'
+        path_patch = patch.object(db, 'DB_PATH', self.path)
+        path_patch.start()
+        self.addCleanup(path_patch.stop)
+        self.addCleanup(db.reset_after_fork)
+        db.reset_after_fork()
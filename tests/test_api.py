@@ -0,0 +1,69 @@
+import json
+import os
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+os.environ['USE_DB'] = '1'
+
+import app
+import db
+from db_testcase import TempDBTestCase
+
+
+class AuctionApiTests(TempDBTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.store_patch = patch.object(app, 'store', db)
+        self.store_patch.start()
+        db.create_member('ann', 'pw')
+        end = datetime.utcnow() + timedelta(days=2)
+        self.ids = [db.create_item_and_auction(f'Item {n}', 'x', starting_price=1.5, end_date=end)[0]
+                    for n in range(5)]
+        self.client = app.app.test_client()
+
+    def tearDown(self):
+        self.store_patch.stop()
+
+    def test_cursor_pagination_and_field_selection(self):
+        seen, cursor = [], None
+        while True:
+            url = '/api/auctions?limit=2&fields=id,current_bid' + (f'&cursor={cursor}' if cursor else '')
+            body = json.loads(self.client.get(url).data)
+            seen += body['auctions']
+            cursor = body['next_cursor']
+            if cursor is None:
+                break
+        self.assertEqual([a['id'] for a in seen], sorted(self.ids, reverse=True))
+        self.assertEqual(seen[0], {'id': self.ids[-1], 'current_bid': 1.5})
+
+        resp = self.client.get('/api/auctions?fields=id,price')
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn('price', resp.get_json()['error'])
+
+    def test_limit_is_validated_and_capped(self):
+        for bad in ('0', '-3', 'abc'):
+            self.assertEqual(self.client.get(f'/api/auctions?limit={bad}').status_code, 400, bad)
+            self.assertEqual(self.client.get(f'/api/auctions/{self.ids[0]}/bids?limit={bad}').status_code, 400, bad)
+        self.assertEqual(len(self.client.get('/api/auctions?limit=1').get_json()['auctions']), 1)
+        with patch.object(app, 'API_MAX_PAGE_SIZE', 2):
+            self.assertEqual(len(self.client.get('/api/auctions?limit=500').get_json()['auctions']), 2)
+
+    def test_etag_revalidation(self):
+        url = f'/api/auctions/{self.ids[0]}'
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        self.assertNotIn(b' ', first.data.replace(b'Item 0', b''))  # compact separators
+        etag = first.headers['ETag']
+        self.assertEqual(self.client.get(url, headers={'If-None-Match': etag}).status_code, 304)
+
+        self.assertTrue(db.place_bid(self.ids[0], 1, 4.0))
+        changed = self.client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(changed.get_json()['current_bid'], 4.0)
+        self.assertEqual(self.client.get('/api/auctions/999999').status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import os
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+os.environ['USE_DB'] = '1'
+
+import app
+import db
+from db_testcase import TempDBTestCase
+from tools import catalog_io, gen_dataset
+
+
+class ArchiveTests(TempDBTestCase):
+
+    def setUp(self):
+        super().setUp()
+        conn = db.get_connection()
+        conn.executemany("INSERT INTO member(m_login_id, m_pass) VALUES (?, 'x')", [('ann',), ('bob',)])
+        conn.commit()
+        conn.close()
+        now = datetime.utcnow()
+        self.old = [db.create_item_and_auction(f'Old {n}', 'x', starting_price=1.0,
+                                               end_date=now - timedelta(days=100))[0] for n in range(5)]
+        self.recent, _ = db.create_item_and_auction('Recent', 'x', starting_price=1.0, end_date=now - timedelta(days=1))
+        self.live, _ = db.create_item_and_auction('Live', 'x', starting_price=1.0, end_date=now + timedelta(days=1))
+        conn = db.get_connection()
+        conn.executemany("INSERT INTO bid(b_a_id, b_m_id, b_amount) VALUES (?, ?, ?)",
+                         [(a, 1 + n % 2, 2.0 + n) for a in self.old + [self.recent] for n in range(3)])
+        conn.commit()
+        conn.close()
+        db.refresh_bid_stats()
+
+    def _count(self, table):
+        conn = db.get_connection()
+        n = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        conn.close()
+        return n
+
+    def test_batches_move_old_auctions_and_bids(self):
+        before = db.get_auction(self.old[0])  # cached hot copy must be invalidated
+        self.assertFalse(before['archived'])
+
+        totals = db.archive_closed_auctions(older_than_days=30, batch_size=2, max_batches=2)
+        self.assertEqual(totals, {'auctions': 4, 'bids': 12, 'batches': 2})
+        totals = db.archive_closed_auctions(older_than_days=30, batch_size=2)
+        self.assertEqual(totals, {'auctions': 1, 'bids': 3, 'batches': 1})
+        self.assertEqual((self._count('auction'), self._count('auction_archive')), (2, 5))
+        self.assertEqual((self._count('bid'), self._count('bid_archive')), (3, 15))
+
+        archived = db.get_auction(self.old[0])
+        self.assertTrue(archived['archived'])
+        self.assertEqual((archived['title'], archived['bid_count'], archived['high_bidder_id']), ('Old 0', 3, 1))
+        self.assertEqual(db.get_highest_bid(self.old[0], archived=True)['amount'], 4.0)
+        self.assertEqual([b['amount'] for b in db.get_bid_history(self.old[0], archived=True)], [4.0, 3.0, 2.0])
+        self.assertIsNone(db.get_highest_bid(self.old[0]))  # hot auctions never read the archive
+        self.assertFalse(db.place_bid(self.old[0], 2, 50.0))
+        self.assertEqual(db.check_bid_stats(), [])
+
+    def test_old_urls_still_render(self):
+        db.archive_closed_auctions(older_than_days=30)
+        with patch.object(app, 'store', db):
+            resp = app.app.test_client().get(f'/auction/{self.old[1]}')
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn(b'Old 1', resp.data)
+        self.assertIn(b'(archived)', resp.data)
+        self.assertIn(b'4.0 by Bidder', resp.data)  # highest bid read from bid_archive
+        self.assertEqual(db.delete_auction_and_bids(self.old[1]), (1, 3))
+        self.assertIsNone(db.get_auction(self.old[1]))
+
+    def test_import_does_not_reuse_archived_ids(self):
+        db.archive_closed_auctions(older_than_days=30)
+        for aid in (self.recent, self.live):  # leave only archived auctions behind
+            db.delete_auction_and_bids(aid)
+        src = self.tmp_dir / 'new.jsonl'
+        src.write_text('{"title": "Fresh", "description": "x", "starting_price": 1}\n')
+        with patch('sys.stderr'):
+            self.assertEqual(catalog_io.main(['import', str(src)]), 0)
+
+        conn = db.get_connection()
+        fresh = conn.execute("SELECT a_id FROM auction").fetchone()[0]
+        conn.close()
+        self.assertGreater(fresh, self.live)
+        self.assertFalse(db.get_auction(fresh)['archived'])
+        self.assertEqual(db.get_bid_history(fresh), [])
+        self.assertEqual(db.get_auction(self.old[0])['title'], 'Old 0')
+
+    def test_bulk_loader_starts_above_archived_ids(self):
+        db.archive_closed_auctions(older_than_days=30)
+        for aid in (self.recent, self.live):
+            db.delete_auction_and_bids(aid)
+        conn = db.get_connection()
+        try:
+            self.assertEqual(gen_dataset._next_id(conn, 'auction', 'a_id'), self.live + 1)
+            self.assertEqual(gen_dataset._next_id(conn, 'bid', 'b_id'), 19)  # all 18 bids were archived
+        finally:
+            conn.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
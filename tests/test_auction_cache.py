@@ -0,0 +1,80 @@
+import sqlite3
+import unittest
+from unittest.mock import patch
+
+import cache
+import db
+from db_testcase import TempDBTestCase
+
+
+class LRUCacheTests(unittest.TestCase):
+
+    def test_lru_eviction_ttl_and_stats(self):
+        c = cache.LRUCache('test-lru', maxsize=2)
+        c.set('a', 1)
+        c.set('b', 2)
+        self.assertEqual(c.get('a'), 1)
+        c.set('c', 3)  # evicts b, the least recently used
+        self.assertIsNone(c.get('b'))
+        stats = c.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['evictions'], stats['size']), (1, 1, 1, 2))
+
+        with patch('cache.time.monotonic', return_value=1000.0):
+            t = cache.LRUCache('test-ttl', ttl=5)
+            t.set('k', 'v')
+        with patch('cache.time.monotonic', return_value=1006.0):
+            self.assertIsNone(t.get('k'))
+        self.assertEqual(t.stats()['expirations'], 1)
+
+    def test_stale_load_is_not_stored_after_invalidation(self):
+        c = cache.LRUCache('test-version')
+        version = c.version
+        c.invalidate('x')
+        self.assertFalse(c.set('x', 'stale', if_version=version))
+        self.assertNotIn('x', c)
+
+
+class AuctionCacheTests(TempDBTestCase):
+
+    def setUp(self):
+        super().setUp()
+        conn = db.get_connection()
+        conn.execute("INSERT INTO member(m_login_id, m_pass) VALUES ('ann', 'x')")
+        conn.commit()
+        conn.close()
+        self.aid, self.item_id = db.create_item_and_auction('Lamp', 'x', starting_price=1.0)
+        db.poll_change_log(force=True)
+
+    def test_hits_and_write_invalidation(self):
+        hits = db.auction_cache.hits
+        self.assertEqual(db.get_auction(self.aid)['bid_count'], 0)
+        with patch.object(db, '_load_auction', side_effect=AssertionError('should be cached')):
+            db.get_auction(self.aid)['title'] = 'mutated copy'
+            self.assertEqual(db.get_auction(self.aid)['title'], 'Lamp')
+        self.assertEqual(db.auction_cache.hits - hits, 2)
+
+        db.place_bid(self.aid, 1, 5)
+        self.assertEqual(db.get_auction(self.aid)['bid_count'], 1)
+        db.set_item_image(self.item_id, '/static/new.png')
+        self.assertEqual(db.get_auction(self.aid)['image_url'], '/static/new.png')
+        db.update_auction_housekeeping(self.aid, 'close')
+        self.assertEqual(db.get_auction(self.aid)['status'], 'closed')
+        db.delete_auction_and_bids(self.aid)
+        self.assertIsNone(db.get_auction(self.aid))
+
+    def test_other_worker_writes_arrive_through_change_log(self):
+        db.get_auction(self.aid)
+        # Simulate another process: write directly and publish to change_log.
+        conn = sqlite3.connect(self.path)
+        conn.execute("UPDATE auction SET a_status = 'cancelled' WHERE a_id = ?", (self.aid,))
+        conn.execute("INSERT INTO change_log(entity, entity_id) VALUES ('auction', ?)", (self.aid,))
+        conn.commit()
+        conn.close()
+        with patch.object(db, 'CHANGE_LOG_POLL_S', 3600):
+            self.assertEqual(db.get_auction(self.aid)['status'], 'open')  # still cached until the next poll
+        self.assertEqual(db.poll_change_log(force=True), 1)
+        self.assertEqual(db.get_auction(self.aid)['status'], 'cancelled')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import inspect
+import tempfile
+import types
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import backend
+import db
+import db_sqlserver
+
+
+class BackendRegistryTests(unittest.TestCase):
+
+    def test_both_modules_implement_the_interface(self):
+        self.assertEqual(backend.missing_functions(db), [])
+        self.assertEqual(backend.missing_functions(db_sqlserver), [])
+
+    def test_create_item_and_auction_keeps_positional_order(self):
+        # category / sub_category came later; positional callers must still reach duration / status.
+        for fn in (db.create_item_and_auction, backend.DataBackend.create_item_and_auction):
+            params = inspect.signature(fn).parameters
+            self.assertEqual(params['category'].kind, inspect.Parameter.KEYWORD_ONLY, fn)
+        with tempfile.TemporaryDirectory() as tmp, patch.object(db, 'DB_PATH', Path(tmp) / 'order.db'):
+            _, item_id = db.create_item_and_auction('Lamp', 'x', None, 1.0, None, 3, 'A', category=2)
+            conn = db.get_connection()
+            row = conn.execute("SELECT i_duration, i_status, i_cat FROM item WHERE i_id = ?", (item_id,)).fetchone()
+            conn.close()
+        self.assertEqual(tuple(row), (3, 'A', '2'))  # i_cat is a TEXT column
+
+    def test_configuration_selects_backend_once(self):
+        with patch.dict('os.environ', {'DB_BACKEND': 'sqlserver', 'USE_DB': ''}):
+            self.assertIs(backend.load(), db_sqlserver)
+        with patch.dict('os.environ', {'DB_BACKEND': '', 'USE_DB': '1'}):
+            self.assertIs(backend.load(), db)
+        with patch.dict('os.environ', {'DB_BACKEND': '', 'USE_DB': ''}):
+            self.assertIsNone(backend.load())
+
+    def test_unknown_or_incomplete_backend_is_rejected(self):
+        with self.assertRaises(ValueError):
+            backend.load('oracle')
+        partial = types.ModuleType('partial_backend')
+        partial.get_auctions = lambda limit=50: []
+        with patch.dict(backend.BACKENDS, {'partial': 'partial_backend'}), \
+                patch.dict('sys.modules', {'partial_backend': partial}):
+            with self.assertRaises(RuntimeError) as ctx:
+                backend.load('partial')
+        self.assertIn('place_bid', str(ctx.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import gzip
+import itertools
+import sqlite3
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+import backup
+import db
+
+
+class BackupTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name) / 'snapshots'
+        self.path_patch = patch.object(db, 'DB_PATH', Path(self.tmp.name) / 'live.db')
+        self.path_patch.start()
+        conn = db.get_connection()
+        conn.executemany("INSERT INTO member(m_login_id, m_pass) VALUES (?, 'x')", [(f'm{n}',) for n in range(4)])
+        conn.executemany("INSERT INTO item(i_title, i_desc) VALUES (?, ?)", [(f'Filler {n}', 'x' * 400) for n in range(500)])
+        conn.commit()
+        conn.close()
+        end = datetime.utcnow() + timedelta(days=1)
+        self.auctions = [db.create_item_and_auction(f'Lot {n}', 'x', starting_price=1.0, end_date=end)[0]
+                         for n in range(3)]
+
+    def tearDown(self):
+        self.path_patch.stop()
+        self.tmp.cleanup()
+
+    def _open(self, snapshot):
+        raw = Path(self.tmp.name) / 'unpacked.db'
+        raw.write_bytes(gzip.decompress(Path(snapshot).read_bytes()))
+        return sqlite3.connect(raw)
+
+    def _bid_count(self):
+        conn = db.get_connection()
+        n = conn.execute("SELECT COUNT(*) FROM bid").fetchone()[0]
+        conn.close()
+        return n
+
+    def test_snapshots_during_bid_storm(self):
+        amounts = itertools.count(2)
+        errors, stop = [], threading.Event()
+
+        def storm(member):
+            while not stop.is_set():
+                try:
+                    db.place_bid(self.auctions[member % 3], member, next(amounts))
+                except Exception as exc:  # a writer starved by the backup would surface here
+                    errors.append(exc)
+
+        writers = [threading.Thread(target=storm, args=(m,)) for m in range(1, 5)]
+        for t in writers:
+            t.start()
+        try:
+            results = [backup.snapshot(self.dir, keep=2, pages=8, sleep_s=0.001) for _ in range(3)]
+        finally:
+            stop.set()
+            for t in writers:
+                t.join()
+
+        self.assertEqual(errors, [])
+        self.assertGreater(results[-1]['steps'], 1)
+        self.assertEqual([r['removed'] for r in results], [[], [], [Path(results[0]['path']).name]])
+        self.assertEqual(backup.list_snapshots(self.dir), [Path(results[2]['path']), Path(results[1]['path'])])
+        for result in results[1:]:
+            self.assertTrue(backup.verify(Path(result['path'])))
+            copy = self._open(result['path'])
+            try:
+                self.assertEqual(copy.execute("PRAGMA integrity_check").fetchone()[0], 'ok')
+                self.assertLessEqual(copy.execute("SELECT COUNT(*) FROM bid").fetchone()[0], self._bid_count())
+                self.assertEqual(copy.execute(db._BID_STATS_MISMATCH_SQL).fetchall(), [])
+            finally:
+                copy.close()
+
+    def test_restore_replaces_live_data_and_rejects_tampering(self):
+        db.place_bid(self.auctions[0], 1, 5.0)
+        snap = Path(backup.snapshot(self.dir)['path'])
+        db.place_bid(self.auctions[0], 2, 9.0)
+        self.assertEqual(db.get_auction(self.auctions[0])['current_price'], 9.0)  # now cached
+
+        backup.restore(snap)
+        self.assertEqual(db.get_auction(self.auctions[0])['current_price'], 5.0)
+        self.assertEqual(self._bid_count(), 1)
+        self.assertEqual(db.check_bid_stats(), [])
+
+        snap.write_bytes(snap.read_bytes()[:-8] + b'tampered')
+        self.assertFalse(backup.verify(snap))
+        with self.assertRaises(ValueError):
+            backup.restore(snap)
+        self.assertEqual(self._bid_count(), 1)
+
+    def test_scheduled_snapshot_skips_fresh_backup(self):
+        with patch.object(backup, 'BACKUP_DIR', self.dir):
+            self.assertIsNotNone(backup.scheduled_snapshot(interval_s=3600))
+            self.assertIsNone(backup.scheduled_snapshot(interval_s=3600))
+            self.assertEqual(len(backup.list_snapshots()), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import json
+import os
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+os.environ['USE_DB'] = '1'
+
+import app
+import db
+from db_testcase import TempDBTestCase
+
+
+class BidHistoryTests(TempDBTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.store_patch = patch.object(app, 'store', db)
+        self.store_patch.start()
+        conn = db.get_connection()
+        conn.executemany("INSERT INTO member(m_login_id, m_pass) VALUES (?, 'x')", [('ann',), ('bob',)])
+        conn.commit()
+        conn.close()
+        end = datetime.utcnow() + timedelta(days=1)
+        self.aid, _ = db.create_item_and_auction('Lamp', 'x', starting_price=1.0, end_date=end)
+        self.other, _ = db.create_item_and_auction('Vase', 'x', starting_price=1.0, end_date=end)
+        # Three bids per second so pages split inside a run of equal b_epoch values.
+        conn = db.get_connection()
+        conn.executemany("INSERT INTO bid(b_a_id, b_m_id, b_amount, b_time) VALUES (?, ?, ?, ?)",
+                         [(self.aid, 1 + n % 2, 2.0 + n, f'2024-01-01 00:00:{n // 3:02d}') for n in range(25)])
+        conn.execute("INSERT INTO bid(b_a_id, b_m_id, b_amount) VALUES (?, 1, 5.0)", (self.other,))
+        conn.commit()
+        conn.close()
+        self.client = app.app.test_client()
+
+    def tearDown(self):
+        self.store_patch.stop()
+
+    def test_keyset_pages_cover_every_bid_once(self):
+        amounts, cursor = [], None
+        while True:
+            url = f'/api/auctions/{self.aid}/bids?limit=4' + (f'&cursor={cursor}' if cursor else '')
+            body = json.loads(self.client.get(url).data)
+            amounts += [b['amount'] for b in body['bids']]
+            cursor = body['next_cursor']
+            if cursor is None:
+                break
+        self.assertEqual(amounts, [2.0 + n for n in reversed(range(25))])
+
+        conn = db.get_connection()
+        plan = ' '.join(r[3] for r in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT b_id FROM bid WHERE b_a_id = ? AND (b_epoch, b_id) < "
+            "(SELECT b_epoch, b_id FROM bid WHERE b_id = ?) ORDER BY b_epoch DESC, b_id DESC LIMIT 5", (self.aid, 10)))
+        conn.close()
+        self.assertIn('idx_bid_auction_time', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_bidders_are_anonymized_per_auction(self):
+        bids = self.client.get(f'/api/auctions/{self.aid}/bids').get_json()['bids']
+        self.assertEqual(set(bids[0]), {'id', 'bidder', 'amount', 'bid_time'})
+        aliases = {b['bidder'] for b in bids}
+        self.assertEqual(len(aliases), 2)
+        other = self.client.get(f'/api/auctions/{self.other}/bids').get_json()['bids']
+        self.assertNotIn(other[0]['bidder'], aliases)  # member 1 again, different auction
+
+        anon_page = self.client.get(f'/auction/{self.aid}').data.decode()
+        self.assertIn(f'26.0 by {bids[0]["bidder"]}', anon_page)  # top bid is also the newest
+        self.assertNotIn('by user', anon_page)
+        db.refresh_bid_stats([self.aid])
+        api = self.client.get(f'/api/auctions/{self.aid}').get_json()
+        self.assertEqual(api['high_bidder'], bids[0]['bidder'])
+        self.assertNotIn('high_bidder_id', api)
+
+        with self.client.session_transaction() as sess:
+            sess['u_name'] = 'ann'
+        page = self.client.get(f'/auction/{self.aid}').data.decode()
+        self.assertIn('<td>You</td>', page)
+        self.assertIn('26.0 by You', page)
+        self.assertIn(f'bids_before={bids[9]["id"]}', page)
+
+
+if __name__ == '__main__':
+    unittest.main()
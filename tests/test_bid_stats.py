@@ -0,0 +1,69 @@
+import sqlite3
+import unittest
+from unittest.mock import patch
+
+import db
+from db_testcase import TempDBTestCase
+from tools import bid_stats
+
+
+class BidStatsTests(TempDBTestCase):
+
+    def _members(self, n):
+        conn = db.get_connection()
+        conn.executemany("INSERT INTO member(m_login_id, m_pass) VALUES (?, 'x')", [(f'm{i}',) for i in range(n)])
+        conn.commit()
+        conn.close()
+
+    def test_place_bid_maintains_stats(self):
+        self._members(2)
+        aid, _ = db.create_item_and_auction('Lamp', 'x', starting_price=1.0)
+        self.assertTrue(db.place_bid(aid, 1, 2.0))
+        self.assertTrue(db.place_bid(aid, 2, 3.0))
+        self.assertFalse(db.place_bid(aid, 1, 2.5))
+        a = db.get_auction(aid)
+        self.assertEqual((a['bid_count'], a['high_bidder_id']), (2, 2))
+        self.assertIsNotNone(a['last_bid_at'])
+        self.assertEqual(db.check_bid_stats(), [])
+
+    def test_check_and_backfill_tool(self):
+        self._members(1)
+        aid, _ = db.create_item_and_auction('Lamp', 'x', starting_price=1.0)
+        conn = db.get_connection()
+        conn.execute("INSERT INTO bid(b_a_id, b_m_id, b_amount) VALUES (?, 1, 5)", (aid,))
+        conn.commit()
+        conn.close()
+        with patch('builtins.print'):
+            self.assertEqual(bid_stats.main(['check']), 1)
+            self.assertEqual(bid_stats.main(['backfill']), 0)
+            self.assertEqual(bid_stats.main(['check']), 0)
+        self.assertEqual(db.get_auction(aid)['bid_count'], 1)
+
+    def test_old_database_is_migrated_and_backfilled(self):
+        conn = sqlite3.connect(self.path)
+        conn.executescript("""
+            CREATE TABLE member (m_id INTEGER PRIMARY KEY AUTOINCREMENT, m_login_id TEXT NOT NULL UNIQUE,
+                m_pass TEXT NOT NULL, m_email TEXT, m_status TEXT NOT NULL DEFAULT 'P',
+                m_is_admin INTEGER NOT NULL DEFAULT 0, m_role TEXT, created_at TIMESTAMP);
+            CREATE TABLE item (i_id INTEGER PRIMARY KEY AUTOINCREMENT, i_m_id INTEGER, i_title TEXT NOT NULL);
+            CREATE TABLE auction (a_id INTEGER PRIMARY KEY AUTOINCREMENT, a_item_id INTEGER NOT NULL,
+                a_m_id INTEGER, a_s_price REAL NOT NULL DEFAULT 0, a_c_price REAL NOT NULL DEFAULT 0,
+                a_s_date TIMESTAMP, a_e_date TIMESTAMP, a_status TEXT NOT NULL DEFAULT 'open',
+                created_at TIMESTAMP, updated_at TIMESTAMP);
+            CREATE TABLE bid (b_id INTEGER PRIMARY KEY AUTOINCREMENT, b_a_id INTEGER NOT NULL,
+                b_m_id INTEGER NOT NULL, b_amount REAL NOT NULL, b_time TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP);
+            INSERT INTO member(m_login_id, m_pass) VALUES ('a', 'x'), ('b', 'x');
+            INSERT INTO item(i_title) VALUES ('Old');
+            INSERT INTO auction(a_item_id) VALUES (1);
+            INSERT INTO bid(b_a_id, b_m_id, b_amount) VALUES (1, 1, 2), (1, 2, 4), (1, 1, 3);
+        """)
+        conn.close()
+        conn = db.get_connection()
+        row = conn.execute("SELECT bid_count, high_bidder_id FROM auction WHERE a_id = 1").fetchone()
+        self.assertEqual(tuple(row), (3, 2))
+        self.assertEqual(conn.execute("PRAGMA user_version").fetchone()[0], db.SCHEMA_VERSION)
+        conn.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,9 +4,11 @@ from unittest.mock import patch, MagicMock
 
 os.environ['USE_DB'] = '1'
 import app
+from db_testcase import TempDBTestCase
 
-class BidTests(unittest.TestCase):
+class BidTests(TempDBTestCase):
     def setUp(self):
+        super().setUp()
         app.app.config['TESTING'] = True
         self.client = app.app.test_client()
         # make an admin-like user for session if necessary
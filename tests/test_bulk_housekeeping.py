@@ -0,0 +1,65 @@
+import os
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+os.environ['USE_DB'] = '1'
+
+import app
+import db
+from db_testcase import TempDBTestCase
+
+
+class BulkHousekeepingTests(TempDBTestCase):
+
+    def setUp(self):
+        super().setUp()
+        now = datetime.utcnow()
+        self.ids = []
+        for n in range(6):
+            end = now - timedelta(days=1) if n < 4 else now + timedelta(days=3)
+            aid, _ = db.create_item_and_auction(f'Item {n}', 'x', starting_price=1.0, end_date=end)
+            self.ids.append(aid)
+
+    def _auction(self, aid):
+        conn = db.get_connection()
+        row = conn.execute("SELECT a_status, a_e_date FROM auction WHERE a_id = ?", (aid,)).fetchone()
+        conn.close()
+        return row
+
+    def test_close_expired_by_filter_and_extend_by_ids(self):
+        end_before = self._auction(self.ids[4])['a_e_date']
+        counts = db.bulk_auction_housekeeping([
+            {'action': 'close', 'status': 'open', 'ending_before': datetime.utcnow()},
+            {'action': 'extend_days', 'ids': self.ids[4:], 'days': 2},
+        ])
+        self.assertEqual(counts, {'close': 4, 'extend_days': 2})
+        self.assertEqual([self._auction(a)['a_status'] for a in self.ids], ['closed'] * 4 + ['open'] * 2)
+        self.assertEqual(self._auction(self.ids[4])['a_e_date'].replace(microsecond=0),
+                         (end_before + timedelta(days=2)).replace(microsecond=0))
+
+    def test_failed_operation_rolls_back_whole_batch(self):
+        with self.assertRaises(ValueError):
+            db.bulk_auction_housekeeping([
+                {'action': 'cancel', 'ids': self.ids},
+                {'action': 'extend_days', 'ids': self.ids, 'days': 0},
+            ])
+        self.assertTrue(all(self._auction(a)['a_status'] == 'open' for a in self.ids))
+        with self.assertRaises(ValueError):
+            db.bulk_auction_housekeeping([{'action': 'close'}])
+
+    @patch('app.user_is_admin', return_value=True)
+    @patch('app._user_dict_from_session', return_value={'username': 'admin', 'm_is_admin': True})
+    def test_admin_route_applies_checked_and_typed_ids(self, _user, _is_admin):
+        client = app.app.test_client()
+        with client.session_transaction() as sess:
+            sess['u_name'] = 'admin'
+        resp = client.post('/admin/auctions/housekeep', data={
+            'action': 'cancel', 'ids': [str(self.ids[0])], 'id_list': f'{self.ids[1]}, {self.ids[2]}'})
+        self.assertEqual(resp.status_code, 302)
+        self.assertEqual([self._auction(a)['a_status'] for a in self.ids[:4]],
+                         ['cancelled', 'cancelled', 'cancelled', 'open'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import csv
+import json
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import db
+from tools import catalog_io
+
+
+class CatalogIOTests(unittest.TestCase):
+
+    def test_import_then_export_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            src = tmp / 'listings.csv'
+            with open(src, 'w', newline='') as fh:
+                w = csv.DictWriter(fh, fieldnames=['title', 'description', 'starting_price', 'duration_days', 'images'])
+                w.writeheader()
+                for n in range(7):
+                    w.writerow({'title': f'Lamp {n}', 'description': 'brass', 'starting_price': n + 1,
+                                'duration_days': 3, 'images': f'/static/a{n}.png|/static/b{n}.png'})
+            out = tmp / 'out.jsonl'
+            with patch.object(db, 'DB_PATH', tmp / 'cat.db'), patch('sys.stderr'):
+                self.assertEqual(catalog_io.main(['import', str(src), '--batch-size', '3']), 0)
+                conn = db.get_connection()
+                aid = conn.execute("SELECT a_id FROM auction ORDER BY a_id LIMIT 1").fetchone()[0]
+                conn.execute("INSERT INTO member(m_login_id, m_pass) VALUES ('bidder', 'x')")
+                conn.execute("INSERT INTO bid(b_a_id, b_m_id, b_amount) VALUES (?, 1, 9.5)", (aid,))
+                conn.commit()
+                conn.close()
+                self.assertEqual(catalog_io.main(['export', str(out), '--batch-size', '2']), 0)
+
+            conn = sqlite3.connect(tmp / 'cat.db')
+            try:
+                self.assertEqual(conn.execute("SELECT COUNT(*) FROM item").fetchone()[0], 7)
+                self.assertEqual(conn.execute("SELECT COUNT(*) FROM item_image").fetchone()[0], 14)
+                self.assertEqual(conn.execute("PRAGMA foreign_key_check").fetchall(), [])
+            finally:
+                conn.close()
+            records = [json.loads(line) for line in out.read_text().splitlines()]
+            self.assertEqual([r['title'] for r in records], [f'Lamp {n}' for n in range(7)])
+            self.assertEqual(records[0]['images'], ['/static/a0.png', '/static/b0.png'])
+            self.assertEqual([b['amount'] for b in records[0]['bids']], [9.5])
+            self.assertEqual(records[1]['starting_price'], 2.0)
+
+    def test_missing_title_rolls_back_batch(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            src = tmp / 'bad.jsonl'
+            src.write_text('{"title": "ok"}\n{"description": "no title"}\n')
+            with patch.object(db, 'DB_PATH', tmp / 'cat.db'), patch('sys.stderr'):
+                with self.assertRaises(ValueError):
+                    catalog_io.main(['import', str(src)])
+                conn = db.get_connection()
+                self.assertEqual(conn.execute("SELECT COUNT(*) FROM item").fetchone()[0], 0)
+                conn.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import sqlite3
+import threading
+import unittest
+from unittest.mock import patch
+
+import db
+from db_testcase import TempDBTestCase
+
+
+class ConnectionRoutingTests(TempDBTestCase):
+
+    def test_readers_are_read_only_and_counted(self):
+        reader = db.read_connection()
+        try:
+            self.assertEqual(reader.execute("PRAGMA journal_mode").fetchone()[0], 'wal')
+            self.assertGreater(len(db.get_categories()), 0)  # schema was created by the first connection
+            with self.assertRaises(sqlite3.OperationalError):
+                reader.execute("INSERT INTO member(m_login_id, m_pass) VALUES ('x', 'x')")
+            stats = db.connection_stats()
+            self.assertEqual((stats['readers_active'], stats['readers_peak']), (1, 2))
+        finally:
+            reader.close()
+        reader.close()  # closing twice must not drive the counter negative
+        self.assertEqual(db.connection_stats()['readers_active'], 0)
+
+    def test_reads_proceed_while_writer_holds_the_lock(self):
+        writer = db.get_connection()
+        try:
+            writer.execute("BEGIN IMMEDIATE")
+            writer.execute("INSERT INTO member(m_login_id, m_pass) VALUES ('ann', 'x')")
+            self.assertIsNone(db.get_user_by_username('ann'))  # uncommitted, and no wait for the lock
+            writer.commit()
+        finally:
+            writer.close()
+        self.assertEqual(db.get_user_by_username('ann')['username'], 'ann')
+
+    def test_writers_queue_behind_the_gate(self):
+        writer = db.get_connection()
+        nested = db.get_connection()  # same thread: the gate is re-entrant
+        nested.close()
+        done = threading.Event()
+
+        def second_writer():
+            db.get_connection().close()
+            done.set()
+
+        t = threading.Thread(target=second_writer)
+        t.start()
+        for _ in range(200):
+            if db.connection_stats()['writer_queue']:
+                break
+            done.wait(0.005)
+        self.assertEqual(db.connection_stats()['writer_queue'], 1)
+        self.assertFalse(done.is_set())
+        writer.close()
+        t.join(timeout=5)
+        self.assertTrue(done.is_set())
+        stats = db.connection_stats(reset_peaks=True)
+        self.assertEqual((stats['writer_queue'], stats['writer_queue_peak'], stats['writer_wait_timeouts']), (0, 1, 0))
+        self.assertEqual(db.connection_stats()['writer_queue_peak'], 0)
+
+    def test_failed_writer_releases_the_gate(self):
+        errors = []
+
+        def bad_writer():
+            try:
+                db.create_item('t', owner_id=99999)
+            except sqlite3.IntegrityError as exc:
+                errors.append(exc)
+
+        t = threading.Thread(target=bad_writer)
+        t.start()
+        t.join(timeout=5)
+        self.assertEqual(len(errors), 1)  # FOREIGN KEY constraint failed
+
+        with patch.object(db, 'SQLITE_WRITER_WAIT_S', 0.5):
+            result = []
+            t = threading.Thread(target=lambda: result.append(db.create_item('ok')))
+            t.start()
+            t.join(timeout=5)
+        self.assertEqual(len(result), 1)
+        stats = db.connection_stats()
+        self.assertEqual((stats['writer_wait_timeouts'], stats['writer_queue_peak']), (0, 0))
+
+    def test_writer_wait_times_out_instead_of_deadlocking(self):
+        leaked = db.get_connection()
+        try:
+            with patch.object(db, 'SQLITE_WRITER_WAIT_S', 0.01):
+                result = []
+                t = threading.Thread(target=lambda: result.append(db.confirm_member(1)))
+                t.start()
+                t.join(timeout=5)
+            self.assertEqual(result, [False])
+            self.assertEqual(db.connection_stats()['writer_wait_timeouts'], 1)
+        finally:
+            leaked.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,6 +7,13 @@ import datetime
 # Import the module under test
 import db
 
+_REAL_GET_CONNECTION = db.get_connection
+
+
+def teardown_module(module):
+    # The tests below swap in a fake connection factory; restore it for later test modules.
+    db.get_connection = _REAL_GET_CONNECTION
+
 
 class FakeRow:
     def __init__(self, values, cols=None):
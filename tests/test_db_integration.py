@@ -2,7 +2,9 @@ import os
 import time
 import unittest
 
-class DBIntegrationTest(unittest.TestCase):
+from db_testcase import TempDBTestCase
+
+class DBIntegrationTest(TempDBTestCase):
     def test_create_item_and_auction(self):
         # Import DB helpers inside the test to allow skipping if unavailable
         use_db = os.getenv('USE_DB', '').lower() in ('1', 'true', 'yes')
@@ -0,0 +1,83 @@
+import sqlite3
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import db
+from db_testcase import TempDBTestCase
+from records import from_epoch, to_epoch
+
+
+class EpochTimestampTests(TempDBTestCase):
+
+    def test_version_2_database_gains_epoch_columns_and_indexes(self):
+        raw = sqlite3.connect(self.path)
+        raw.executescript(db._SCHEMA_SQL)
+        for stmt in db._RANKING_INDEXES:
+            raw.execute(stmt)
+        raw.execute("CREATE INDEX idx_bid_auction_time ON bid(b_a_id, b_time DESC, b_id DESC)")
+        raw.execute("INSERT INTO item(i_title) VALUES ('Old lot')")
+        raw.execute("INSERT INTO auction(a_item_id, a_s_date, a_e_date) "
+                    "VALUES (1, '2026-01-02 03:04:05.123456', '2026-01-09T03:04:05')")
+        raw.execute("INSERT INTO bid(b_a_id, b_m_id, b_amount, b_time) VALUES (1, 1, 2.0, '2026-01-03 00:00:00')")
+        raw.execute("PRAGMA user_version = 2")
+        raw.commit()
+        raw.close()
+
+        auction = db.get_auction(1)
+        self.assertEqual((auction.start_ts, auction.end_ts), (1767323045, 1767927845))
+        self.assertEqual(auction['start_date'], datetime(2026, 1, 2, 3, 4, 5))
+        self.assertEqual(auction['duration'], 7)
+        self.assertEqual(db.get_bid_history(1)[0]['bid_time'], datetime(2026, 1, 3))
+
+        conn = db.get_connection()
+        try:
+            self.assertEqual(conn.execute("PRAGMA user_version").fetchone()[0], db.SCHEMA_VERSION)
+            indexed = {r[1]: [c[2] for c in conn.execute(f"PRAGMA index_info({r[1]})")]
+                       for r in conn.execute("PRAGMA index_list(bid)")}
+            self.assertEqual(indexed['idx_bid_auction_time'], ['b_a_id', 'b_epoch', 'b_id'])
+        finally:
+            conn.close()
+
+    def test_ending_ranking_compares_integers_on_the_index(self):
+        conn = db.get_connection()
+        conn.execute("INSERT INTO member(m_login_id, m_pass) VALUES ('ann', 'x')")
+        conn.commit()
+        conn.close()
+        now = datetime.utcnow()
+        soon, _ = db.create_item_and_auction('Soon', 'x', starting_price=1.0, end_date=now + timedelta(hours=1))
+        db.create_item_and_auction('Later', 'x', starting_price=1.0, end_date=now + timedelta(days=2))
+        ended, _ = db.create_item_and_auction('Ended', 'x', starting_price=1.0, end_date=now - timedelta(hours=1))
+
+        ranked = db.get_ranked_auctions('ending')
+        self.assertEqual([a.title for a in ranked], ['Soon', 'Later'])
+        self.assertEqual(ranked[0]['end_date'], from_epoch(to_epoch(now + timedelta(hours=1))))
+        self.assertTrue(db.place_bid(soon, 1, 2.0))
+        self.assertFalse(db.place_bid(ended, 1, 2.0))
+
+        conn = db.get_connection()
+        try:
+            plan = ' '.join(r[3] for r in conn.execute(
+                f"EXPLAIN QUERY PLAN SELECT a_id FROM auction a WHERE a.a_status = 'open' "
+                f"AND a.a_e_epoch > ? ORDER BY {db.RANKINGS['ending'][1]} LIMIT 5", (to_epoch(now),)))
+        finally:
+            conn.close()
+        self.assertIn('idx_auction_ending', plan)
+
+    def test_auction_ending_within_the_current_second_is_still_open(self):
+        conn = db.get_connection()
+        conn.execute("INSERT INTO member(m_login_id, m_pass) VALUES ('ann', 'x')")
+        conn.commit()
+        conn.close()
+        end = datetime(2030, 1, 1, 12, 0, 0, 900000)
+        aid, _ = db.create_item_and_auction('Tight', 'x', starting_price=1.0, end_date=end)
+        with patch('time.time', return_value=to_epoch(end) + 0.5):  # 12:00:00.5, before the end
+            self.assertEqual([a.id for a in db.get_ranked_auctions('ending')], [aid])
+            self.assertTrue(db.place_bid(aid, 1, 2.0))
+        with patch('time.time', return_value=to_epoch(end) + 1.0):
+            self.assertEqual(db.get_ranked_auctions('ending'), [])
+            self.assertFalse(db.place_bid(aid, 1, 3.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
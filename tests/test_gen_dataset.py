@@ -0,0 +1,53 @@
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import db
+from tools import gen_dataset
+
+
+class GenDatasetTests(unittest.TestCase):
+
+    def test_bulk_load_counts_and_indexes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'scale.db'
+            with patch.object(db, 'DB_PATH', path):
+                db.bootstrap_sqlite_db()
+                conn = sqlite3.connect(path)
+                conn.execute("CREATE INDEX idx_test_bid_auction ON bid(b_a_id)")
+                conn.close()
+                with patch('builtins.print'):
+                    gen_dataset.main(['--members', '50', '--auctions', '40', '--bids', '500', '--seed', '3'])
+
+            conn = sqlite3.connect(path)
+            try:
+                count = lambda table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]  # noqa: E731
+                self.assertEqual(count('member'), 50)
+                self.assertEqual(count('auction'), 40)
+                self.assertEqual(count('bid'), 500)
+                self.assertGreaterEqual(count('item_image'), 40)
+                self.assertEqual(conn.execute("PRAGMA foreign_key_check").fetchall(), [])
+                self.assertIsNotNone(conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE name = 'idx_test_bid_auction'").fetchone())
+                # Auction price reflects its highest bid.
+                mismatched = conn.execute(
+                    "SELECT COUNT(*) FROM auction a JOIN (SELECT b_a_id, MAX(b_amount) m FROM bid GROUP BY b_a_id) b "
+                    "ON b.b_a_id = a.a_id WHERE a.a_c_price <> b.m").fetchone()[0]
+                self.assertEqual(mismatched, 0)
+            finally:
+                conn.close()
+            with patch.object(db, 'DB_PATH', path):
+                self.assertEqual(db.check_bid_stats(), [])
+
+    def test_bid_counts_are_skewed_and_exact(self):
+        import random
+        counts = gen_dataset.bid_counts(random.Random(1), 1000, 100_000, 0.01)
+        self.assertEqual(sum(counts), 100_000)
+        top = sorted(counts, reverse=True)
+        self.assertGreater(sum(top[:10]), 100_000 * 0.05)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import runpy
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+os.environ['USE_DB'] = '1'
+
+import app
+import db
+
+CONF = Path(__file__).resolve().parent.parent / 'gunicorn.conf.py'
+
+
+class GunicornConfTests(unittest.TestCase):
+
+    def _load(self, **env):
+        with patch.dict('os.environ', env), patch('multiprocessing.cpu_count', return_value=4):
+            return runpy.run_path(str(CONF))
+
+    def test_worker_autosizing_per_class(self):
+        conf = self._load(GUNICORN_WORKER_CLASS='gthread', WEB_CONCURRENCY='')
+        self.assertEqual((conf['workers'], conf['threads']), (5, 4))
+        conf = self._load(GUNICORN_WORKER_CLASS='sync', WEB_CONCURRENCY='')
+        self.assertEqual(conf['workers'], 9)
+        self.assertNotIn('threads', conf)
+        self.assertEqual(self._load(WEB_CONCURRENCY='3')['workers'], 3)
+        self.assertTrue(conf['preload_app'])
+        self.assertGreater(conf['max_requests_jitter'], 0)
+
+    def test_post_fork_resets_data_layer_state(self):
+        conf = self._load()
+        db.auction_cache.set(('x', 1), {'id': 1})
+        db._change_log_state['x'] = {'seq': 5, 'polled_at': 0.0}
+        with patch.object(app, 'store', db):
+            conf['post_fork'](MagicMock(), MagicMock())
+        self.assertEqual(len(db.auction_cache), 0)
+        self.assertEqual(db._change_log_state, {})
+
+    def test_post_worker_init_warms_up(self):
+        conf = self._load(WARMUP='1')
+        worker = MagicMock()
+        with patch.object(app, 'warm_up', return_value=12.0) as warm, \
+                patch('maintenance.start') as start_maintenance:
+            conf['post_worker_init'](worker)
+        warm.assert_called_once_with()
+        worker.log.info.assert_called_once()
+        start_maintenance.assert_called_once_with(app.store)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import os
+import sys
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+os.environ['USE_DB'] = '1'
+
+import app
+import db
+from db_testcase import TempDBTestCase
+
+# Exceptions raised in these files during a request count against the hot path.
+WATCHED = {'app.py', 'db.py', 'backend.py', 'cache.py', 'querylog.py', 'template_cache.py'}
+
+
+def _raised_during(fn):
+    """Call `fn` and return (result, [(function, exception name)]) for exceptions raised in WATCHED files."""
+    raised = []
+
+    def local(frame, event, arg):
+        if event == 'exception' and arg[0] not in (StopIteration, GeneratorExit):
+            raised.append((frame.f_code.co_name, arg[0].__name__))
+        return local
+
+    def tracer(frame, event, arg):
+        return local if os.path.basename(frame.f_code.co_filename) in WATCHED else None
+
+    old = sys.gettrace()
+    sys.settrace(tracer)
+    try:
+        result = fn()
+    finally:
+        sys.settrace(old)
+    return result, raised
+
+
+class HighestBidTests(TempDBTestCase):
+
+    def setUp(self):
+        super().setUp()
+        conn = db.get_connection()
+        conn.executemany("INSERT INTO member(m_login_id, m_pass) VALUES (?, 'x')", [('ann',), ('bob',)])
+        conn.commit()
+        conn.close()
+        self.aid, _ = db.create_item_and_auction('Lamp', 'x', starting_price=1.0,
+                                                 end_date=datetime.utcnow() + timedelta(days=1))
+        self.store_patch = patch.object(app, 'store', db)
+        self.store_patch.start()
+
+    def tearDown(self):
+        self.store_patch.stop()
+
+    def test_highest_bid_uses_index(self):
+        self.assertIsNone(db.get_highest_bid(self.aid))
+        db.place_bid(self.aid, 1, 2.0)
+        db.place_bid(self.aid, 2, 3.5)
+        top = db.get_highest_bid(self.aid)
+        self.assertEqual((top['amount'], top['bidder_id']), (3.5, 2))
+        conn = db.get_connection()
+        plan = ' '.join(r[3] for r in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT b_amount, b_m_id, b_time FROM bid WHERE b_a_id = ? "
+            "ORDER BY b_amount DESC LIMIT 1", (self.aid,)))
+        conn.close()
+        self.assertIn('idx_bid_auction_amount', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_view_and_bid_raise_no_exceptions(self):
+        db.place_bid(self.aid, 1, 2.0)
+        client = app.app.test_client()
+        client.get(f'/auction/{self.aid}')  # first render compiles the template
+
+        resp, raised = _raised_during(lambda: client.get(f'/auction/{self.aid}'))
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn(f'2.0 by {app._bidder_alias(self.aid, 1)}'.encode(), resp.data)
+        self.assertEqual(raised, [])
+
+        with client.session_transaction() as sess:
+            sess['u_name'] = 'bob'
+        resp, raised = _raised_during(lambda: client.post(f'/auction/{self.aid}/bid', data={'amount': '5'}))
+        self.assertEqual(resp.status_code, 302)
+        self.assertEqual(raised, [])
+        self.assertEqual(db.get_highest_bid(self.aid)['bidder_id'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
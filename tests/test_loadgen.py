@@ -0,0 +1,37 @@
+import unittest
+
+from db_testcase import TempDBTestCase
+from tools.loadgen import LoadConfig, parse_mix, run_load
+from tools.loadgen.stats import percentile
+
+
+class LoadgenTests(TempDBTestCase):
+
+    def test_parse_mix(self):
+        self.assertEqual(parse_mix('browse=3, view=1'), {'browse': 3, 'view': 1})
+        with self.assertRaises(ValueError):
+            parse_mix('browse=1,teleport=2')
+        with self.assertRaises(ValueError):
+            parse_mix('browse=0')
+
+    def test_percentile_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([], 95), 0.0)
+
+    def test_in_process_run_reports_per_endpoint(self):
+        import app
+        config = LoadConfig(users=3, duration_s=30, max_requests=24, mix={'browse': 1, 'search': 1}, seed=7)
+        report = run_load(config, app_module=app)
+        self.assertEqual(report['total_requests'], 24)
+        self.assertEqual(set(report['endpoints']), {'GET /auctions', 'GET /search'})
+        for stats in report['endpoints'].values():
+            self.assertEqual(stats['errors'], 0)
+            latency = stats['latency_ms']
+            self.assertLessEqual(latency['p50'], latency['p95'])
+            self.assertLessEqual(latency['p95'], latency['p99'])
+
+
+if __name__ == '__main__':
+    unittest.main()
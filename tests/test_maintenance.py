@@ -0,0 +1,69 @@
+import sqlite3
+import unittest
+from unittest.mock import MagicMock
+
+import db
+import maintenance
+from db_testcase import TempDBTestCase
+
+
+class MaintenanceTests(TempDBTestCase):
+
+    def _churn(self):
+        conn = db.get_connection()
+        conn.execute("INSERT INTO member(m_login_id, m_pass) VALUES ('ann', 'x')")
+        aid = conn.execute("INSERT INTO item(i_title) VALUES ('Lamp')").lastrowid
+        conn.execute("INSERT INTO auction(a_item_id) VALUES (?)", (aid,))
+        conn.executemany("INSERT INTO bid(b_a_id, b_m_id, b_amount) VALUES (1, 1, ?)", [(n,) for n in range(20000)])
+        conn.commit()
+        conn.execute("DELETE FROM bid")
+        conn.commit()
+        conn.close()
+
+    def test_bounded_incremental_vacuum_and_run_log(self):
+        self._churn()
+        before = db.maintenance_stats()
+        self.assertEqual(before['auto_vacuum'], 'incremental')
+        self.assertGreater(before['free_ratio'], 0.5)
+
+        result = db.run_maintenance(vacuum_pages=50)
+        self.assertEqual(result['reclaimed_pages'], 50)
+        self.assertEqual(result['after']['freelist_count'], before['freelist_count'] - 50)
+        self.assertEqual(set(result['steps_ms']), {'optimize', 'incremental_vacuum'})
+        self.assertEqual(db.maintenance_stats()['last_run']['reclaimed_pages'], 50)
+
+        # Another worker inside the interval skips; without one it runs again.
+        self.assertIsNone(db.run_maintenance(min_interval_s=60))
+        self.assertIsNotNone(db.run_maintenance(vacuum_pages=0, analyze=True))
+
+    def test_convert_existing_file(self):
+        conn = sqlite3.connect(db.DB_PATH)
+        conn.execute("CREATE TABLE legacy(x)")
+        conn.commit()
+        conn.close()
+        self.assertEqual(db.maintenance_stats()['auto_vacuum'], 'none')
+        self.assertEqual(db.run_maintenance()['after']['auto_vacuum'], 'none')
+        result = db.run_maintenance(convert=True)
+        self.assertEqual(result['after']['auto_vacuum'], 'incremental')
+        self.assertIn('vacuum', result['steps_ms'])
+
+    def test_scheduler_runs_and_stops(self):
+        store = MagicMock()
+        store.run_maintenance.return_value = {'steps_ms': {}, 'reclaimed_pages': 0, 'after': {'free_ratio': 0.0}}
+        sched = maintenance.MaintenanceScheduler(store, interval_s=0.01).start()
+        try:
+            for _ in range(200):
+                if sched.runs >= 2:
+                    break
+                sched._stop.wait(0.01)
+        finally:
+            sched.stop(timeout=1)
+        self.assertGreaterEqual(sched.runs, 2)
+        self.assertAlmostEqual(store.run_maintenance.call_args.kwargs['min_interval_s'], 0.009)
+        self.addCleanup(maintenance.stop)
+        self.assertIsNone(maintenance.start(store, interval_s=0))
+        self.assertIn('close-expired', maintenance._jobs)  # independent of the maintenance interval
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import os
+import unittest
+from unittest.mock import patch
+
+os.environ['USE_DB'] = '1'
+
+import app
+import db
+from db_testcase import TempDBTestCase
+
+
+class MembersPageTests(TempDBTestCase):
+
+    def setUp(self):
+        super().setUp()
+        conn = db.get_connection()
+        conn.executemany(
+            "INSERT INTO member(m_login_id, m_pass, m_status, m_is_admin) VALUES (?, 'x', ?, ?)",
+            [(f"user{n:03d}", 'A' if n % 2 else 'P', 1 if n % 10 == 0 else 0) for n in range(120)]
+            + [("alice", 'A', 0), ("alicia", 'P', 0)],
+        )
+        conn.commit()
+        conn.close()
+
+    def test_paging_and_counts(self):
+        first = db.get_members_page(per_page=50)
+        self.assertEqual(len(first['members']), 50)
+        self.assertEqual(first['total'], 122)
+        self.assertEqual(first['pages'], 3)
+        self.assertTrue(first['has_next'])
+        last = db.get_members_page(page=3, per_page=50)
+        self.assertEqual(len(last['members']), 22)
+        self.assertFalse(last['has_next'])
+        self.assertTrue(last['has_prev'])
+
+    def test_filters_and_sort(self):
+        page = db.get_members_page(login_prefix='ali', sort='username', descending=True)
+        self.assertEqual([m['username'] for m in page['members']], ['alicia', 'alice'])
+        admins = db.get_members_page(role='admin', status='P', per_page=500)
+        self.assertEqual(admins['total'], 12)
+        self.assertTrue(all(m['is_admin'] and m['status'] == 'P' for m in admins['members']))
+
+    def test_total_is_cached(self):
+        self.assertEqual(db.get_members_page(status='A')['total'], 61)
+        conn = db.get_connection()
+        conn.execute("INSERT INTO member(m_login_id, m_pass, m_status) VALUES ('late', 'x', 'A')")
+        conn.commit()
+        conn.close()
+        self.assertEqual(db.get_members_page(status='A')['total'], 61)
+        db._member_counts.clear()
+        self.assertEqual(db.get_members_page(status='A')['total'], 62)
+
+    def test_resolve_member_by_id_login_or_email(self):
+        conn = db.get_connection()
+        conn.execute("UPDATE member SET m_email = 'Alice@Example.com' WHERE m_login_id = 'alice'")
+        conn.commit()
+        conn.close()
+        alice = db.resolve_member('ALICE')
+        self.assertEqual(alice['username'], 'alice')
+        self.assertEqual(db.resolve_member('alice@example.COM')['id'], alice['id'])
+        self.assertEqual(db.resolve_member(str(alice['id']))['username'], 'alice')
+        self.assertIsNone(db.resolve_member('nobody'))
+        self.assertEqual(app._resolve_member_id('Alicia'), db.resolve_member('alicia')['id'])
+        with self.assertRaises(ValueError):
+            db.create_member('Alice', 'Secret123!')
+
+    @patch('app.user_is_admin', return_value=True)
+    @patch('app._user_dict_from_session', return_value={'username': 'admin', 'm_is_admin': True})
+    def test_admin_members_route_renders_one_page(self, _user, _is_admin):
+        client = app.app.test_client()
+        with client.session_transaction() as sess:
+            sess['u_name'] = 'admin'
+        resp = client.get('/admin/members?q=user&page=2')
+        self.assertEqual(resp.status_code, 200)
+        body = resp.get_data(as_text=True)
+        self.assertIn('user050', body)
+        self.assertNotIn('user049<', body)
+        self.assertIn('page=3', body)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import os
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+os.environ['USE_DB'] = '1'
+
+import app
+import bidding
+import db
+from db_testcase import TempDBTestCase
+
+
+class ResolveTests(unittest.TestCase):
+
+    def test_increment_ladder(self):
+        ladder = bidding.parse_increments('100:5, 0:1')
+        self.assertEqual(ladder, [(0.0, 1.0), (100.0, 5.0)])
+        self.assertEqual(bidding.bid_increment(99.99, ladder), 1.0)
+        self.assertEqual(bidding.bid_increment(100, ladder), 5.0)
+        with self.assertRaises(ValueError):
+            bidding.parse_increments('0:0')
+
+    def test_resolve(self):
+        with patch.object(bidding, 'INCREMENTS', [(0.0, 1.0)]):
+            # Sole proxy opens one increment over the price.
+            self.assertEqual(bidding.resolve(10, None, [(1, 50)]), [(1, 11)])
+            # Leader's proxy answers a weaker challenger one increment over its maximum.
+            self.assertEqual(bidding.resolve(11, 1, [(1, 50), (2, 30)]), [(2, 30), (1, 31)])
+            # A stronger challenger takes the lead one increment over the old maximum.
+            self.assertEqual(bidding.resolve(31, 1, [(2, 80), (1, 50)]), [(1, 50), (2, 51)])
+            # Equal maximums: the earlier one wins at its maximum.
+            self.assertEqual(bidding.resolve(31, 1, [(1, 50), (2, 50)]), [(1, 50)])
+            # Nothing to do when the leader's only rival is exhausted.
+            self.assertEqual(bidding.resolve(51, 2, [(2, 80), (1, 50)]), [])
+
+
+class ProxyBidTests(TempDBTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.inc_patch = patch.object(bidding, 'INCREMENTS', [(0.0, 1.0)])
+        self.inc_patch.start()
+        conn = db.get_connection()
+        conn.executemany("INSERT INTO member(m_login_id, m_pass) VALUES (?, 'x')", [('ann',), ('bob',), ('cat',)])
+        conn.commit()
+        conn.close()
+        self.aid, _ = db.create_item_and_auction('Lamp', 'x', starting_price=10.0,
+                                                 end_date=datetime.utcnow() + timedelta(days=1))
+
+    def tearDown(self):
+        self.inc_patch.stop()
+
+    def _bids(self):
+        conn = db.get_connection()
+        rows = conn.execute("SELECT b_m_id, b_amount FROM bid WHERE b_a_id = ? ORDER BY b_id", (self.aid,)).fetchall()
+        conn.close()
+        return [(r[0], r[1]) for r in rows]
+
+    def test_competing_maximums_settle_in_few_writes(self):
+        first = db.place_max_bid(self.aid, 1, 50)
+        self.assertEqual((first['current_price'], first['leading'], first['bids_placed']), (11.0, True, 1))
+
+        second = db.place_max_bid(self.aid, 2, 30)
+        self.assertEqual((second['current_price'], second['leading']), (31.0, False))
+
+        # Manual bids below ann's maximum are answered in the same transaction.
+        self.assertTrue(db.place_bid(self.aid, 3, 40))
+        auc = db.get_auction(self.aid)
+        self.assertEqual((auc['current_price'], auc['high_bidder_id']), (41.0, 1))
+
+        third = db.place_max_bid(self.aid, 2, 80)
+        self.assertEqual((third['current_price'], third['high_bidder_id']), (51.0, 2))
+        self.assertEqual(self._bids(), [(1, 11.0), (2, 30.0), (1, 31.0), (3, 40.0), (1, 41.0), (1, 50.0), (2, 51.0)])
+        self.assertEqual(db.check_bid_stats(), [])
+
+        # A maximum must beat the price and only ever goes up.
+        self.assertIsNone(db.place_max_bid(self.aid, 1, 51))
+        self.assertIsNone(db.place_max_bid(self.aid, 2, 70))
+        self.assertEqual(db.get_proxy_bid(self.aid, 2)['max_amount'], 80.0)
+        self.assertIsNone(db.get_proxy_bid(self.aid, 3))
+
+    def test_route_places_maximum(self):
+        client = app.app.test_client()
+        with patch.object(app, 'store', db):
+            with client.session_transaction() as sess:
+                sess['u_name'] = 'bob'
+            resp = client.post(f'/auction/{self.aid}/bid', data={'amount': '25', 'auto': '1'})
+            self.assertEqual(resp.status_code, 302)
+            self.assertEqual(db.get_highest_bid(self.aid)['amount'], 11.0)
+            page = client.get(f'/auction/{self.aid}')
+        self.assertIn(b'Your maximum bid: HK$25.00', page.data)
+
+
+if __name__ == '__main__':
+    unittest.main()
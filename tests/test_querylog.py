@@ -0,0 +1,58 @@
+import sqlite3
+import unittest
+from unittest.mock import patch
+
+import querylog
+
+
+class QueryLogTests(unittest.TestCase):
+
+    def setUp(self):
+        querylog.reset()
+        self.conn = sqlite3.connect(':memory:', factory=querylog.TracedConnection)
+        self.conn.execute("CREATE TABLE bid (b_id INTEGER PRIMARY KEY, b_a_id INTEGER, b_amount REAL)")
+
+    def tearDown(self):
+        self.conn.close()
+        querylog.reset()
+
+    def test_fingerprint_strips_literals(self):
+        a = querylog.fingerprint("SELECT * FROM bid WHERE b_a_id = 12 AND note = 'x'")
+        b = querylog.fingerprint("SELECT *  FROM bid\n WHERE b_a_id = 7 AND note = 'it''s'")
+        self.assertEqual(a, b)
+        self.assertEqual(querylog.fingerprint("SELECT 1 WHERE x IN (?, ?, ?)"), "SELECT ? WHERE x IN (?+)")
+
+    def test_fast_queries_are_not_recorded(self):
+        with patch.object(querylog, 'SLOW_QUERY_MS', 10_000):
+            self.conn.execute("SELECT MAX(b_amount) FROM bid WHERE b_a_id = ?", (1,)).fetchone()
+        self.assertEqual(querylog.top_queries(), [])
+
+    def test_slow_query_captures_shape_site_and_plan(self):
+        with patch.object(querylog, 'SLOW_QUERY_MS', 0):
+            self.conn.execute("SELECT b_amount FROM bid WHERE b_a_id = ?", (1,)).fetchall()
+            self.conn.cursor().execute("SELECT b_amount FROM bid WHERE b_a_id = ?", (2,)).fetchall()
+        entries = querylog.top_queries()
+        self.assertEqual(len(entries), 1)
+        entry = entries[0]
+        self.assertEqual(entry['count'], 2)
+        self.assertEqual(entry['params'], '(int)')
+        self.assertIn('test_querylog.py', entry['call_site'])
+        self.assertIn('SCAN bid', entry['plan'])
+
+    def test_failed_statement_is_timed_without_plan(self):
+        with patch.object(querylog, 'SLOW_QUERY_MS', 0):
+            with self.assertRaises(sqlite3.OperationalError):
+                self.conn.execute("SELECT TOP 1 b_amount FROM dbo.bid WHERE b_a_id = ?", (1,))
+        entry = querylog.top_queries()[0]
+        self.assertNotIn('plan', entry)
+
+    def test_table_keeps_only_top_n(self):
+        with patch.object(querylog, 'SLOW_QUERY_TOP_N', 3):
+            for i in range(6):
+                querylog.record(f"SELECT {i} FROM t{i}", (), elapsed_ms=1000 + i)
+        kept = [e['max_ms'] for e in querylog.top_queries()]
+        self.assertEqual(kept, [1005, 1004, 1003])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import unittest
+from datetime import datetime, timedelta
+
+os.environ['USE_DB'] = '1'
+
+import app
+import db
+from db_testcase import TempDBTestCase
+
+
+class RankingTests(TempDBTestCase):
+
+    def setUp(self):
+        super().setUp()
+        conn = db.get_connection()
+        conn.executemany("INSERT INTO member(m_login_id, m_pass) VALUES (?, 'x')", [('ann',), ('bob',)])
+        conn.commit()
+        conn.close()
+        now = datetime.utcnow()
+        self.quiet, _ = db.create_item_and_auction('Quiet', 'x', starting_price=1, end_date=now + timedelta(days=5))
+        self.hot, _ = db.create_item_and_auction('Hot', 'x', starting_price=1, end_date=now + timedelta(days=3))
+        self.soon, _ = db.create_item_and_auction('Soon', 'x', starting_price=1, end_date=now + timedelta(hours=1))
+        self.over, _ = db.create_item_and_auction('Over', 'x', starting_price=1, end_date=now - timedelta(hours=1))
+        for n, bidder in enumerate([1, 2, 1]):
+            db.place_bid(self.hot, bidder, 2 + n)
+        db.place_bid(self.soon, 2, 5)
+
+    def test_rankings_follow_bids_create_and_close(self):
+        popular = db.get_ranked_auctions('popular')
+        self.assertEqual([a['id'] for a in popular], [self.hot, self.soon, self.quiet])
+        self.assertEqual((popular[0]['auc_cnt'], popular[0]['high_bidder_id']), (3, 1))
+        self.assertEqual([a['id'] for a in db.get_ranked_auctions('ending')], [self.soon, self.hot, self.quiet])
+        self.assertEqual(db.get_ranked_auctions('new', limit=1)[0]['id'], self.soon)
+
+        newest, _ = db.create_item_and_auction('Newest', 'x', end_date=datetime.utcnow() + timedelta(days=1))
+        db.bulk_auction_housekeeping([{'action': 'close', 'ids': [self.hot]}])
+        self.assertEqual(db.get_ranked_auctions('new', limit=1)[0]['id'], newest)
+        self.assertNotIn(self.hot, [a['id'] for a in db.get_ranked_auctions('popular')])
+
+    def test_close_expired_keeps_popular_scan_on_live_auctions(self):
+        self.assertEqual(db.get_auction(self.over)['status'], 'open')  # cached before closing
+        self.assertEqual(db.close_expired_auctions(batch_size=1), 1)
+        self.assertEqual(db.close_expired_auctions(), 0)
+        self.assertEqual(db.get_auction(self.over)['status'], 'closed')
+        self.assertEqual(db.get_auction(self.soon)['status'], 'open')
+
+        conn = db.get_connection()
+        try:
+            plan = ' '.join(r[3] for r in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT a_id FROM auction a WHERE a.a_status = 'open' "
+                f"ORDER BY {db.RANKINGS['popular'][1]} LIMIT 5"))
+            open_rows = conn.execute("SELECT COUNT(*) FROM auction WHERE a_status = 'open'").fetchone()[0]
+        finally:
+            conn.close()
+        self.assertIn('idx_auction_popular', plan)
+        self.assertEqual(open_rows, 3)
+
+    def test_listing_routes_render(self):
+        client = app.app.test_client()
+        for path, title in (('/popular', 'Hot'), ('/ending', 'Soon'), ('/new', 'Quiet')):
+            resp = client.get(path)
+            self.assertEqual(resp.status_code, 200, path)
+            self.assertIn(title, resp.get_data(as_text=True))
+            self.assertIn(app._bidder_alias(self.hot, 1), resp.get_data(as_text=True))
+        self.assertNotIn('Over', client.get('/ending').get_data(as_text=True))
+
+    def test_public_pages_never_show_member_logins(self):
+        carol = db.create_member('carol-login', 'pw12345')
+        db.place_bid(self.quiet, carol, 9)
+        client = app.app.test_client()
+        for path in ('/popular', '/ending', '/new', f'/auction/{self.quiet}', '/api/auctions'):
+            page = client.get(path).get_data(as_text=True)
+            self.assertNotIn('carol-login', page, path)
+            self.assertIn(app._bidder_alias(self.quiet, carol), page, path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+from datetime import datetime, timedelta
+
+from jinja2 import Template
+
+import db
+from db_testcase import TempDBTestCase
+from records import Auction, Member
+
+
+class RecordTests(TempDBTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.m_id = db.create_member('ann', 'pw12345', email='ann@example.com')
+        self.aid, self.item_id = db.create_item_and_auction('Lamp', 'Brass', starting_price=2.0,
+                                                            end_date=datetime.utcnow() + timedelta(days=1))
+        db.place_bid(self.aid, self.m_id, 5.0)
+
+    def test_auction_rows_are_slotted_mappings(self):
+        card = db.get_auctions()[0]
+        self.assertIsInstance(card, Auction)
+        self.assertFalse(hasattr(card, '__dict__'))
+        self.assertEqual((card.title, card['title'], card.get('missing', 'x')), ('Lamp', 'Lamp', 'x'))
+        self.assertEqual((card['url'], card['bid_count'], card['current_price']), (f'/auction/{self.aid}', 1, 5.0))
+        self.assertEqual(dict(card), {k: card[k] for k in card})
+        self.assertEqual(card, dict(card))
+        with self.assertRaises(KeyError):
+            card['no_such_key'] = 1
+
+        detail = db.get_auction(self.aid)
+        self.assertEqual((detail['version'], detail['archived']), (card['version'], False))
+        ranked = db.get_ranked_auctions('popular')[0]
+        self.assertEqual((ranked['high_bidder_id'], ranked['auc_cnt'], ranked['end_date']), (self.m_id, 1, card['end_time']))
+
+    def test_member_aliases_share_one_value(self):
+        user = db.get_user_by_username('ann')
+        self.assertIsInstance(user, Member)
+        self.assertEqual((user['m_id'], user['id'], user['m_login_id'], user['m_role']),
+                         (self.m_id, self.m_id, 'ann', 'user'))
+        self.assertTrue(db.verify_password(user.get('password'), 'pw12345'))
+        summary = db.get_all_members()[0]
+        self.assertIsNone(summary['password'])
+        self.assertEqual(db.resolve_member('ANN@example.com').username, 'ann')
+        self.assertEqual(db.get_member_by_id(self.m_id)['m_email'], 'ann@example.com')
+
+    def test_templates_and_bids(self):
+        html = Template("{{ a.title }}|{{ a['current_bid'] }}|{{ m.m_login_id }}").render(
+            a=db.get_auction(self.aid), m=db.get_user_by_username('ann'))
+        self.assertEqual(html, f"Lamp|{db._format_money(5.0)}|ann")
+        bid = db.get_highest_bid(self.aid)
+        self.assertEqual((bid.amount, bid['bidder_id']), (5.0, self.m_id))
+        self.assertEqual(db.get_bid_history(self.aid), [dict(bid)])
+        db.add_item_image(self.item_id, '/static/uploads/none.png')
+        self.assertEqual(db.get_item_images(self.item_id)[0]['variants'], {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,11 +1,13 @@
 import unittest
 
 from app import app, ts
+from db_testcase import TempDBTestCase
 
 
-class SmokeTests(unittest.TestCase):
+class SmokeTests(TempDBTestCase):
 
     def setUp(self):
+        super().setUp()
         self.client = app.test_client()
 
     def test_core_paths_status(self):
@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+
+from jinja2 import DictLoader, Environment
+
+import template_cache
+
+CARD = ("{% for a in items %}{% cache 'card', a.id, a.version %}"
+        "[{{ a.title }}|{{ counter() }}]{% endcache %}{% endfor %}")
+
+
+class FragmentCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        template_cache.fragment_cache.clear()
+        template_cache.fragment_cache.reset_stats()
+        self.renders = 0
+
+        def counter():
+            self.renders += 1
+            return ''
+
+        env = Environment(extensions=[template_cache.FragmentCacheExtension])
+        env.globals['counter'] = counter
+        self.template = env.from_string(CARD)
+
+    def test_fragments_reused_until_version_changes(self):
+        items = [{'id': i, 'version': 'v1', 'title': f'Item {i}'} for i in range(50)]
+        first = self.template.render(items=items)
+        self.assertEqual(self.renders, 50)
+        self.assertEqual(self.template.render(items=items), first)
+        self.assertEqual(self.renders, 50)
+        self.assertEqual(template_cache.fragment_cache.stats()['hits'], 50)
+
+        items[3] = {'id': 3, 'version': 'v2', 'title': 'Renamed'}
+        self.assertIn('[Renamed|]', self.template.render(items=items))
+        self.assertEqual(self.renders, 51)
+
+    def test_missing_key_part_renders_uncached(self):
+        items = [{'title': 'Demo'}, {'id': 1, 'version': None, 'title': 'No version'}]
+        self.template.render(items=items)
+        self.template.render(items=items)
+        self.assertEqual(self.renders, 4)
+        self.assertEqual(len(template_cache.fragment_cache), 0)
+
+
+class PrecompileTests(unittest.TestCase):
+
+    def test_precompile_fills_bytecode_cache_and_skips_broken_templates(self):
+        templates = {'ok.html': 'hello {{ name }}', 'broken.html': '{% if x %}never closed'}
+        with tempfile.TemporaryDirectory() as tmp:
+            env = Environment(loader=DictLoader(templates))
+            self.assertEqual(template_cache.install_bytecode_cache(env, tmp), tmp)
+            stats = template_cache.precompile_templates(env)
+            self.assertEqual((stats['loaded'], stats['failed']), (1, ['broken.html']))
+            self.assertEqual(len(os.listdir(tmp)), 1)
+
+            # A second worker loads the compiled code instead of parsing again.
+            fresh = Environment(loader=DictLoader(templates))
+            template_cache.install_bytecode_cache(fresh, tmp)
+            fresh._parse = lambda *a, **k: self.fail('template was re-parsed')
+            self.assertEqual(fresh.get_template('ok.html').render(name='x'), 'hello x')
+
+    def test_empty_directory_disables_bytecode_cache(self):
+        env = Environment()
+        self.assertIsNone(template_cache.install_bytecode_cache(env, ''))
+        self.assertIsNone(env.bytecode_cache)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""Move long-closed auctions and their bids into the archive tables.
+
+Auctions that ended (or were closed) more than --days ago leave the hot
+`auction` / `bid` tables in batches of --batch-size, one short transaction
+per batch, so it is safe to run while the site takes bids. Archived auctions
+stay readable at their old URLs.
+
+    python tools/archive_auctions.py                      # ARCHIVE_AFTER_DAYS (default 90)
+    python tools/archive_auctions.py --days 30 --batch-size 200 --max-batches 10
+    python tools/archive_auctions.py --backend sqlserver
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Archive closed auctions and their bids")
+    parser.add_argument("--backend", choices=("sqlite", "sqlserver"), default="sqlite")
+    parser.add_argument("--days", type=int, default=None, help="Archive auctions closed longer than this")
+    parser.add_argument("--batch-size", type=int, default=None, help="Auctions moved per transaction")
+    parser.add_argument("--max-batches", type=int, default=None, help="Stop after this many batches")
+    args = parser.parse_args(argv)
+
+    if args.backend == "sqlserver":
+        import db_sqlserver as backend
+    else:
+        import db as backend
+    t0 = time.perf_counter()
+    totals = backend.archive_closed_auctions(args.days, args.batch_size, args.max_batches)
+    print(f"Archived {totals['auctions']} auction(s) and {totals['bids']} bid(s) "
+          f"in {totals['batches']} batch(es), {time.perf_counter() - t0:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
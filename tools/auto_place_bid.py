@@ -13,7 +13,7 @@ ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
 
-from db import get_connection
+from db import get_bid_history, get_connection
 
 BASE = os.getenv('APP_URL', 'http://127.0.0.1:5000')
 AUCTION_ID = int(os.getenv('AUCTION_ID', '1'))
@@ -41,14 +41,11 @@ print("Response snippet:\n", bid_resp.text[:800])
 print("\nVerifying DB entries...")
 conn = get_connection()
 try:
-    rows = conn.execute(
-        "SELECT b_id, b_amount, b_time, b_m_id FROM bid WHERE b_a_id = ? ORDER BY b_time DESC LIMIT 5",
-        (AUCTION_ID,)
-    ).fetchall()
+    rows = get_bid_history(AUCTION_ID, limit=5)
     if not rows:
         print("No bids recorded.")
     for row in rows:
-        print(dict(row))
+        print(row)
     auction_row = conn.execute(
         "SELECT a_id, a_c_price, a_status FROM auction WHERE a_id = ?",
         (AUCTION_ID,)
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Online backups of the live SQLite database (safe while gunicorn is running).
+
+    python tools/backup_db.py snapshot                   # stepped copy -> tools/backups/sqlite/iom-<UTC>.db.gz (+ .sha256)
+    python tools/backup_db.py snapshot --keep 7 --dir /mnt/backups
+    python tools/backup_db.py list
+    python tools/backup_db.py verify                     # newest snapshot; or pass a path
+    python tools/backup_db.py restore tools/backups/sqlite/iom-20260101T000000_000000Z.db.gz
+
+Step size, pause and restart limit come from BACKUP_STEP_PAGES,
+BACKUP_STEP_SLEEP_S and BACKUP_MAX_RESTARTS (see backup.py). Workers take
+snapshots on their own when BACKUP_INTERVAL_S > 0.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+def main(argv=None) -> int:
+    import backup
+
+    parser = argparse.ArgumentParser(description="Snapshot, list, verify or restore online SQLite backups")
+    parser.add_argument("action", choices=("snapshot", "list", "verify", "restore"))
+    parser.add_argument("path", nargs="?", help="verify/restore: snapshot file (verify defaults to the newest)")
+    parser.add_argument("--dir", type=Path, default=None, help=f"Snapshot directory (default {backup.BACKUP_DIR})")
+    parser.add_argument("--db", type=Path, default=None, help="Database file (default db.DB_PATH)")
+    parser.add_argument("--keep", type=int, default=None, help=f"snapshot: newest N to keep (default {backup.BACKUP_KEEP})")
+    parser.add_argument("--json", action="store_true", help="Print the raw result as JSON")
+    args = parser.parse_args(argv)
+
+    if args.action == "snapshot":
+        result = backup.snapshot(args.dir, db_path=args.db, keep=args.keep)
+        if args.json:
+            print(json.dumps(result, indent=2))
+        else:
+            print(f"{result['path']}: {result['db_bytes']} -> {result['bytes']} bytes, {result['pages']} pages in "
+                  f"{result['steps']} step(s), {result['restarts']} restart(s), {result['seconds']:.2f}s")
+            for name in result["removed"]:
+                print(f"removed {name}")
+        return 0
+
+    snapshots = backup.list_snapshots(args.dir)
+    if args.action == "list":
+        for path in snapshots:
+            stat = path.stat()
+            print(f"{datetime.fromtimestamp(stat.st_mtime):%Y-%m-%d %H:%M:%S}  {stat.st_size:>12}  {path}")
+        return 0
+
+    if args.path is None and args.action == "verify" and snapshots:
+        args.path = snapshots[0]
+    if args.path is None:
+        parser.error(f"{args.action} needs a snapshot path")
+    try:
+        if args.action == "verify":
+            ok = backup.verify(Path(args.path))
+            print(f"{args.path}: {'OK' if ok else 'CHECKSUM MISMATCH'}")
+            return 0 if ok else 1
+        result = backup.restore(Path(args.path), db_path=args.db)
+    except (ValueError, RuntimeError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    print(f"Restored {result['path']} into {result['db_path']} in {result['seconds']:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""Micro-benchmarks for the data-access layer (`db.py` / `db_sqlserver.py`).
+
+Seeds a database of configurable size, times the hot helpers over many
+iterations, appends the results to a JSON history file and flags regressions
+against a stored baseline.
+
+    python tools/run.py bench --auctions 5000 --iterations 300
+    python tools/run.py bench --save-baseline
+    python tools/run.py bench --fail-on-regression
+    python tools/run.py bench --threads 16 --duration 10   # plus a mixed read/bid load with connection metrics
+
+The SQLite backend always seeds a fresh temporary database. The SQL Server
+backend benchmarks the database configured through ODBC_DSN / credential.py
+and only seeds rows (titled `BENCH ...`) when `--seed-sqlserver` is given.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+BENCH_DIR = ROOT / "tools" / "benchmarks"
+HISTORY_FILE = BENCH_DIR / "history.json"
+BASELINE_FILE = BENCH_DIR / "baseline.json"
+
+BENCHMARKS = (
+    "get_auctions",
+    "get_auction",
+    "place_bid",
+    "get_item_images",
+    "get_all_members",
+    "create_item_and_auction",
+)
+
+
+class Fixture:
+    def __init__(self):
+        self.member_ids: List[int] = []
+        self.item_ids: List[int] = []
+        self.auction_ids: List[int] = []
+        self.prices: Dict[int, float] = {}
+
+
+def seed_sqlite(backend, members: int, auctions: int, bids_per_auction: int, images_per_item: int,
+                rng: random.Random) -> Fixture:
+    """Bulk-seed the SQLite file behind `backend.DB_PATH` in one transaction."""
+    fx = Fixture()
+    now = datetime.utcnow()
+    conn = backend.get_connection()
+    try:
+        conn.executemany(
+            "INSERT INTO member(m_login_id, m_pass, m_email, m_status) VALUES (?, ?, ?, 'A')",
+            ((f"bench{i}", "x", f"bench{i}@example.com") for i in range(members)),
+        )
+        fx.member_ids = [r[0] for r in conn.execute("SELECT m_id FROM member ORDER BY m_id")]
+        conn.executemany(
+            "INSERT INTO item(i_m_id, i_title, i_desc, i_b_price) VALUES (?, ?, ?, ?)",
+            ((rng.choice(fx.member_ids), f"Bench item {i}", "Seeded by tools/bench_db.py " * 4, 1.0)
+             for i in range(auctions)),
+        )
+        fx.item_ids = [r[0] for r in conn.execute("SELECT i_id FROM item ORDER BY i_id")]
+        conn.executemany(
+            "INSERT INTO auction(a_item_id, a_m_id, a_s_price, a_c_price, a_s_date, a_e_date) VALUES (?, ?, ?, ?, ?, ?)",
+            ((item_id, None, 1.0, 1.0, now - timedelta(minutes=i), now + timedelta(days=30))
+             for i, item_id in enumerate(fx.item_ids)),
+        )
+        fx.auction_ids = [r[0] for r in conn.execute("SELECT a_id FROM auction ORDER BY a_id")]
+        bids = []
+        for aid in fx.auction_ids:
+            price = 1.0
+            for _ in range(bids_per_auction):
+                price += 1.0
+                bids.append((aid, rng.choice(fx.member_ids), price))
+            fx.prices[aid] = price
+        conn.executemany("INSERT INTO bid(b_a_id, b_m_id, b_amount) VALUES (?, ?, ?)", bids)
+        conn.executemany("UPDATE auction SET a_c_price = ? WHERE a_id = ?",
+                         ((p, aid) for aid, p in fx.prices.items()))
+        backend.refresh_bid_stats(conn=conn)
+        conn.executemany(
+            "INSERT INTO item_image(item_id, image_url, sort_order) VALUES (?, ?, ?)",
+            ((item_id, f"/static/uploads/item{item_id}_{n}.png", n)
+             for item_id in fx.item_ids for n in range(1, images_per_item + 1)),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    return fx
+
+
+def seed_with_helpers(backend, members: int, auctions: int, bids_per_auction: int, images_per_item: int,
+                      rng: random.Random) -> Fixture:
+    """Seed through the backend's own helpers (used for SQL Server, which has no bulk path here)."""
+    fx = Fixture()
+    tag = int(time.time())
+    for i in range(members):
+        m_id = backend.create_member(f"bench{tag}_{i}", "BenchPass123!", email=f"bench{tag}_{i}@example.com")
+        if m_id:
+            fx.member_ids.append(m_id)
+    for i in range(auctions):
+        aid, item_id = backend.create_item_and_auction(f"BENCH {tag} {i}", "benchmark row", starting_price=1.0,
+                                                       end_date=datetime.utcnow() + timedelta(days=30))
+        fx.auction_ids.append(aid)
+        fx.item_ids.append(item_id)
+        for n in range(1, images_per_item + 1):
+            backend.add_item_image(item_id, f"/static/uploads/item{item_id}_{n}.png", None, sort_order=n)
+        price = 1.0
+        for _ in range(bids_per_auction if fx.member_ids else 0):
+            price += 1.0
+            backend.place_bid(aid, rng.choice(fx.member_ids), price)
+        fx.prices[aid] = price
+    return fx
+
+
+def existing_fixture(backend) -> Fixture:
+    fx = Fixture()
+    for a in backend.get_auctions(limit=500) or []:
+        if a.get("id") is not None:
+            fx.auction_ids.append(a["id"])
+            fx.item_ids.append(a.get("item_id") or a["id"])
+    fx.member_ids = [m["id"] for m in backend.get_all_members() or [] if m.get("id") is not None]
+    return fx
+
+
+def build_cases(backend, fx: Fixture, rng: random.Random) -> Dict[str, Callable[[], object]]:
+    def place_bid():
+        aid = rng.choice(fx.auction_ids)
+        price = fx.prices.get(aid, 1.0) + 1.0
+        fx.prices[aid] = price
+        return backend.place_bid(aid, rng.choice(fx.member_ids), price)
+
+    return {
+        "get_auctions": lambda: backend.get_auctions(limit=50),
+        "get_auction": lambda: backend.get_auction(rng.choice(fx.auction_ids)),
+        "place_bid": place_bid,
+        "get_item_images": lambda: backend.get_item_images(rng.choice(fx.item_ids)),
+        "get_all_members": backend.get_all_members,
+        "create_item_and_auction": lambda: backend.create_item_and_auction(
+            "Bench create", "benchmark row", seller_id=rng.choice(fx.member_ids), starting_price=1.0),
+    }
+
+
+def time_case(fn: Callable[[], object], iterations: int, warmup: int) -> dict:
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    samples.sort()
+    return {
+        "iterations": iterations,
+        "mean_ms": round(statistics.fmean(samples), 4),
+        "median_ms": round(statistics.median(samples), 4),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 4),
+        "min_ms": round(samples[0], 4),
+        "ops_per_s": round(1000 / statistics.fmean(samples), 1),
+    }
+
+
+def run_mixed(backend, fx: Fixture, threads: int, duration_s: float, write_ratio: float, seed: int) -> dict:
+    """Hammer the backend from `threads` threads (reads plus `write_ratio` bids) and report the
+    throughput together with the backend's reader / writer-queue counters for the run."""
+    backend.connection_stats(reset_peaks=True)
+    totals = {"reads": 0, "writes": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration_s
+
+    def worker(n: int) -> None:
+        rng = random.Random(seed + n)
+        cases = build_cases(backend, fx, rng)
+        reads = writes = 0
+        while time.perf_counter() < deadline:
+            if rng.random() < write_ratio:
+                cases["place_bid"]()
+                writes += 1
+            else:
+                cases[rng.choice(("get_auctions", "get_auction", "get_item_images"))]()
+                reads += 1
+        with lock:
+            totals["reads"] += reads
+            totals["writes"] += writes
+
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    t0 = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    return {
+        "threads": threads,
+        "write_ratio": write_ratio,
+        "seconds": round(elapsed, 2),
+        "reads_per_s": round(totals["reads"] / elapsed, 1),
+        "writes_per_s": round(totals["writes"] / elapsed, 1),
+        "connections": backend.connection_stats(),
+    }
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    """Return a message for every benchmark whose median is slower than baseline by more than `threshold`."""
+    regressions = []
+    for name, res in results.items():
+        base = baseline.get(name)
+        if not base or not base.get("median_ms"):
+            continue
+        ratio = res["median_ms"] / base["median_ms"]
+        if ratio > 1 + threshold:
+            regressions.append(f"{name}: median {res['median_ms']:.3f}ms vs baseline "
+                               f"{base['median_ms']:.3f}ms (+{(ratio - 1) * 100:.0f}%)")
+    return regressions
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True).stdout.strip()
+    except Exception:
+        return ""
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the data-access layer")
+    parser.add_argument("--backend", choices=("sqlite", "sqlserver"), default="sqlite")
+    parser.add_argument("--members", type=int, default=1000)
+    parser.add_argument("--auctions", type=int, default=2000)
+    parser.add_argument("--bids-per-auction", type=int, default=5)
+    parser.add_argument("--images-per-item", type=int, default=2)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, help="Run a subset of benchmarks")
+    parser.add_argument("--seed", type=int, default=1234, help="Random seed for reproducible runs")
+    parser.add_argument("--seed-sqlserver", action="store_true", help="Insert BENCH rows into SQL Server first")
+    parser.add_argument("--history", type=Path, default=HISTORY_FILE)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.20, help="Allowed slowdown vs baseline (0.20 = 20%%)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit 1 when a regression is flagged")
+    parser.add_argument("--threads", type=int, default=0, help="Also run a mixed load from N threads (0 = skip)")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds of mixed load with --threads")
+    parser.add_argument("--write-ratio", type=float, default=0.1, help="Share of mixed-load operations that bid")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    sizes = (args.members, args.auctions, args.bids_per_auction, args.images_per_item)
+    tmpdir = None
+    if args.backend == "sqlite":
+        import db as backend
+        tmpdir = tempfile.TemporaryDirectory(prefix="iom-bench-")
+        backend.DB_PATH = Path(tmpdir.name) / "bench.db"
+        t0 = time.perf_counter()
+        fx = seed_sqlite(backend, *sizes, rng)
+        print(f"Seeded {backend.DB_PATH} in {time.perf_counter() - t0:.2f}s")
+    else:
+        import db_sqlserver as backend
+        fx = seed_with_helpers(backend, *sizes, rng) if args.seed_sqlserver else existing_fixture(backend)
+    if not (fx.auction_ids and fx.member_ids):
+        print("Nothing to benchmark: need at least one auction and one member.")
+        return 2
+
+    cases = build_cases(backend, fx, rng)
+    results = {}
+    try:
+        for name in args.only or BENCHMARKS:
+            results[name] = time_case(cases[name], args.iterations, args.warmup)
+            r = results[name]
+            print(f"{name:<25} median {r['median_ms']:>9.3f}ms  p95 {r['p95_ms']:>9.3f}ms  {r['ops_per_s']:>9.1f} ops/s")
+        if args.threads > 0:
+            mixed = run_mixed(backend, fx, args.threads, args.duration, args.write_ratio, args.seed)
+            print(f"mixed x{mixed['threads']:<19} {mixed['reads_per_s']:>9.1f} reads/s  {mixed['writes_per_s']:>9.1f} bids/s")
+            c = mixed["connections"]
+            if c:
+                print(f"{'':<25} readers peak {c['readers_peak']}, writer queue peak {c['writer_queue_peak']}, "
+                      f"longest writer wait {c['writer_wait_ms_max']:.1f}ms, {c['writer_wait_timeouts']} timeout(s)")
+    finally:
+        if tmpdir is not None:
+            tmpdir.cleanup()
+
+    run = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_revision": _git_revision(),
+        "backend": args.backend,
+        "python": platform.python_version(),
+        "sizes": dict(zip(("members", "auctions", "bids_per_auction", "images_per_item"), sizes)),
+        "results": results,
+    }
+    if args.threads > 0:
+        run["mixed"] = mixed
+    args.history.parent.mkdir(parents=True, exist_ok=True)
+    history = json.loads(args.history.read_text()) if args.history.exists() else []
+    history.append(run)
+    args.history.write_text(json.dumps(history, indent=2) + "\n")
+    print(f"Appended run to {args.history}")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(run, indent=2) + "\n")
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print("No baseline stored yet; run with --save-baseline to create one.")
+        return 0
+    baseline = json.loads(args.baseline.read_text())
+    if baseline.get("sizes") != run["sizes"] or baseline.get("backend") != run["backend"]:
+        print("Warning: baseline was recorded with a different backend or dataset size.")
+    regressions = compare(results, baseline.get("results", {}), args.threshold)
+    for msg in regressions:
+        print(f"REGRESSION {msg}")
+    if not regressions:
+        print(f"No regressions beyond {args.threshold:.0%} of baseline.")
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Measure first-request latency of freshly started app workers.
+
+Every run starts a new interpreter (what a gunicorn worker does without
+`--preload`), imports `app`, then times the first and second request to each
+path with the Flask test client. Three configurations are compared:
+
+    cold      no bytecode cache, no warm-up (templates compile lazily)
+    bytecode  bytecode cache already populated, no warm-up
+    warmup    bytecode cache plus boot-time precompilation (the default)
+
+    python tools/run.py bench-first-request
+    python tools/run.py bench-first-request --runs 10 --paths / /auctions /popular
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+DEFAULT_PATHS = ("/", "/auctions", "/popular", "/user_login", "/register", "/how_to_bid")
+
+MODES = {
+    "cold": {"TEMPLATE_WARMUP": "0", "JINJA_BYTECODE_DIR": ""},
+    "bytecode": {"TEMPLATE_WARMUP": "0"},
+    "warmup": {"TEMPLATE_WARMUP": "1"},
+}
+
+
+def _child(paths) -> int:
+    """Runs inside the fresh worker process; prints one JSON line of timings."""
+    start = time.perf_counter()
+    import app
+    boot_ms = (time.perf_counter() - start) * 1000
+    client = app.app.test_client()
+    first, second = {}, {}
+    for path in paths:
+        for timings in (first, second):
+            t0 = time.perf_counter()
+            client.get(path)
+            timings[path] = (time.perf_counter() - t0) * 1000
+    print(json.dumps({"boot_ms": boot_ms, "first": first, "second": second}))
+    return 0
+
+
+def _spawn(paths, env) -> dict:
+    cmd = [sys.executable, str(Path(__file__).resolve()), "--child", "--paths", *paths]
+    out = subprocess.run(cmd, env=env, cwd=str(ROOT), capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure first-request latency of fresh workers")
+    parser.add_argument("--runs", type=int, default=5, help="fresh processes per mode")
+    parser.add_argument("--paths", nargs="+", default=list(DEFAULT_PATHS))
+    parser.add_argument("--modes", nargs="+", choices=tuple(MODES), default=list(MODES))
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        return _child(args.paths)
+
+    with tempfile.TemporaryDirectory(prefix="iom-first-request-") as tmp:
+        base_env = dict(os.environ, USE_DB="1", SQLITE_PATH=os.path.join(tmp, "bench.db"),
+                        AUTH_LOG=os.path.join(tmp, "auth.log"), JINJA_BYTECODE_DIR=os.path.join(tmp, "bytecode"))
+        # One throwaway run creates the database and fills the bytecode cache.
+        _spawn(args.paths, dict(base_env, TEMPLATE_WARMUP="1"))
+
+        print(f"{'mode':<10} {'boot ms':>9} {'1st req ms':>11} {'2nd req ms':>11}  (median of {args.runs} fresh processes)")
+        for mode in args.modes:
+            results = [_spawn(args.paths, dict(base_env, **MODES[mode])) for _ in range(args.runs)]
+            boot = statistics.median(r["boot_ms"] for r in results)
+            first = statistics.median(sum(r["first"].values()) for r in results)
+            second = statistics.median(sum(r["second"].values()) for r in results)
+            print(f"{mode:<10} {boot:>9.1f} {first:>11.1f} {second:>11.1f}")
+            for path in args.paths:
+                per_path = statistics.median(r["first"][path] for r in results)
+                print(f"  {path:<20} first request {per_path:8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
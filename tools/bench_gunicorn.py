@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Compare gunicorn profiles under the load generator.
+
+Seeds a temporary SQLite dataset, then for each profile starts gunicorn on a
+free local port, drives it with `tools.loadgen` over HTTP and stops it:
+
+    default   gunicorn's own defaults (no config file): 1 sync worker, no preload
+    sync      gunicorn.conf.py with GUNICORN_WORKER_CLASS=sync
+    gthread   gunicorn.conf.py as shipped (threaded workers)
+
+    python tools/run.py bench-gunicorn --users 20 --duration 20
+    python tools/run.py bench-gunicorn --profiles default gthread --workers 4 --output gunicorn.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from tools.loadgen.runner import LoadConfig, run_load  # noqa: E402
+
+BENCH_USER = ("bench", "BenchPass123!")
+# The default loadgen mix without uploads, which would write into static/uploads.
+BENCH_MIX = {"browse": 30, "view": 40, "search": 15, "bid": 15}
+
+PROFILES = {
+    "default": {"config": None, "env": {}},
+    "sync": {"config": ROOT / "gunicorn.conf.py", "env": {"GUNICORN_WORKER_CLASS": "sync"}},
+    "gthread": {"config": ROOT / "gunicorn.conf.py", "env": {"GUNICORN_WORKER_CLASS": "gthread"}},
+}
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _seed(tmp: Path, auctions: int) -> Path:
+    path = tmp / "bench.db"
+    subprocess.run([sys.executable, str(ROOT / "tools" / "gen_dataset.py"), "--path", str(path), "--reset",
+                    "--members", str(max(100, auctions // 10)), "--auctions", str(auctions),
+                    "--bids", str(auctions * 10)], check=True, cwd=str(ROOT), stdout=subprocess.DEVNULL)
+    import db
+    db.DB_PATH = path
+    db.create_member(*BENCH_USER)
+    return path
+
+
+def _wait_ready(url: str, proc: subprocess.Popen, timeout_s: float = 60.0) -> float:
+    """Poll `url` until it answers; returns seconds from spawn to first response."""
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout_s:
+        if proc.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with status {proc.returncode}")
+        try:
+            urllib.request.urlopen(url, timeout=2).read()
+            return time.perf_counter() - start
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"gunicorn did not answer on {url} within {timeout_s:.0f}s")
+
+
+def run_profile(name: str, db_path: Path, tmp: Path, args) -> dict:
+    profile = PROFILES[name]
+    port = _free_port()
+    empty_config = tmp / "empty.conf.py"
+    empty_config.touch()
+    env = dict(os.environ, USE_DB="1", SQLITE_PATH=str(db_path), AUTH_LOG=str(tmp / "auth.log"),
+               JINJA_BYTECODE_DIR=str(tmp / "bytecode"), **profile["env"])
+    if args.workers:
+        env["WEB_CONCURRENCY"] = str(args.workers)
+    cmd = [sys.executable, "-m", "gunicorn", "--config", str(profile["config"] or empty_config),
+           "--bind", f"127.0.0.1:{port}", "--log-level", "warning", "app:app"]
+    proc = subprocess.Popen(cmd, cwd=str(ROOT), env=env)
+    try:
+        url = f"http://127.0.0.1:{port}"
+        ready_s = _wait_ready(url + "/", proc)
+        report = run_load(LoadConfig(url=url, users=args.users, duration_s=args.duration,
+                                     auction_ids=list(range(1, min(args.auctions, 200) + 1)),
+                                     mix=dict(BENCH_MIX), credentials=BENCH_USER, seed=args.seed))
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+    report["profile"] = name
+    report["ready_s"] = round(ready_s, 2)
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare gunicorn profiles with the load generator")
+    parser.add_argument("--profiles", nargs="+", choices=tuple(PROFILES), default=list(PROFILES))
+    parser.add_argument("--users", type=int, default=20, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=15.0, help="Seconds of load per profile")
+    parser.add_argument("--workers", type=int, default=None, help="Override WEB_CONCURRENCY for the config profiles")
+    parser.add_argument("--auctions", type=int, default=5000, help="Auctions in the seeded dataset")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", type=Path, help="Write all reports as JSON here")
+    args = parser.parse_args(argv)
+
+    reports = []
+    with tempfile.TemporaryDirectory(prefix="iom-gunicorn-") as tmp_name:
+        tmp = Path(tmp_name)
+        db_path = _seed(tmp, args.auctions)
+        print(f"{'profile':<9} {'ready s':>8} {'req/s':>8} {'errors':>7} {'worst p95 ms':>13} {'worst p99 ms':>13}")
+        for name in args.profiles:
+            r = run_profile(name, db_path, tmp, args)
+            reports.append(r)
+            latencies = [e["latency_ms"] for e in r["endpoints"].values()] or [{"p95": 0.0, "p99": 0.0}]
+            print(f"{name:<9} {r['ready_s']:>8.2f} {r['throughput_rps']:>8.1f} {r['errors']:>7} "
+                  f"{max(l['p95'] for l in latencies):>13.1f} {max(l['p99'] for l in latencies):>13.1f}")
+    if args.output:
+        args.output.write_text(json.dumps(reports, indent=2, sort_keys=True) + "\n")
+        print(f"Wrote {len(reports)} profile reports to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""Time and memory of building a large auction listing: slotted records vs the old per-row dicts.
+
+Seeds a temporary SQLite database, then builds the same `get_auctions`
+listing both ways from one connection: the old path (`sqlite3.Row` of
+TIMESTAMP columns -> `dict(row)` -> normalized dict) and the current one
+(plain tuples of epoch columns -> `records.Auction`). Memory is what the finished list keeps alive, measured
+with tracemalloc.
+
+    python tools/run.py bench-records
+    python tools/run.py bench-records --auctions 50000 --runs 7 --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+def seed(db, auctions: int) -> None:
+    now = datetime.utcnow()
+    conn = db.get_connection()
+    try:
+        conn.executemany("INSERT INTO item(i_m_id, i_title, i_desc, i_b_price) VALUES (NULL, ?, ?, 1.0)",
+                         ((f"Bench item {i}", "Seeded by tools/bench_records.py " * 3) for i in range(auctions)))
+        conn.execute("INSERT INTO auction(a_item_id, a_s_price, a_c_price, a_s_date, a_e_date, bid_count) "
+                     "SELECT i_id, 1.0, 1.0 + i_id % 97, ?, ?, i_id % 13 FROM item",
+                     (now - timedelta(days=1), now + timedelta(days=6)))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+# The card columns before records and epoch timestamps: every date parsed into a datetime per row.
+LEGACY_COLUMNS = """
+    a.a_id, a.a_item_id, a.a_c_price, a.a_s_price, a.a_status, a.a_s_date, a.a_e_date,
+    a.bid_count, a.high_bidder_id, a.last_bid_at, i.i_title, i.i_desc, i.i_image, i.i_m_id
+"""
+
+
+def legacy_card(db, row) -> dict:
+    """The listing row as db.py built it before records: a dict of the row, then the normalized dict."""
+    data = db._row_to_dict(row)
+    price = data.get("a_c_price") or data.get("a_s_price")
+    return {
+        "id": data.get("a_id"),
+        "item_id": data.get("a_item_id"),
+        "title": data.get("i_title"),
+        "description": data.get("i_desc"),
+        "image_url": data.get("i_image") or db.url_for_static_placeholder(),
+        "current_bid": db._format_money(price),
+        "current_price": price,
+        "starting_price": data.get("a_s_price"),
+        "seller_id": data.get("i_m_id"),
+        "start_date": data.get("a_s_date"),
+        "end_time": data.get("a_e_date"),
+        "duration": db._compute_duration(data.get("a_s_date"), data.get("a_e_date")),
+        "url": f"/auction/{data.get('a_id')}",
+        "status": data.get("a_status", "open"),
+        "bid_count": data.get("bid_count") or 0,
+        "high_bidder_id": data.get("high_bidder_id"),
+        "last_bid_at": data.get("last_bid_at"),
+        "version": db._card_version(tuple(row)),
+    }
+
+
+def measure(build, runs: int) -> dict:
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        build()
+        samples.append((time.perf_counter() - t0) * 1000)
+    tracemalloc.start()
+    try:
+        rows = build()
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "rows": len(rows),
+        "median_ms": round(statistics.median(samples), 2),
+        "min_ms": round(min(samples), 2),
+        "retained_kb": round(retained / 1024, 1),
+        "peak_kb": round(peak / 1024, 1),
+        "bytes_per_row": round(retained / max(len(rows), 1)),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark auction records against per-row dicts")
+    parser.add_argument("--auctions", type=int, default=10000)
+    parser.add_argument("--runs", type=int, default=5, help="Timed builds per variant (median reported)")
+    parser.add_argument("--json", action="store_true", help="Print the raw results as JSON")
+    args = parser.parse_args(argv)
+
+    import db
+
+    sql = "SELECT {} FROM auction a JOIN item i ON i.i_id = a.a_item_id ORDER BY a.a_s_epoch DESC LIMIT ?"
+    legacy_sql, sql = sql.format(LEGACY_COLUMNS), sql.format(db._CARD_COLUMNS)
+    with tempfile.TemporaryDirectory(prefix="iom-bench-") as tmp:
+        db.DB_PATH = Path(tmp) / "records.db"
+        seed(db, args.auctions)
+        conn = db.read_connection()
+        try:
+            variants = {
+                "dicts": lambda: [legacy_card(db, r) for r in conn.execute(legacy_sql, (args.auctions,)).fetchall()],
+                "records": lambda: [db._auction_card(r) for r in db._tuples(conn, sql, (args.auctions,))],
+            }
+            results = {name: measure(build, args.runs) for name, build in variants.items()}
+        finally:
+            conn.close()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+    for name, r in results.items():
+        print(f"{name:<8} {r['rows']} rows  median {r['median_ms']:>8.2f}ms  retained {r['retained_kb']:>9.1f} KB "
+              f"({r['bytes_per_row']} B/row)  peak {r['peak_kb']:>9.1f} KB")
+    old, new = results["dicts"], results["records"]
+    print(f"records: {new['median_ms'] / old['median_ms']:.0%} of the time, "
+          f"{new['retained_kb'] / old['retained_kb']:.0%} of the memory")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Import-time and startup-time benchmark for `app`.
+
+Each run starts a fresh interpreter and records how long `import app` takes
+(backend resolution, template warm-up, route registration) and how long until
+the first request to `/` has been served. `--importtime` also lists the
+modules with the largest cumulative import cost, from `python -X importtime`.
+
+    python tools/run.py bench-startup
+    python tools/run.py bench-startup --backends demo sqlite --runs 10 --importtime 15
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# Environment for each DB_BACKEND choice; "demo" runs without a backend.
+BACKEND_ENV = {
+    "demo": {"DB_BACKEND": "", "USE_DB": ""},
+    "sqlite": {"DB_BACKEND": "sqlite"},
+    "sqlserver": {"DB_BACKEND": "sqlserver"},
+}
+
+
+def _child() -> int:
+    """Runs inside the fresh interpreter; prints one JSON line of timings."""
+    start = time.perf_counter()
+    import app
+    import_ms = (time.perf_counter() - start) * 1000
+    app.app.test_client().get("/")
+    startup_ms = (time.perf_counter() - start) * 1000
+    backend = app.store.__name__ if app.store is not None else None
+    print(json.dumps({"import_ms": import_ms, "startup_ms": startup_ms, "backend": backend}))
+    return 0
+
+
+def _spawn(env, extra_args=()) -> subprocess.CompletedProcess:
+    cmd = [sys.executable, *extra_args, str(Path(__file__).resolve()), "--child"]
+    return subprocess.run(cmd, env=env, cwd=str(ROOT), capture_output=True, text=True, check=True)
+
+
+def _import_profile(stderr: str, top: int):
+    """Parse `-X importtime` output into the `top` (cumulative_us, module) pairs."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self_us, cumulative, name = line[len("import time:"):].split("|", 2)
+        rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure import and startup time of app")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per backend")
+    parser.add_argument("--backends", nargs="+", choices=tuple(BACKEND_ENV), default=["demo", "sqlite"])
+    parser.add_argument("--importtime", type=int, default=0, metavar="N",
+                        help="also list the N slowest imports per backend")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        return _child()
+
+    with tempfile.TemporaryDirectory(prefix="iom-startup-") as tmp:
+        base_env = dict(os.environ, SQLITE_PATH=os.path.join(tmp, "bench.db"),
+                        AUTH_LOG=os.path.join(tmp, "auth.log"), JINJA_BYTECODE_DIR=os.path.join(tmp, "bytecode"))
+        # Throwaway run: creates the SQLite schema and fills the bytecode cache.
+        _spawn(dict(base_env, DB_BACKEND="sqlite"))
+
+        print(f"{'backend':<10} {'module':<13} {'import ms':>10} {'startup ms':>11}  (median of {args.runs})")
+        for name in args.backends:
+            env = dict(base_env, **BACKEND_ENV[name])
+            results = [json.loads(_spawn(env).stdout.strip().splitlines()[-1]) for _ in range(args.runs)]
+            imported = statistics.median(r["import_ms"] for r in results)
+            startup = statistics.median(r["startup_ms"] for r in results)
+            print(f"{name:<10} {str(results[0]['backend']):<13} {imported:>10.1f} {startup:>11.1f}")
+            if args.importtime:
+                for cumulative_us, module in _import_profile(_spawn(env, ("-X", "importtime")).stderr, args.importtime):
+                    print(f"  {cumulative_us / 1000:8.1f} ms  {module}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Check or backfill the denormalized bid statistics on `auction`.
+
+`bid_count`, `high_bidder_id` and `last_bid_at` are maintained by
+`place_bid`; rows written by other means (manual SQL, old imports) can drift.
+
+    python tools/bid_stats.py check            # list mismatches, exit 1 if any
+    python tools/bid_stats.py backfill         # recompute mismatched auctions
+    python tools/bid_stats.py backfill --all   # recompute every auction
+    python tools/bid_stats.py backfill --backend sqlserver
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+def _backend(name: str):
+    if name == "sqlserver":
+        import db_sqlserver as backend
+        if backend.ensure_bid_stats_columns():
+            print("Added bid statistics columns to dbo.auction")
+        return backend
+    import db as backend
+    return backend
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Check or backfill auction bid statistics")
+    parser.add_argument("action", choices=("check", "backfill"))
+    parser.add_argument("--backend", choices=("sqlite", "sqlserver"), default="sqlite")
+    parser.add_argument("--all", action="store_true", help="backfill: recompute every auction, not just mismatches")
+    parser.add_argument("--limit", type=int, default=50, help="check: mismatches to print")
+    args = parser.parse_args(argv)
+
+    backend = _backend(args.backend)
+    t0 = time.perf_counter()
+    if args.action == "check":
+        bad = backend.check_bid_stats()
+        for row in bad[:args.limit]:
+            print(f"auction {row['a_id']}: count {row['bid_count']} (expected {row['expected_bid_count']}), "
+                  f"high bidder {row['high_bidder_id']} ({row['expected_high_bidder_id']}), "
+                  f"last bid {row['last_bid_at']} ({row['expected_last_bid_at']})")
+        print(f"{len(bad)} auction(s) out of sync ({time.perf_counter() - t0:.2f}s)")
+        return 1 if bad else 0
+
+    if args.all:
+        updated = backend.refresh_bid_stats()
+    else:
+        ids = [row["a_id"] for row in backend.check_bid_stats()]
+        updated = backend.refresh_bid_stats(ids) if ids else 0
+    print(f"Refreshed {updated} auction(s) in {time.perf_counter() - t0:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""Stream catalogs of items/auctions in and out of the database.
+
+    python tools/catalog_io.py import listings.jsonl --batch-size 2000
+    python tools/catalog_io.py import listings.csv --backend sqlserver
+    python tools/catalog_io.py export auctions.jsonl --status open
+
+Import reads CSV or JSONL one record at a time and writes each batch (items,
+then their auctions and images) in a single transaction, so memory stays
+bounded by the batch size. Export pages through auctions by id and emits each
+one with its images and bids. Both report progress and row rates on stderr.
+
+Record fields (CSV header or JSON keys):
+    title (required), description, starting_price, seller_id, category,
+    sub_category, status, start_date, end_date | duration_days, auction_status,
+    images (JSON list, or `|`-separated in CSV)
+
+Export writes the same fields plus id, item_id, current_price and bids, so an
+export can be re-imported elsewhere. On SQL Server only columns that exist in
+dbo.item / dbo.auction are written, and inserts use pyodbc fast_executemany.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+import time
+from datetime import datetime, timedelta
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+ITEM_FIELDS = ("i_m_id", "i_title", "i_desc", "i_b_price", "i_duration", "i_cat", "i_s_cat", "i_status", "i_image")
+AUCTION_FIELDS = ("a_item_id", "a_m_id", "a_s_price", "a_c_price", "a_s_date", "a_e_date", "a_status")
+EXPORT_FIELDS = ("id", "item_id", "title", "description", "starting_price", "current_price", "seller_id",
+                 "category", "sub_category", "status", "start_date", "end_date", "auction_status", "images", "bids")
+
+
+class Target:
+    """Backend-specific connection, table naming and id allocation."""
+
+    def __init__(self, backend: str):
+        self.backend = backend
+        if backend == "sqlite":
+            import db
+            self.conn = db.get_connection()
+            self.conn.isolation_level = None  # explicit BEGIN/COMMIT below
+            self.prefix = ""
+        else:
+            import db_sqlserver
+            self.conn = db_sqlserver.get_connection()
+            self.prefix = "dbo."
+        self.columns = {t: self._columns(t) for t in ("item", "auction", "item_image", "bid")}
+
+    def _columns(self, table: str) -> set:
+        cur = self.conn.cursor()
+        try:
+            if self.backend == "sqlite":
+                return {r[1].lower() for r in cur.execute(f"PRAGMA table_info({table})").fetchall()}
+            cur.execute("SELECT COLUMN_NAME FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_SCHEMA='dbo' AND TABLE_NAME=?",
+                        (table,))
+            return {r[0].lower() for r in cur.fetchall()}
+        finally:
+            cur.close()
+
+    def begin(self):
+        if self.backend == "sqlite":
+            self.conn.execute("BEGIN IMMEDIATE")
+
+    def commit(self):
+        self.conn.commit() if self.backend == "sqlserver" else self.conn.execute("COMMIT")
+
+    def rollback(self):
+        try:
+            self.conn.rollback() if self.backend == "sqlserver" else self.conn.execute("ROLLBACK")
+        except Exception:
+            pass
+
+    def close(self):
+        self.conn.close()
+
+    def insert_many(self, table: str, id_col: str, cols: List[str], rows: List[tuple]) -> List[int]:
+        """Insert rows and return their new ids in input order.
+
+        The caller holds the write lock for the whole batch (BEGIN IMMEDIATE on
+        SQLite, TABLOCKX on SQL Server), so ids above the previous maximum are
+        exactly the rows inserted here. On SQLite that maximum also covers ids
+        of archived rows, so an archived auction's id is never reused.
+        """
+        cur = self.conn.cursor()
+        try:
+            if self.backend == "sqlite":
+                # Never hand out an id AUTOINCREMENT already used: the auction/bid row may now
+                # live in its archive table, and get_auction would resolve the id to it.
+                import db
+                before = db.last_allocated_id(self.conn, table, id_col)
+                ids = list(range(before + 1, before + 1 + len(rows)))
+                cols = [id_col] + cols
+                rows = [(i,) + row for i, row in zip(ids, rows)]
+            else:
+                cur.execute(f"SELECT MAX({id_col}) FROM {self.prefix}{table} WITH (TABLOCKX, HOLDLOCK)")
+                before = cur.fetchone()[0] or 0
+                cur.fast_executemany = True
+            placeholders = ", ".join("?" for _ in cols)
+            cur.executemany(f"INSERT INTO {self.prefix}{table} ({', '.join(cols)}) VALUES ({placeholders})", rows)
+            if self.backend == "sqlite":
+                return ids
+            cur.execute(f"SELECT {id_col} FROM {self.prefix}{table} WHERE {id_col} > ? ORDER BY {id_col}", (before,))
+            return [r[0] for r in cur.fetchall()]
+        finally:
+            cur.close()
+
+
+class Progress:
+    def __init__(self, label: str):
+        self.label = label
+        self.rows = 0
+        self.started = time.perf_counter()
+
+    def add(self, n: int, final: bool = False):
+        self.rows += n
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        end = "\n" if final else ""
+        print(f"\r{self.label}: {self.rows:,} rows  {self.rows / elapsed:,.0f} rows/s  {elapsed:.1f}s",
+              end=end, file=sys.stderr, flush=True)
+
+
+def read_records(path: Path, fmt: str) -> Iterator[dict]:
+    with open(path, newline="", encoding="utf-8") as fh:
+        if fmt == "csv":
+            for row in csv.DictReader(fh):
+                images = row.get("images") or ""
+                row["images"] = [p for p in images.split("|") if p] if not images.startswith("[") else json.loads(images)
+                yield row
+        else:
+            for line in fh:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def _num(val, default=None, cast=float):
+    if val in (None, ""):
+        return default
+    return cast(val)
+
+
+def _date(val) -> Optional[datetime]:
+    if val in (None, ""):
+        return None
+    return val if isinstance(val, datetime) else datetime.fromisoformat(str(val))
+
+
+def _item_and_auction(rec: dict, now: datetime):
+    title = (rec.get("title") or "").strip()
+    if not title:
+        raise ValueError("title is required")
+    price = _num(rec.get("starting_price"), 0.0)
+    seller = _num(rec.get("seller_id"), None, int)
+    start = _date(rec.get("start_date")) or now
+    end = _date(rec.get("end_date"))
+    days = _num(rec.get("duration_days"), None, int)
+    if end is None and days:
+        end = start + timedelta(days=days)
+    images = rec.get("images") or []
+    item = {
+        "i_m_id": seller, "i_title": title, "i_desc": rec.get("description"), "i_b_price": price,
+        "i_duration": days or (max(0, (end - start).days) if end else 7),
+        "i_cat": rec.get("category") or None, "i_s_cat": rec.get("sub_category") or None,
+        "i_status": rec.get("status") or "A", "i_image": images[0] if images else None,
+    }
+    auction = {
+        "a_m_id": seller, "a_s_price": price, "a_c_price": _num(rec.get("current_price"), price),
+        "a_s_date": start, "a_e_date": end, "a_status": rec.get("auction_status") or "open",
+    }
+    return item, auction, images
+
+
+def import_batch(target: Target, records: List[dict], now: datetime) -> int:
+    parsed = [_item_and_auction(r, now) for r in records]
+    item_cols = [c for c in ITEM_FIELDS if c in target.columns["item"]]
+    auction_cols = [c for c in AUCTION_FIELDS if c in target.columns["auction"] and c != "a_item_id"]
+    target.begin()
+    try:
+        item_ids = target.insert_many("item", "i_id", item_cols, [tuple(i[c] for c in item_cols) for i, _, _ in parsed])
+        target.insert_many("auction", "a_id", ["a_item_id"] + auction_cols,
+                           [(item_id,) + tuple(a[c] for c in auction_cols) for item_id, (_, a, _) in zip(item_ids, parsed)])
+        if target.columns["item_image"]:
+            image_rows = [(item_id, url, None, n)
+                          for item_id, (_, _, images) in zip(item_ids, parsed)
+                          for n, url in enumerate(images, start=1)]
+            if image_rows:
+                target.insert_many("item_image", "img_id", ["item_id", "image_url", "thumb_url", "sort_order"], image_rows)
+        target.commit()
+    except Exception:
+        target.rollback()
+        raise
+    return len(parsed)
+
+
+def run_import(target: Target, path: Path, fmt: str, batch_size: int) -> int:
+    progress = Progress(f"import {path.name}")
+    records = read_records(path, fmt)
+    now = datetime.utcnow()
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            break
+        progress.add(import_batch(target, batch, now))
+    progress.add(0, final=True)
+    return progress.rows
+
+
+def _fetch_dicts(cur, sql: str, params: Iterable) -> List[dict]:
+    cur.execute(sql, tuple(params))
+    cols = [d[0].lower() for d in cur.description]
+    return [dict(zip(cols, row)) for row in cur.fetchall()]
+
+
+def export_batches(target: Target, batch_size: int, status: Optional[str]) -> Iterator[List[dict]]:
+    p = target.prefix
+    a_cols = target.columns["auction"]
+    select = ["a.a_id", "a.a_item_id", "a.a_m_id", "a.a_s_price", "a.a_s_date"]
+    select += [f"a.{c}" for c in ("a_c_price", "a_e_date", "a_status") if c in a_cols]
+    select += [f"i.{c}" for c in ("i_title", "i_desc", "i_cat", "i_s_cat", "i_status") if c in target.columns["item"]]
+    where = " AND a.a_status = ?" if status and "a_status" in a_cols else ""
+    top, limit = (f"TOP {batch_size} ", "") if target.backend == "sqlserver" else ("", f" LIMIT {batch_size}")
+    sql = (f"SELECT {top}{', '.join(select)} FROM {p}auction a LEFT JOIN {p}item i ON i.i_id = a.a_item_id "
+           f"WHERE a.a_id > ?{where} ORDER BY a.a_id{limit}")
+    last_id = 0
+    cur = target.conn.cursor()
+    try:
+        while True:
+            rows = _fetch_dicts(cur, sql, [last_id] + ([status] if where else []))
+            if not rows:
+                return
+            last_id = rows[-1]["a_id"]
+            ids = [r["a_id"] for r in rows]
+            marks = ", ".join("?" for _ in ids)
+            bids: Dict[int, list] = {}
+            if target.columns["bid"]:
+                for b in _fetch_dicts(cur, f"SELECT b_a_id, b_m_id, b_amount, b_time FROM {p}bid "
+                                           f"WHERE b_a_id IN ({marks}) ORDER BY b_a_id, b_time, b_id", ids):
+                    bids.setdefault(b["b_a_id"], []).append(
+                        {"member_id": b["b_m_id"], "amount": float(b["b_amount"]), "time": _iso(b["b_time"])})
+            images: Dict[int, list] = {}
+            if target.columns["item_image"]:
+                item_ids = [r["a_item_id"] for r in rows]
+                for img in _fetch_dicts(cur, f"SELECT item_id, image_url FROM {p}item_image WHERE item_id IN "
+                                             f"({', '.join('?' for _ in item_ids)}) ORDER BY item_id, sort_order, img_id",
+                                        item_ids):
+                    images.setdefault(img["item_id"], []).append(img["image_url"])
+            yield [{
+                "id": r["a_id"], "item_id": r["a_item_id"], "title": r.get("i_title"),
+                "description": r.get("i_desc"), "starting_price": _float(r.get("a_s_price")),
+                "current_price": _float(r.get("a_c_price", r.get("a_s_price"))), "seller_id": r.get("a_m_id"),
+                "category": r.get("i_cat"), "sub_category": r.get("i_s_cat"), "status": r.get("i_status"),
+                "start_date": _iso(r.get("a_s_date")), "end_date": _iso(r.get("a_e_date")),
+                "auction_status": r.get("a_status"), "images": images.get(r["a_item_id"], []),
+                "bids": bids.get(r["a_id"], []),
+            } for r in rows]
+    finally:
+        cur.close()
+
+
+def _float(val):
+    return float(val) if val is not None else None
+
+
+def _iso(val):
+    if val is None:
+        return None
+    return val.isoformat(sep=" ") if isinstance(val, datetime) else str(val)
+
+
+def run_export(target: Target, path: Path, fmt: str, batch_size: int, status: Optional[str]) -> int:
+    progress = Progress(f"export {path.name}")
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        writer = None
+        if fmt == "csv":
+            writer = csv.DictWriter(fh, fieldnames=EXPORT_FIELDS)
+            writer.writeheader()
+        for batch in export_batches(target, batch_size, status):
+            for rec in batch:
+                if writer:
+                    writer.writerow(dict(rec, images="|".join(rec["images"]),
+                                         bids=json.dumps(rec["bids"], separators=(",", ":"))))
+                else:
+                    fh.write(json.dumps(rec, separators=(",", ":")) + "\n")
+            progress.add(len(batch))
+    progress.add(0, final=True)
+    return progress.rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk import/export of items and auctions")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    for name in ("import", "export"):
+        p = sub.add_parser(name)
+        p.add_argument("path", type=Path)
+        p.add_argument("--format", choices=("csv", "jsonl"), help="Defaults to the file extension")
+        p.add_argument("--backend", choices=("sqlite", "sqlserver"), default="sqlite")
+        p.add_argument("--batch-size", type=int, default=1000)
+    sub.choices["export"].add_argument("--status", help="Only export auctions with this a_status")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ("csv" if args.path.suffix.lower() == ".csv" else "jsonl")
+    target = Target(args.backend)
+    try:
+        if args.cmd == "import":
+            run_import(target, args.path, fmt, args.batch_size)
+        else:
+            run_export(target, args.path, fmt, args.batch_size, args.status)
+    finally:
+        target.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Run database maintenance once, or just report page-level health.
+
+    python tools/db_maintenance.py stats                 # page count, free pages, auto-vacuum mode
+    python tools/db_maintenance.py run                   # PRAGMA optimize + bounded incremental_vacuum
+    python tools/db_maintenance.py run --analyze --vacuum-pages 10000
+    python tools/db_maintenance.py run --convert         # one-off: switch an old iom.db to incremental auto-vacuum
+    python tools/db_maintenance.py stats --backend sqlserver
+
+`--convert` runs a full VACUUM, which blocks writers until it finishes; run
+it in a quiet window. Workers also run maintenance on their own schedule
+(MAINTENANCE_INTERVAL_S, see maintenance.py).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+def _print_stats(label: str, stats: dict) -> None:
+    extra = f", fragmentation {stats['fragmentation']:.1%}" if "fragmentation" in stats else ""
+    print(f"{label:<7} {stats['page_count']} pages ({stats['file_bytes'] / 1048576:.1f} MB), "
+          f"{stats['freelist_count']} free ({stats['free_ratio']:.1%}){extra}, auto_vacuum={stats['auto_vacuum']}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Database maintenance: optimize, incremental vacuum, stats")
+    parser.add_argument("action", choices=("stats", "run"))
+    parser.add_argument("--backend", choices=("sqlite", "sqlserver"), default="sqlite")
+    parser.add_argument("--analyze", action="store_true", help="run: full ANALYZE instead of PRAGMA optimize")
+    parser.add_argument("--vacuum-pages", type=int, default=None, help="run: max pages returned per pass")
+    parser.add_argument("--convert", action="store_true", help="run: switch to auto_vacuum=incremental (full VACUUM)")
+    parser.add_argument("--json", action="store_true", help="Print the raw result as JSON")
+    args = parser.parse_args(argv)
+
+    if args.backend == "sqlserver":
+        import db_sqlserver as backend
+    else:
+        import db as backend
+    if args.action == "stats":
+        stats = backend.maintenance_stats()
+        if args.json:
+            print(json.dumps(stats, default=str, indent=2))
+        else:
+            _print_stats("now", stats)
+        return 0
+
+    result = backend.run_maintenance(vacuum_pages=args.vacuum_pages, analyze=args.analyze, convert=args.convert)
+    if args.json:
+        print(json.dumps(result, default=str, indent=2))
+        return 0
+    _print_stats("before", result["before"])
+    _print_stats("after", result["after"])
+    steps = ", ".join(f"{name} {ms:.0f}ms" for name, ms in result["steps_ms"].items())
+    print(f"Reclaimed {result['reclaimed_pages']} page(s); {steps}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""Bulk-load a synthetic dataset into SQLite for scale testing.
+
+Unlike the one-row seeding helpers, everything is streamed through
+`executemany` inside a single transaction with explicit ids, journaling and
+fsync turned off, and every secondary index dropped up front and rebuilt once
+at the end. Distributions are skewed the way real traffic is: a few power
+sellers, a small set of hot auctions that attract most bids, and end dates
+spread from long-closed to two weeks out.
+
+    python tools/gen_dataset.py --path /tmp/scale.db --reset --members 200000 \
+        --auctions 1000000 --bids 10000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import os
+import random
+import sqlite3
+import sys
+import time
+from array import array
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import db  # noqa: E402
+
+WORDS = ("vintage", "antique", "rare", "signed", "boxed", "classic", "retro", "mint", "camera", "watch",
+         "lamp", "chair", "vase", "guitar", "novel", "poster", "stamp", "coin", "radio", "bicycle")
+
+
+def _ts(t: float) -> str:
+    return datetime.utcfromtimestamp(t).isoformat(" ", "seconds")
+
+
+def _skewed_pick(rng: random.Random, n: int, alpha: float = 1.16) -> int:
+    """Pick 0..n-1 with a Pareto tail: low indexes are chosen far more often."""
+    return min(int(rng.paretovariate(alpha)) - 1, n - 1)
+
+
+def bid_counts(rng: random.Random, auctions: int, total_bids: int, hot_fraction: float) -> array:
+    """Split `total_bids` across auctions with a heavy tail; `hot_fraction` of them get a 20x boost."""
+    weights = [rng.paretovariate(1.5) * (20.0 if rng.random() < hot_fraction else 1.0) for _ in range(auctions)]
+    scale = total_bids / sum(weights)
+    counts = array("l", (int(w * scale) for w in weights))
+    shortfall = total_bids - sum(counts)
+    for _ in range(shortfall):
+        counts[rng.randrange(auctions)] += 1
+    return counts
+
+
+class Generator:
+    def __init__(self, args, first_ids: dict, categories: List[str]):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.now = time.time()
+        self.first = first_ids
+        self.categories = categories or [None]
+        self.counts = bid_counts(self.rng, args.auctions, args.bids, args.hot_fraction) if args.auctions else array("l")
+        self.start = array("d", [0.0]) * args.auctions
+        self.end = array("d", [0.0]) * args.auctions
+        self.start_price = array("d", [0.0]) * args.auctions
+        self.price = array("d", [0.0]) * args.auctions
+        self.seller = array("l", [0]) * args.auctions
+        self.high_bidder = array("l", [0]) * args.auctions
+        self.last_bid = array("d", [0.0]) * args.auctions
+
+    def members(self) -> Iterator[Tuple]:
+        first = self.first["member"]
+        rng = self.rng
+        for n in range(self.args.members):
+            m_id = first + n
+            status = "P" if rng.random() < 0.02 else "A"
+            is_admin = 1 if rng.random() < 0.001 else 0
+            created = _ts(self.now - rng.uniform(0, 365 * 86400))
+            yield (m_id, f"user{m_id}", "x", f"user{m_id}@example.com", status, is_admin,
+                   "admin" if is_admin else "user", created)
+
+    def items(self) -> Iterator[Tuple]:
+        rng = self.rng
+        first_member = self.first["member"]
+        members = self.args.members
+        for n in range(self.args.auctions):
+            i_id = self.first["item"] + n
+            seller = first_member + _skewed_pick(rng, members) if members else None
+            self.seller[n] = seller or 0
+            start = self.now - rng.uniform(0, 90 * 86400)
+            self.start[n] = start
+            self.end[n] = start + rng.randint(1, 14) * 86400 + rng.uniform(0, 86400)
+            self.start_price[n] = self.price[n] = round(rng.choice((1, 5, 10, 25, 50, 100)) * rng.uniform(0.5, 2.0), 2)
+            title = " ".join(rng.sample(WORDS, 3)).title()
+            yield (i_id, seller, f"{title} #{i_id}", f"Synthetic listing {i_id}: {title.lower()}.",
+                   self.price[n], math.ceil((self.end[n] - start) / 86400), rng.choice(self.categories),
+                   _ts(start), "A", "/static/placeholder.png", _ts(start))
+
+    def bids(self) -> Iterator[Tuple]:
+        rng = self.rng
+        first_member = self.first["member"]
+        members = self.args.members
+        b_id = self.first["bid"]
+        for n in range(self.args.auctions):
+            count = self.counts[n]
+            price = self.price[n]
+            if not count or not members:
+                continue
+            a_id = self.first["auction"] + n
+            t = self.start[n]
+            last = min(self.end[n], self.now)
+            step = max(1.0, (last - t) / (count + 1))
+            seller = self.seller[n]
+            for _ in range(count):
+                price = round(price + max(0.5, price * rng.uniform(0.01, 0.08)), 2)
+                t += rng.uniform(0.2, 1.8) * step
+                bidder = first_member + _skewed_pick(rng, members, 1.3)
+                if bidder == seller:
+                    bidder = first_member + rng.randrange(members)
+                yield (b_id, a_id, bidder, price, _ts(min(t, last)))
+                b_id += 1
+            self.price[n] = price
+            self.high_bidder[n] = bidder
+            self.last_bid[n] = min(t, last)
+
+    def auctions(self) -> Iterator[Tuple]:
+        for n in range(self.args.auctions):
+            a_id = self.first["auction"] + n
+            status = "closed" if self.end[n] < self.now else "open"
+            bids = self.counts[n] if self.high_bidder[n] else 0
+            yield (a_id, self.first["item"] + n, self.seller[n] or None, self.start_price[n], self.price[n],
+                   _ts(self.start[n]), _ts(self.end[n]), status, bids, self.high_bidder[n] or None,
+                   _ts(self.last_bid[n]) if bids else None, _ts(self.start[n]))
+
+    def images(self) -> Iterator[Tuple]:
+        rng = self.rng
+        img_id = self.first["item_image"]
+        for n in range(self.args.auctions):
+            i_id = self.first["item"] + n
+            for k in range(1, rng.randint(1, self.args.images_per_item) + 1 if self.args.images_per_item else 1):
+                yield (img_id, i_id, "/static/placeholder.png", None, k)
+                img_id += 1
+
+
+def _next_id(conn: sqlite3.Connection, table: str, column: str) -> int:
+    return db.last_allocated_id(conn, table, column) + 1
+
+
+def _load(conn: sqlite3.Connection, label: str, sql: str, rows: Iterator[Tuple], batch: int) -> int:
+    t0 = time.perf_counter()
+    total = 0
+    chunk: List[Tuple] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= batch:
+            conn.executemany(sql, chunk)
+            total += len(chunk)
+            chunk.clear()
+            rate = total / max(time.perf_counter() - t0, 1e-9)
+            print(f"\r  {label:<10} {total:>12,} rows  {rate:>10,.0f} rows/s", end="", flush=True)
+    if chunk:
+        conn.executemany(sql, chunk)
+        total += len(chunk)
+    elapsed = time.perf_counter() - t0
+    print(f"\r  {label:<10} {total:>12,} rows  {total / max(elapsed, 1e-9):>10,.0f} rows/s  ({elapsed:.1f}s)")
+    return total
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk-load a synthetic dataset into SQLite")
+    parser.add_argument("--path", type=Path, default=None, help="Target database (default: SQLITE_PATH / iom.db)")
+    parser.add_argument("--reset", action="store_true", help="Delete the target database first")
+    parser.add_argument("--members", type=int, default=10_000)
+    parser.add_argument("--auctions", type=int, default=50_000, help="Items to create, one auction each")
+    parser.add_argument("--bids", type=int, default=500_000, help="Total bids across all auctions")
+    parser.add_argument("--images-per-item", type=int, default=3, help="Upper bound of images per item")
+    parser.add_argument("--hot-fraction", type=float, default=0.01, help="Share of auctions that run hot")
+    parser.add_argument("--batch-size", type=int, default=50_000, help="Rows per executemany call")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    if args.path:
+        db.DB_PATH = args.path
+    if args.reset and db.DB_PATH.exists():
+        db.DB_PATH.unlink()
+    db.bootstrap_sqlite_db()
+
+    started = time.perf_counter()
+    conn = sqlite3.connect(db.DB_PATH, isolation_level=None)
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.execute("PRAGMA foreign_keys = OFF")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA cache_size = -262144")
+    try:
+        indexes = conn.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL").fetchall()
+        categories = [str(r[0]) for r in conn.execute("SELECT cat_id FROM category")]
+        first_ids = {
+            "member": _next_id(conn, "member", "m_id"),
+            "item": _next_id(conn, "item", "i_id"),
+            "auction": _next_id(conn, "auction", "a_id"),
+            "bid": _next_id(conn, "bid", "b_id"),
+            "item_image": _next_id(conn, "item_image", "img_id"),
+        }
+        gen = Generator(args, first_ids, categories)
+        print(f"Loading into {db.DB_PATH} (deferring {len(indexes)} index builds)")
+
+        conn.execute("BEGIN")
+        for name, _sql in indexes:
+            conn.execute(f'DROP INDEX "{name}"')
+        _load(conn, "member", "INSERT INTO member(m_id, m_login_id, m_pass, m_email, m_status, m_is_admin, m_role, "
+                              "created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", gen.members(), args.batch_size)
+        _load(conn, "item", "INSERT INTO item(i_id, i_m_id, i_title, i_desc, i_b_price, i_duration, i_cat, i_s_date, "
+                            "i_status, i_image, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+              gen.items(), args.batch_size)
+        # Bids go before auctions so each auction row is written once with its final price.
+        _load(conn, "bid", "INSERT INTO bid(b_id, b_a_id, b_m_id, b_amount, b_time) VALUES (?, ?, ?, ?, ?)",
+              gen.bids(), args.batch_size)
+        _load(conn, "auction", "INSERT INTO auction(a_id, a_item_id, a_m_id, a_s_price, a_c_price, a_s_date, a_e_date, "
+                               "a_status, bid_count, high_bidder_id, last_bid_at, created_at) "
+                               "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+              gen.auctions(), args.batch_size)
+        _load(conn, "item_image", "INSERT INTO item_image(img_id, item_id, image_url, thumb_url, sort_order) "
+                                  "VALUES (?, ?, ?, ?, ?)", gen.images(), args.batch_size)
+        t0 = time.perf_counter()
+        for _name, sql in indexes:
+            conn.execute(sql)
+        print(f"  rebuilt {len(indexes)} indexes in {time.perf_counter() - t0:.1f}s")
+        conn.execute("COMMIT")
+        conn.execute("ANALYZE")
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+    size_mb = os.path.getsize(db.DB_PATH) / 1e6
+    print(f"Done in {time.perf_counter() - started:.1f}s; {db.DB_PATH} is {size_mb:,.1f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
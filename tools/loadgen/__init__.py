@@ -0,0 +1,14 @@
+"""Scenario-based load generator for the IOM site.
+
+Drives a weighted mix of browse, view, search, login, bid and upload traffic
+from many concurrent virtual users, either against a running server over HTTP
+or in-process through the Flask test client, and reports per-endpoint
+throughput, latency percentiles and error rates as JSON.
+
+    python -m tools.loadgen --app --users 20 --duration 30 --output report.json
+    python -m tools.loadgen --url http://127.0.0.1:5000 --mix browse=5,view=3,bid=2
+"""
+
+from tools.loadgen.runner import DEFAULT_MIX, LoadConfig, parse_mix, run_load
+
+__all__ = ['DEFAULT_MIX', 'LoadConfig', 'parse_mix', 'run_load']
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""CLI entry point: `python -m tools.loadgen --help`."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from tools.loadgen.runner import DEFAULT_MIX, LoadConfig, parse_mix, run_load  # noqa: E402
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Drive a mix of site traffic and report latency as JSON")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", help="Base URL of a running server, e.g. http://127.0.0.1:5000")
+    target.add_argument("--app", action="store_true", help="Drive the app in-process with the Flask test client (default)")
+    parser.add_argument("--users", type=int, default=10, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run")
+    parser.add_argument("--requests", type=int, default=None, help="Stop after this many requests in total")
+    parser.add_argument("--mix", default=",".join(f"{k}={v}" for k, v in DEFAULT_MIX.items()),
+                        help="Weighted actions: browse, view, search, login, bid, upload")
+    parser.add_argument("--auctions", default="", help="Comma-separated auction ids to view/bid on")
+    parser.add_argument("--user", help="Login for login/bid/upload actions (default: demo admin)")
+    parser.add_argument("--password", default="")
+    parser.add_argument("--think", type=float, default=0.0, help="Mean think time between requests, seconds")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", type=Path, help="Write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+    config = LoadConfig(
+        url=args.url,
+        users=args.users,
+        duration_s=args.duration,
+        max_requests=args.requests,
+        mix=mix,
+        auction_ids=[int(a) for a in args.auctions.split(",") if a.strip()],
+        credentials=(args.user, args.password) if args.user else None,
+        think_time_s=args.think,
+        seed=args.seed,
+    )
+    report = run_load(config)
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        args.output.write_text(text + "\n")
+        print(f"Wrote {report['total_requests']} requests ({report['throughput_rps']} req/s) to {args.output}")
+    else:
+        print(text)
+    return 1 if report['total_requests'] == 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
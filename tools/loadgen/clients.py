@@ -0,0 +1,85 @@
+"""Transport clients used by virtual users.
+
+Both clients expose the same two calls, `get(path)` and `post(path, data, files)`,
+returning the HTTP status code. Redirects are not followed so that a bid or
+login POST is measured on its own, the way a browser would see it.
+"""
+
+from __future__ import annotations
+
+import http.cookiejar
+import io
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+from typing import Dict, Optional, Tuple
+
+Files = Dict[str, Tuple[str, bytes, str]]  # field -> (filename, content, mimetype)
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+class HttpClient:
+    """Cookie-keeping HTTP client for a server started separately (gunicorn, `python app.py`)."""
+
+    def __init__(self, base_url: str, timeout: float = 30.0):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self._opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()), _NoRedirect())
+
+    def _open(self, req: urllib.request.Request) -> int:
+        try:
+            with self._opener.open(req, timeout=self.timeout) as resp:
+                resp.read()
+                return resp.status
+        except urllib.error.HTTPError as e:
+            e.read()
+            return e.code
+
+    def get(self, path: str) -> int:
+        return self._open(urllib.request.Request(self.base_url + path))
+
+    def post(self, path: str, data: Optional[dict] = None, files: Optional[Files] = None) -> int:
+        if files:
+            body, content_type = _encode_multipart(data or {}, files)
+        else:
+            body = urllib.parse.urlencode(data or {}).encode()
+            content_type = 'application/x-www-form-urlencoded'
+        req = urllib.request.Request(self.base_url + path, data=body, method='POST',
+                                     headers={'Content-Type': content_type})
+        return self._open(req)
+
+
+class FlaskClient:
+    """In-process client wrapping `app.test_client()`; one per virtual user."""
+
+    def __init__(self, app):
+        self._client = app.test_client()
+
+    def get(self, path: str) -> int:
+        return self._client.get(path).status_code
+
+    def post(self, path: str, data: Optional[dict] = None, files: Optional[Files] = None) -> int:
+        payload = dict(data or {})
+        for field, (filename, content, mimetype) in (files or {}).items():
+            payload[field] = (io.BytesIO(content), filename, mimetype)
+        kwargs = {'content_type': 'multipart/form-data'} if files else {}
+        return self._client.post(path, data=payload, **kwargs).status_code
+
+
+def _encode_multipart(data: dict, files: Files) -> Tuple[bytes, str]:
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in data.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode())
+    for name, (filename, content, mimetype) in files.items():
+        header = (f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+                  f'Content-Type: {mimetype}\r\n\r\n')
+        parts.append(header.encode() + content + b'\r\n')
+    parts.append(f'--{boundary}--\r\n'.encode())
+    return b''.join(parts), f'multipart/form-data; boundary={boundary}'
@@ -0,0 +1,120 @@
+"""Virtual-user thread pool and report assembly."""
+
+from __future__ import annotations
+
+import itertools
+import os
+import random
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from tools.loadgen.clients import FlaskClient, HttpClient
+from tools.loadgen.scenarios import ACTIONS, ROOT, BidLedger, VirtualUser
+from tools.loadgen.stats import Recorder
+
+DEFAULT_MIX: Dict[str, int] = {'browse': 30, 'view': 35, 'search': 15, 'login': 5, 'bid': 13, 'upload': 2}
+
+
+def parse_mix(text: str) -> Dict[str, int]:
+    """Parse `browse=5,view=3,bid=2` into a weight dict, rejecting unknown actions."""
+    mix = {}
+    for part in filter(None, (p.strip() for p in text.split(','))):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in ACTIONS:
+            raise ValueError(f"unknown action {name!r}; choose from {', '.join(ACTIONS)}")
+        mix[name] = int(weight or 1)
+    if not mix or not any(mix.values()):
+        raise ValueError('mix must give at least one action a positive weight')
+    return mix
+
+
+@dataclass
+class LoadConfig:
+    url: Optional[str] = None  # None drives the app in-process via the Flask test client
+    users: int = 10
+    duration_s: float = 10.0
+    max_requests: Optional[int] = None
+    mix: Dict[str, int] = field(default_factory=lambda: dict(DEFAULT_MIX))
+    auction_ids: List[int] = field(default_factory=list)
+    credentials: Optional[Tuple[str, str]] = None
+    think_time_s: float = 0.0
+    seed: Optional[int] = None
+
+
+def _discover_auction_ids(app_module) -> List[int]:
+    if app_module is not None and getattr(app_module, 'store', None) is not None:
+        try:
+            ids = [a['id'] for a in app_module.store.get_auctions(limit=100) if a.get('id')]
+            if ids:
+                return ids
+        except Exception:
+            pass
+    return list(range(1, 11))
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True)
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def run_load(config: LoadConfig, app_module=None) -> dict:
+    """Run the configured load and return the JSON-serializable report."""
+    if config.url is None and app_module is None:
+        import app as app_module  # noqa: F811
+    auction_ids = config.auction_ids or _discover_auction_ids(app_module if config.url is None else None)
+    names = [n for n, w in config.mix.items() if w > 0]
+    weights = [config.mix[n] for n in names]
+    recorder = Recorder()
+    ledger = BidLedger()
+    seeds = random.Random(config.seed)
+    budget = itertools.count() if config.max_requests else None
+    budget_lock = threading.Lock()
+    started = time.perf_counter()
+    deadline = started + config.duration_s
+
+    def claim() -> bool:
+        if time.perf_counter() >= deadline:
+            return False
+        if budget is None:
+            return True
+        with budget_lock:
+            return next(budget) < config.max_requests
+
+    def virtual_user(seed: int) -> None:
+        client = HttpClient(config.url) if config.url else FlaskClient(app_module.app)
+        user = VirtualUser(client, random.Random(seed), auction_ids, ledger, config.credentials)
+        while claim():
+            action = ACTIONS[user.rng.choices(names, weights)[0]]
+            t0 = time.perf_counter()
+            try:
+                endpoint, status = action(user)
+                error = status >= 500
+            except Exception as e:
+                endpoint, status, error = action.__name__, type(e).__name__, True
+            recorder.add(endpoint, (time.perf_counter() - t0) * 1000, status, error)
+            if config.think_time_s:
+                time.sleep(user.rng.uniform(0, 2 * config.think_time_s))
+
+    user_seeds = [seeds.randrange(2 ** 32) for _ in range(config.users)]
+    with ThreadPoolExecutor(max_workers=config.users, thread_name_prefix='vu') as pool:
+        list(pool.map(virtual_user, user_seeds))
+
+    report = recorder.report(time.perf_counter() - started)
+    report.update({
+        'target': config.url or 'flask-test-client',
+        'users': config.users,
+        'mix': config.mix,
+        'started_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'git_revision': _git_revision(),
+        'pid': os.getpid(),
+    })
+    return report
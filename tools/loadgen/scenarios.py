@@ -0,0 +1,98 @@
+"""Actions a virtual user can perform.
+
+Each action issues exactly one request and returns `(endpoint, status)`, where
+`endpoint` is the route pattern the latency is reported under.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parents[2]
+SEARCH_TERMS = ['test', 'vintage', 'book', 'watch', 'lamp', 'camera', 'chair', '']
+
+_PLACEHOLDER = ROOT / 'static' / 'placeholder.png'
+UPLOAD_IMAGE = _PLACEHOLDER.read_bytes() if _PLACEHOLDER.exists() else b'\x89PNG\r\n\x1a\n'
+
+
+class BidLedger:
+    """Shared per-auction bid counter so virtual users keep outbidding each other."""
+
+    def __init__(self, start: float = 1.0, step: float = 1.0):
+        self._lock = threading.Lock()
+        self._last: Dict[int, float] = {}
+        self._start = start
+        self._step = step
+
+    def next_amount(self, auction_id: int) -> float:
+        with self._lock:
+            amount = self._last.get(auction_id, self._start) + self._step
+            self._last[auction_id] = amount
+            return amount
+
+
+class VirtualUser:
+    def __init__(self, client, rng: random.Random, auction_ids: List[int], ledger: BidLedger,
+                 credentials: Optional[Tuple[str, str]] = None):
+        self.client = client
+        self.rng = rng
+        self.auction_ids = auction_ids or [1]
+        self.ledger = ledger
+        self.credentials = credentials
+        self.logged_in = False
+
+    def pick_auction(self) -> int:
+        # Skew towards the first few ids so some auctions run hot, like real traffic.
+        idx = min(int(self.rng.paretovariate(1.2)) - 1, len(self.auction_ids) - 1)
+        return self.auction_ids[idx]
+
+
+def browse(user: VirtualUser) -> Tuple[str, int]:
+    return 'GET /auctions', user.client.get('/auctions')
+
+
+def view(user: VirtualUser) -> Tuple[str, int]:
+    return 'GET /auction/<id>', user.client.get(f'/auction/{user.pick_auction()}')
+
+
+def search(user: VirtualUser) -> Tuple[str, int]:
+    term = user.rng.choice(SEARCH_TERMS)
+    return 'GET /search', user.client.get(f'/search?key_word={term}')
+
+
+def login(user: VirtualUser) -> Tuple[str, int]:
+    username, password = user.credentials or ('admin', 'adminpass')
+    status = user.client.post('/user_login', data={'username': username, 'password': password})
+    user.logged_in = status in (200, 302)
+    return 'POST /user_login', status
+
+
+def bid(user: VirtualUser) -> Tuple[str, int]:
+    if not user.logged_in:
+        return login(user)
+    auction_id = user.pick_auction()
+    amount = user.ledger.next_amount(auction_id)
+    return 'POST /auction/<id>/bid', user.client.post(f'/auction/{auction_id}/bid', data={'amount': f'{amount:.2f}'})
+
+
+def upload(user: VirtualUser) -> Tuple[str, int]:
+    if not user.logged_in:
+        return login(user)
+    n = user.rng.randint(1, 1_000_000)
+    data = {'title': f'Load test item {n}', 'desc': 'Created by tools.loadgen', 'starting_price': '1.00',
+            'duration': '7'}
+    files = {'images': (f'loadgen_{n}.png', UPLOAD_IMAGE, 'image/png')}
+    return 'POST /auctions/new', user.client.post('/auctions/new', data=data, files=files)
+
+
+ACTIONS: Dict[str, Callable[[VirtualUser], Tuple[str, int]]] = {
+    'browse': browse,
+    'view': view,
+    'search': search,
+    'login': login,
+    'bid': bid,
+    'upload': upload,
+}
@@ -0,0 +1,65 @@
+"""Thread-safe latency collection and the JSON report shape."""
+
+from __future__ import annotations
+
+import math
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, List
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latencies: Dict[str, List[float]] = defaultdict(list)
+        self._statuses: Dict[str, Counter] = defaultdict(Counter)
+        self._errors: Counter = Counter()
+
+    def add(self, endpoint: str, latency_ms: float, status, error: bool) -> None:
+        with self._lock:
+            self._latencies[endpoint].append(latency_ms)
+            self._statuses[endpoint][str(status)] += 1
+            if error:
+                self._errors[endpoint] += 1
+
+    def report(self, elapsed_s: float) -> dict:
+        with self._lock:
+            endpoints = {}
+            total = errors = 0
+            for endpoint, values in sorted(self._latencies.items()):
+                values = sorted(values)
+                count = len(values)
+                failed = self._errors[endpoint]
+                total += count
+                errors += failed
+                endpoints[endpoint] = {
+                    'count': count,
+                    'errors': failed,
+                    'error_rate': round(failed / count, 4),
+                    'throughput_rps': round(count / elapsed_s, 2) if elapsed_s else 0.0,
+                    'latency_ms': {
+                        'min': round(values[0], 2),
+                        'mean': round(sum(values) / count, 2),
+                        'p50': round(percentile(values, 50), 2),
+                        'p95': round(percentile(values, 95), 2),
+                        'p99': round(percentile(values, 99), 2),
+                        'max': round(values[-1], 2),
+                    },
+                    'status': dict(self._statuses[endpoint]),
+                }
+        return {
+            'elapsed_s': round(elapsed_s, 3),
+            'total_requests': total,
+            'errors': errors,
+            'error_rate': round(errors / total, 4) if total else 0.0,
+            'throughput_rps': round(total / elapsed_s, 2) if elapsed_s else 0.0,
+            'endpoints': endpoints,
+        }
@@ -9,6 +9,14 @@ Usage examples:
     .venv/bin/python tools/run.py grant 3
     .venv/bin/python tools/run.py revoke alice
     .venv/bin/python tools/run.py auto-bid --auction 3 --amount 5.00
+    .venv/bin/python tools/run.py loadgen --users 20 --duration 30 --output report.json
+    .venv/bin/python tools/run.py bench --auctions 5000 --iterations 300
+    .venv/bin/python tools/run.py catalog import listings.jsonl --batch-size 2000
+    .venv/bin/python tools/run.py bench-first-request --runs 10
+    .venv/bin/python tools/run.py bench-records --auctions 10000
+    .venv/bin/python tools/run.py archive --days 90 --batch-size 500
+    .venv/bin/python tools/run.py maintenance run --vacuum-pages 5000
+    .venv/bin/python tools/run.py backup snapshot --keep 14
     .venv/bin/python tools/run.py schema --tables auction item --output schema.json
 """
 import argparse
@@ -50,6 +58,18 @@ def main():
     sub.add_parser('print-alice-pass', help='Print alice password hash from DB')
     sub.add_parser('login-alice-test', help='Run login_alice_test using Flask test client')
     sub.add_parser('auto-bid', help='Auto place a bid to a running server')
+    sub.add_parser('loadgen', help='Run the scenario load generator (extra args passed through)')
+    sub.add_parser('bench', help='Run data-layer micro-benchmarks (extra args passed through)')
+    sub.add_parser('gen-dataset', help='Bulk-load a synthetic SQLite dataset (extra args passed through)')
+    sub.add_parser('catalog', help='Stream-import/export items and auctions (extra args passed through)')
+    sub.add_parser('bid-stats', help='Check or backfill auction bid statistics (extra args passed through)')
+    sub.add_parser('bench-first-request', help='Time first requests of fresh app workers (extra args passed through)')
+    sub.add_parser('bench-startup', help='Time importing and starting app per backend (extra args passed through)')
+    sub.add_parser('bench-records', help='Compare listing records with per-row dicts, time and memory (extra args passed through)')
+    sub.add_parser('bench-gunicorn', help='Compare gunicorn profiles under the load generator (extra args passed through)')
+    sub.add_parser('archive', help='Archive long-closed auctions and their bids (extra args passed through)')
+    sub.add_parser('maintenance', help='Optimize / incrementally vacuum the database or show its stats (extra args passed through)')
+    sub.add_parser('backup', help='Snapshot, list, verify or restore online database backups (extra args passed through)')
 
     # grant/revoke with args
     g = sub.add_parser('grant', help='Grant admin to member id or username')
@@ -114,6 +134,42 @@ def main():
         }
         sys.exit(run_module('auto_place_bid', args=None, env=env))
 
+    if args.cmd == 'loadgen':
+        sys.exit(run_module('loadgen', args=extra))
+
+    if args.cmd == 'bench':
+        sys.exit(run_module('bench_db', args=extra))
+
+    if args.cmd == 'gen-dataset':
+        sys.exit(run_module('gen_dataset', args=extra))
+
+    if args.cmd == 'catalog':
+        sys.exit(run_module('catalog_io', args=extra))
+
+    if args.cmd == 'bid-stats':
+        sys.exit(run_module('bid_stats', args=extra))
+
+    if args.cmd == 'bench-first-request':
+        sys.exit(run_module('bench_first_request', args=extra))
+
+    if args.cmd == 'bench-startup':
+        sys.exit(run_module('bench_startup', args=extra))
+
+    if args.cmd == 'bench-gunicorn':
+        sys.exit(run_module('bench_gunicorn', args=extra))
+
+    if args.cmd == 'bench-records':
+        sys.exit(run_module('bench_records', args=extra))
+
+    if args.cmd == 'archive':
+        sys.exit(run_module('archive_auctions', args=extra))
+
+    if args.cmd == 'maintenance':
+        sys.exit(run_module('db_maintenance', args=extra))
+
+    if args.cmd == 'backup':
+        sys.exit(run_module('backup_db', args=extra))
+
     if args.cmd == 'grant':
         sys.exit(run_module('grant_revoke_admin', args=['grant', args.target]))
     if args.cmd == 'revoke':
@@ -4,15 +4,14 @@ import importlib
 app = importlib.import_module('app')
 # Ensure app is in a known state
 app.USE_DB = True
-# Provide a fake get_user_by_username to identify admin users
-app.get_user_by_username = lambda username: {'id':1,'username':'admin','m_is_admin':True,'is_admin':True,'m_login_id':'admin'}
-# Create fake db module to intercept deletion
-fake_db = types.ModuleType('db')
+# Fake data backend: identifies admin users and intercepts deletion
 def fake_delete(aid):
     print('fake_delete called', aid)
     return (1, 2)
-fake_db.delete_auction_and_bids = fake_delete
-sys.modules['db'] = fake_db
+app.store = types.SimpleNamespace(
+    get_user_by_username=lambda username: {'id':1,'username':'admin','m_is_admin':True,'is_admin':True,'m_login_id':'admin'},
+    delete_auction_and_bids=fake_delete,
+)
 # Use test client to simulate POST with admin session
 client = app.app.test_client()
 with client.session_transaction() as sess: